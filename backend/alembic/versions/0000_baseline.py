@@ -0,0 +1,295 @@
+"""Baseline schema
+
+Revision ID: 0000_baseline
+Revises:
+Create Date: 2026-10-18
+
+The 13 tables of the original schema, before any of the later migrations.
+Databases created by init_db (create_all) already have some or all of
+them; existing tables are left untouched, so ``alembic upgrade head``
+brings either kind of database to the current schema.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+
+
+revision = "0000_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# In dependency order (foreign keys point backwards)
+TABLES = (
+    "users",
+    "connected_accounts",
+    "threads",
+    "messages",
+    "emails",
+    "attachments",
+    "documents",
+    "tasks",
+    "drafts",
+    "waiting_for",
+    "reminders",
+    "vip_domains",
+    "calendar_suggestions",
+)
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for table in TABLES:
+        if table not in existing:
+            globals()[f"_create_{table}"]()
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        op.drop_table(table)
+    for enum in ("emailprovider", "providertype", "tasktype", "prioritylevel", "effortlevel", "taskstatus", "tonetype"):
+        sa.Enum(name=enum).drop(op.get_bind(), checkfirst=True)
+
+
+def _create_users():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("name", sa.String()),
+        sa.Column("picture_url", sa.String()),
+        sa.Column("provider", sa.Enum("GMAIL", "OUTLOOK", name="emailprovider"), nullable=False),
+        sa.Column("access_token", sa.String()),
+        sa.Column("refresh_token", sa.String()),
+        sa.Column("token_expires_at", sa.DateTime()),
+        sa.Column("settings", JSONB()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("last_sync", sa.DateTime()),
+        sa.Column("is_active", sa.Boolean()),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+
+def _create_connected_accounts():
+    op.create_table(
+        "connected_accounts",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("provider", sa.Enum("GMAIL", "OUTLOOK", name="providertype"), nullable=False),
+        sa.Column("access_token", sa.String(), nullable=False),
+        sa.Column("refresh_token", sa.String()),
+        sa.Column("token_expires_at", sa.DateTime()),
+        sa.Column("last_sync_at", sa.DateTime()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.UniqueConstraint("user_id", "provider", name="unique_user_provider"),
+    )
+    op.create_index("ix_connected_accounts_user_id", "connected_accounts", ["user_id"])
+
+
+def _create_threads():
+    op.create_table(
+        "threads",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("external_id", sa.String(), nullable=False),
+        sa.Column("subject", sa.String()),
+        sa.Column("participants", ARRAY(sa.String())),
+        sa.Column("provider", sa.String(), nullable=False),
+        sa.Column("summary", sa.Text()),
+        sa.Column("intent", sa.String()),
+        sa.Column("urgency_score", sa.Integer()),
+        sa.Column("intel_json", JSONB()),
+        sa.Column("last_email_at", sa.DateTime()),
+        sa.Column("last_synced_at", sa.DateTime()),
+        sa.Column("intel_generated_at", sa.DateTime()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_threads_user_id", "threads", ["user_id"])
+
+
+def _create_messages():
+    op.create_table(
+        "messages",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("thread_id", sa.String(), sa.ForeignKey("threads.id"), nullable=False),
+        sa.Column("from_address", sa.String(), nullable=False),
+        sa.Column("to_addresses", ARRAY(sa.String())),
+        sa.Column("cc_addresses", ARRAY(sa.String())),
+        sa.Column("subject", sa.String()),
+        sa.Column("body_text", sa.Text()),
+        sa.Column("is_from_user", sa.String()),
+        sa.Column("sent_at", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_messages_thread_id", "messages", ["thread_id"])
+
+
+def _create_emails():
+    op.create_table(
+        "emails",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("thread_id", sa.String(), sa.ForeignKey("threads.id"), nullable=False),
+        sa.Column("external_id", sa.String(), nullable=False),
+        sa.Column("from_address", sa.String(), nullable=False),
+        sa.Column("to_addresses", sa.Text()),
+        sa.Column("cc_addresses", sa.Text()),
+        sa.Column("subject", sa.String()),
+        sa.Column("snippet", sa.Text()),
+        sa.Column("body_text", sa.Text()),
+        sa.Column("body_html", sa.Text()),
+        sa.Column("is_read", sa.Boolean()),
+        sa.Column("is_starred", sa.Boolean()),
+        sa.Column("is_from_user", sa.Boolean()),
+        sa.Column("sent_at", sa.DateTime(), nullable=False),
+        sa.Column("received_at", sa.DateTime()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_emails_user_id", "emails", ["user_id"])
+    op.create_index("ix_emails_thread_id", "emails", ["thread_id"])
+
+
+def _create_attachments():
+    op.create_table(
+        "attachments",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("message_id", sa.String(), sa.ForeignKey("messages.id"), nullable=False),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("filename", sa.String(), nullable=False),
+        sa.Column("original_filename", sa.String()),
+        sa.Column("mime_type", sa.String(), nullable=False),
+        sa.Column("size_bytes", sa.Integer()),
+        sa.Column("storage_path", sa.String()),
+        sa.Column("summary", sa.String()),
+        sa.Column("key_points", sa.String()),
+        sa.Column("document_type", sa.String()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("processed_at", sa.DateTime()),
+    )
+    op.create_index("ix_attachments_message_id", "attachments", ["message_id"])
+    op.create_index("ix_attachments_user_id", "attachments", ["user_id"])
+
+
+def _create_documents():
+    op.create_table(
+        "documents",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column(
+            "attachment_id", sa.String(),
+            sa.ForeignKey("attachments.id", ondelete="CASCADE"), nullable=False, unique=True,
+        ),
+        sa.Column("vector_index_id", sa.String(), nullable=False),
+        sa.Column("metadata", JSONB()),
+        sa.Column("indexed_at", sa.DateTime()),
+    )
+
+
+def _create_tasks():
+    op.create_table(
+        "tasks",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("thread_id", sa.String(), sa.ForeignKey("threads.id"), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column(
+            "task_type", sa.Enum("REPLY", "SCHEDULE", "REVIEW", "FOLLOWUP", name="tasktype"), nullable=False,
+        ),
+        sa.Column("priority", sa.Enum("DO_NOW", "DO_TODAY", "CAN_WAIT", name="prioritylevel")),
+        sa.Column("priority_score", sa.Integer()),
+        sa.Column("priority_explanation", sa.Text()),
+        sa.Column("effort", sa.Enum("QUICK", "DEEP_WORK", name="effortlevel")),
+        sa.Column("deadline", sa.DateTime()),
+        sa.Column("deadline_source", sa.String()),
+        sa.Column(
+            "status", sa.Enum("PENDING", "IN_PROGRESS", "COMPLETED", "DISMISSED", name="taskstatus"),
+        ),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_tasks_user_id", "tasks", ["user_id"])
+    op.create_index("ix_tasks_thread_id", "tasks", ["thread_id"])
+
+
+def _create_drafts():
+    op.create_table(
+        "drafts",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("thread_id", sa.String(), sa.ForeignKey("threads.id"), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("tone", sa.Enum("BRIEF", "NORMAL", "FORMAL", name="tonetype")),
+        sa.Column("placeholders_json", sa.Text()),
+        sa.Column("has_unresolved_placeholders", sa.Boolean()),
+        sa.Column("references_attachments", sa.Boolean()),
+        sa.Column("references_deadlines", sa.Boolean()),
+        sa.Column("is_sent", sa.Boolean()),
+        sa.Column("model_version", sa.String()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+        sa.Column("sent_at", sa.DateTime()),
+    )
+    op.create_index("ix_drafts_user_id", "drafts", ["user_id"])
+    op.create_index("ix_drafts_thread_id", "drafts", ["thread_id"])
+
+
+def _create_waiting_for():
+    op.create_table(
+        "waiting_for",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("thread_id", sa.String(), sa.ForeignKey("threads.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("last_sent_at", sa.DateTime(), nullable=False),
+        sa.Column("days_waiting", sa.Integer()),
+        sa.Column("reminded", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.UniqueConstraint("thread_id", "user_id", name="unique_thread_user_waiting"),
+    )
+    op.create_index("ix_waiting_for_thread_id", "waiting_for", ["thread_id"])
+    op.create_index("ix_waiting_for_user_id", "waiting_for", ["user_id"])
+
+
+def _create_reminders():
+    op.create_table(
+        "reminders",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("task_id", sa.String(), sa.ForeignKey("tasks.id", ondelete="CASCADE")),
+        sa.Column("remind_at", sa.DateTime(), nullable=False),
+        sa.Column("is_triggered", sa.Boolean()),
+        sa.Column("message", sa.Text()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_reminders_user_id", "reminders", ["user_id"])
+    op.create_index("ix_reminders_task_id", "reminders", ["task_id"])
+    op.create_index("ix_reminders_remind_at", "reminders", ["remind_at"])
+
+
+def _create_vip_domains():
+    op.create_table(
+        "vip_domains",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("domain", sa.String(255), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+        sa.UniqueConstraint("user_id", "domain", name="unique_user_domain"),
+    )
+    op.create_index("ix_vip_domains_user_id", "vip_domains", ["user_id"])
+
+
+def _create_calendar_suggestions():
+    op.create_table(
+        "calendar_suggestions",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("thread_id", sa.String(), sa.ForeignKey("threads.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("title", sa.String(512), nullable=False),
+        sa.Column("suggested_time", sa.DateTime()),
+        sa.Column("extracted_from", sa.Text()),
+        sa.Column("is_accepted", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_calendar_suggestions_thread_id", "calendar_suggestions", ["thread_id"])
+    op.create_index("ix_calendar_suggestions_user_id", "calendar_suggestions", ["user_id"])
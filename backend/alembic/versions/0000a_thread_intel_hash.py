@@ -0,0 +1,28 @@
+"""Content hash of the cached thread intel
+
+Revision ID: 0000a_thread_intel_hash
+Revises: 0000_baseline
+Create Date: 2026-10-18
+
+threads.intel_hash records which thread content intel_json was generated
+from; the intel cache serves intel_json only while the hash still matches.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0000a_thread_intel_hash"
+down_revision = "0000_baseline"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("threads")}
+    if "intel_hash" not in columns:
+        op.add_column("threads", sa.Column("intel_hash", sa.String(64)))
+
+
+def downgrade():
+    op.drop_column("threads", "intel_hash")
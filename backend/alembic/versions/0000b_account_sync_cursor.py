@@ -0,0 +1,29 @@
+"""Incremental sync cursor per connected account
+
+Revision ID: 0000b_account_sync_cursor
+Revises: 0000a_thread_intel_hash
+Create Date: 2026-10-18
+
+connected_accounts.sync_cursor holds the provider change cursor (Gmail
+historyId or Graph deltaLink) the next sync resumes from. NULL means the
+next sync is a full one.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0000b_account_sync_cursor"
+down_revision = "0000a_thread_intel_hash"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("connected_accounts")}
+    if "sync_cursor" not in columns:
+        op.add_column("connected_accounts", sa.Column("sync_cursor", sa.String()))
+
+
+def downgrade():
+    op.drop_column("connected_accounts", "sync_cursor")
@@ -0,0 +1,62 @@
+"""Persistent sync job queue
+
+Revision ID: 0000c_sync_jobs
+Revises: 0000b_account_sync_cursor
+Create Date: 2026-10-18
+
+sync_jobs rows are leased by sync workers. The partial unique index allows
+at most one queued or running job per account and is the ON CONFLICT
+target of enqueue.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0000c_sync_jobs"
+down_revision = "0000b_account_sync_cursor"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table("sync_jobs"):
+        return
+    op.create_table(
+        "sync_jobs",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column(
+            "account_id", sa.String(),
+            sa.ForeignKey("connected_accounts.id", ondelete="CASCADE"), nullable=False,
+        ),
+        sa.Column(
+            "status", sa.Enum("QUEUED", "RUNNING", "SUCCEEDED", "FAILED", name="syncjobstatus"), nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text()),
+        sa.Column("available_at", sa.DateTime()),
+        sa.Column("leased_by", sa.String()),
+        sa.Column("lease_expires_at", sa.DateTime()),
+        sa.Column("heartbeat_at", sa.DateTime()),
+        sa.Column("threads_fetched", sa.Integer(), nullable=False),
+        sa.Column("threads_analyzed", sa.Integer(), nullable=False),
+        sa.Column("tasks_created", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("started_at", sa.DateTime()),
+        sa.Column("finished_at", sa.DateTime()),
+    )
+    op.create_index("ix_sync_jobs_user_id", "sync_jobs", ["user_id"])
+    op.create_index("idx_sync_jobs_status_created", "sync_jobs", ["status", "created_at"])
+    op.create_index(
+        "uq_sync_jobs_active_account",
+        "sync_jobs",
+        ["account_id"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('QUEUED', 'RUNNING')"),
+    )
+
+
+def downgrade():
+    op.drop_table("sync_jobs")
+    sa.Enum(name="syncjobstatus").drop(op.get_bind(), checkfirst=True)
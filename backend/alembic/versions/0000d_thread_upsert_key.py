@@ -0,0 +1,40 @@
+"""Thread upsert key and boolean messages.is_from_user
+
+Revision ID: 0000d_thread_upsert_key
+Revises: 0000c_sync_jobs
+Create Date: 2026-10-18
+
+The thread writer upserts threads ON CONFLICT (user_id, external_id),
+which needs a unique constraint on those columns. It also writes
+messages.is_from_user as a boolean; the baseline declared it as a string.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0000d_thread_upsert_key"
+down_revision = "0000c_sync_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    constraints = {c["name"] for c in inspector.get_unique_constraints("threads")}
+    if "unique_user_thread" not in constraints:
+        op.create_unique_constraint("unique_user_thread", "threads", ["user_id", "external_id"])
+    
+    [is_from_user] = [c for c in inspector.get_columns("messages") if c["name"] == "is_from_user"]
+    if not isinstance(is_from_user["type"], sa.Boolean):
+        op.alter_column(
+            "messages",
+            "is_from_user",
+            type_=sa.Boolean(),
+            postgresql_using="lower(is_from_user) IN ('true', 't', '1')",
+        )
+
+
+def downgrade():
+    op.alter_column("messages", "is_from_user", type_=sa.String(), postgresql_using="is_from_user::text")
+    op.drop_constraint("unique_user_thread", "threads", type_="unique")
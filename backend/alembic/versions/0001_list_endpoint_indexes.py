@@ -0,0 +1,55 @@
+"""Composite indexes for the thread and task list endpoints
+
+Revision ID: 0001_list_endpoint_indexes
+Revises: 0000d_thread_upsert_key
+Create Date: 2026-10-18
+
+GET /api/threads and GET /api/tasks page with keyset cursors over
+(last_email_at, id) and (priority_score, id); these indexes serve the
+ORDER BY and the cursor predicate without a sort or sequential scan.
+The single-column user_id indexes stay (foreign key lookups).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001_list_endpoint_indexes"
+down_revision = "0000d_thread_upsert_key"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_threads_user_last_email",
+            "threads",
+            ["user_id", sa.text("last_email_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "idx_tasks_user_status_priority",
+            "tasks",
+            ["user_id", "status", sa.text("priority_score DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_tasks_user_status_priority",
+            table_name="tasks",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "idx_threads_user_last_email",
+            table_name="threads",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,74 @@
+"""Thread summary projection for the inbox list
+
+Revision ID: 0002_thread_summaries
+Revises: 0001_list_endpoint_indexes
+Create Date: 2026-10-18
+
+One narrow row per thread with exactly the ThreadListItem fields, kept in
+step by the thread writer. Existing threads are backfilled from their
+cached intel columns and attachments; threads never analyzed get the same
+neutral values analysis falls back to (summary = subject, intent unknown,
+urgency 0), since every ThreadListItem field is required.
+
+Databases created by init_db (create_all) already have the table; it is
+then left as is and only backfilled.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002_thread_summaries"
+down_revision = "0001_list_endpoint_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not sa.inspect(op.get_bind()).has_table("thread_summaries"):
+        _create_table()
+    op.execute(
+        """
+        INSERT INTO thread_summaries
+            (thread_id, user_id, subject, summary, intent, urgency_score, last_updated, has_attachments)
+        SELECT
+            t.id,
+            t.user_id,
+            COALESCE(t.subject, ''),
+            COALESCE(t.summary, t.subject, ''),
+            COALESCE(t.intent, 'unknown'),
+            COALESCE(t.urgency_score, 0),
+            t.last_email_at,
+            EXISTS (
+                SELECT 1 FROM attachments a JOIN messages m ON m.id = a.message_id
+                WHERE m.thread_id = t.id
+            )
+        FROM threads t
+        WHERE t.last_email_at IS NOT NULL
+        ON CONFLICT (thread_id) DO NOTHING
+        """
+    )
+
+
+def _create_table():
+    op.create_table(
+        "thread_summaries",
+        sa.Column("thread_id", sa.String(), sa.ForeignKey("threads.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("subject", sa.String()),
+        sa.Column("summary", sa.Text()),
+        sa.Column("intent", sa.String()),
+        sa.Column("urgency_score", sa.Integer()),
+        sa.Column("last_updated", sa.DateTime(), nullable=False),
+        sa.Column("has_attachments", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.create_index(
+        "idx_thread_summaries_user_updated",
+        "thread_summaries",
+        ["user_id", sa.text("last_updated DESC"), sa.text("thread_id DESC")],
+    )
+
+
+def downgrade():
+    op.drop_index("idx_thread_summaries_user_updated", table_name="thread_summaries")
+    op.drop_table("thread_summaries")
@@ -0,0 +1,49 @@
+"""Task list index without a status filter; tasks.priority_score NOT NULL
+
+Revision ID: 0003_task_priority_index
+Revises: 0002_thread_summaries
+Create Date: 2026-10-18
+
+GET /api/tasks without ?status= orders by (priority_score, id) per user;
+idx_tasks_user_status_priority has status second and cannot serve it.
+
+The keyset cursor compares (priority_score, id) row values; a NULL score
+compares as unknown, so those tasks fell out of every page after the
+first. Existing NULLs are backfilled with the column default (0) and the
+column becomes NOT NULL.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_task_priority_index"
+down_revision = "0002_thread_summaries"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("UPDATE tasks SET priority_score = 0 WHERE priority_score IS NULL")
+    op.alter_column("tasks", "priority_score", nullable=False, server_default=sa.text("0"))
+    
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_tasks_user_priority",
+            "tasks",
+            ["user_id", sa.text("priority_score DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_tasks_user_priority",
+            table_name="tasks",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.alter_column("tasks", "priority_score", nullable=True, server_default=None)
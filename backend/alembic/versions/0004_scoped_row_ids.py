@@ -0,0 +1,127 @@
+"""Per-user row ids for threads, messages, attachments and tasks
+
+Revision ID: 0004_scoped_row_ids
+Revises: 0003_task_priority_index
+Create Date: 2026-10-18
+
+Provider ids are only unique per mailbox, so the thread writer now derives
+row ids from the user and the provider id (uuid5), and task ids from the
+thread row id and the task kind. Existing rows are re-keyed to those ids;
+the upserts would otherwise insert them a second time next to the old
+rows. Foreign keys onto the re-keyed tables are dropped while the ids
+(and every reference to them) are rewritten, then restored.
+
+Tasks: for each thread and task type (review tasks excepted: their key
+is the attachment, which the row does not record), the most recently
+updated task takes the derived id, so a task the user already completed
+or dismissed is recognised on the next sync.
+
+The id scheme is copied here rather than imported, so this revision keeps
+doing what it did when the application code moves on.
+"""
+
+import re
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_scoped_row_ids"
+down_revision = "0003_task_priority_index"
+branch_labels = None
+depends_on = None
+
+
+# core.storage.thread_writer.THREAD_ID_NAMESPACE
+ROW_ID_NAMESPACE = uuid.UUID("6f1c2a4e-8d0b-5e7a-9c3f-2b4d6e8f0a1c")
+# core.workflow.task_generator.TASK_ID_NAMESPACE
+TASK_ID_NAMESPACE = uuid.UUID("3b8e5f0a-6c2d-5a1e-8f4b-9d7c0e2a4b6f")
+
+# Ids already in the derived form (databases created by init_db after the change)
+SCOPED = re.compile(r"^(msg|att)-[0-9a-f]{8}-[0-9a-f]{4}-5[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$")
+
+
+def upgrade():
+    bind = op.get_bind()
+    
+    threads = {
+        row.id: f"thread-{uuid.uuid5(ROW_ID_NAMESPACE, f'{row.user_id}:{row.external_id}')}"
+        for row in bind.execute(sa.text("SELECT id, user_id, external_id FROM threads"))
+    }
+    _rekey(bind, "threads", {old: new for old, new in threads.items() if old != new})
+    
+    messages = {
+        row.id: f"msg-{uuid.uuid5(ROW_ID_NAMESPACE, f'{row.user_id}:message:{row.id}')}"
+        for row in bind.execute(sa.text(
+            "SELECT m.id, t.user_id FROM messages m JOIN threads t ON t.id = m.thread_id"
+        ))
+        if not SCOPED.match(row.id)
+    }
+    _rekey(bind, "messages", messages)
+    
+    attachments = {
+        row.id: f"att-{uuid.uuid5(ROW_ID_NAMESPACE, f'{row.user_id}:attachment:{row.id}')}"
+        for row in bind.execute(sa.text("SELECT id, user_id FROM attachments"))
+        if not SCOPED.match(row.id)
+    }
+    _rekey(bind, "attachments", attachments)
+    
+    tasks = {}
+    taken = set()
+    rows = bind.execute(sa.text(
+        "SELECT id, thread_id, task_type FROM tasks "
+        "WHERE task_type <> 'REVIEW' ORDER BY updated_at DESC NULLS LAST, id"
+    )).all()
+    existing = {row.id for row in rows}
+    for row in rows:
+        key = f"{row.thread_id}:{row.task_type.lower()}"
+        new = f"task-{uuid.uuid5(TASK_ID_NAMESPACE, key)}"
+        if new in taken or new in existing:
+            continue
+        taken.add(new)
+        tasks[row.id] = new
+    _rekey(bind, "tasks", tasks)
+
+
+def downgrade():
+    # The provider ids the old rows were keyed on are not recoverable
+    # from the derived ids; the rows stay valid under their new ids.
+    pass
+
+
+def _rekey(bind, table: str, mapping: dict) -> None:
+    """Rewrite ``table.id`` per ``mapping`` (old -> new), and every foreign key onto it."""
+    if not mapping:
+        return
+    inspector = sa.inspect(bind)
+    references = [
+        (name, fk)
+        for name in inspector.get_table_names()
+        for fk in inspector.get_foreign_keys(name)
+        if fk["referred_table"] == table
+    ]
+    for name, fk in references:
+        op.drop_constraint(fk["name"], name, type_="foreignkey")
+    
+    op.execute("CREATE TEMPORARY TABLE rekey (old_id VARCHAR PRIMARY KEY, new_id VARCHAR NOT NULL)")
+    bind.execute(
+        sa.text("INSERT INTO rekey (old_id, new_id) VALUES (:old, :new)"),
+        [{"old": old, "new": new} for old, new in mapping.items()],
+    )
+    columns = [(table, "id")] + [(name, fk["constrained_columns"][0]) for name, fk in references]
+    for name, column in columns:
+        op.execute(
+            f"UPDATE {name} SET {column} = rekey.new_id FROM rekey WHERE {name}.{column} = rekey.old_id"
+        )
+    op.execute("DROP TABLE rekey")
+    
+    for name, fk in references:
+        op.create_foreign_key(
+            fk["name"],
+            name,
+            table,
+            fk["constrained_columns"],
+            fk["referred_columns"],
+            ondelete=fk.get("options", {}).get("ondelete"),
+        )
@@ -1,5 +1,14 @@
 # API Middleware
-from .auth import get_current_user, get_optional_user
-from .rate_limit import rate_limit_middleware
+from .auth import get_current_user, get_optional_user, require_operator
+from .rate_limit import rate_limit_middleware, rate_limiter, RateLimiter, InMemoryRateLimiter, RedisRateLimiter
 
-__all__ = ["get_current_user", "get_optional_user", "rate_limit_middleware"]
+__all__ = [
+    "get_current_user",
+    "get_optional_user",
+    "require_operator",
+    "rate_limit_middleware",
+    "rate_limiter",
+    "RateLimiter",
+    "InMemoryRateLimiter",
+    "RedisRateLimiter",
+]
@@ -4,14 +4,17 @@ API Auth Middleware
 JWT validation for protected routes.
 """
 
+import hmac
 from typing import Optional
 from fastapi import Request, HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from app.config import settings
 from core.auth.jwt import verify_token, TokenData
 
 
 security = HTTPBearer()
+operator_security = HTTPBearer(auto_error=False)
 
 
 async def get_current_user(
@@ -23,7 +26,7 @@ async def get_current_user(
     Raises HTTPException 401 if not authenticated.
     """
     token = credentials.credentials
-    token_data = verify_token(token)
+    token_data = await verify_token(token)
     
     if not token_data:
         raise HTTPException(
@@ -49,4 +52,28 @@ async def get_optional_user(
         return None
     
     token = auth_header.split(" ")[1]
-    return verify_token(token)
+    return await verify_token(token)
+
+
+async def require_operator(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(operator_security),
+) -> None:
+    """
+    Dependency for operator-only endpoints such as /metrics.
+    
+    They expose account and job ids across all users, so a user JWT is
+    not enough: the bearer token must be settings.METRICS_TOKEN.
+    
+    Raises HTTPException 404 while no token is configured (the endpoint
+    is off), 401 for a missing or wrong token.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if credentials is None or not hmac.compare_digest(
+        credentials.credentials.encode(), settings.METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid operator token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
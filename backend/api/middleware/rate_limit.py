@@ -1,42 +1,239 @@
 """
 Rate Limiting Middleware
 ------------------------
-Simple rate limiting for API protection.
+Per-IP and per-user rate limiting for API protection.
+
+Two interchangeable backends:
+
+- RedisRateLimiter: GCRA (generic cell rate algorithm) in one Lua script,
+  so limits hold across every uvicorn worker and node; one key per client
+- InMemoryRateLimiter: sliding-window counter per process, O(1) per
+  request, with keys expired a whole time bucket at a time
+
+Requests are limited by client IP and, when they carry a valid bearer
+token, by the token's user_id as well. If Redis is unreachable, limits
+fall back to the in-memory backend rather than failing requests.
 """
 
-from typing import Optional
+import importlib.util
+import math
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
 from fastapi import Request, HTTPException
-from datetime import datetime
-import asyncio
 
+from app.config import settings
+from core.auth.jwt import verify_token
 
-# Simple in-memory rate limiter (use Redis in production)
-_request_counts: dict = {}
 
+# (allowed, seconds until the next request would be allowed)
+Decision = Tuple[bool, float]
 
-async def rate_limit_middleware(request: Request, calls_per_minute: int = 60):
+
+class InMemoryRateLimiter:
     """
-    Simple rate limiting.
+    Sliding-window counter limiter for a single process.
     
-    In production, use Redis-based rate limiting.
+    Each key keeps the counts of the current and previous fixed windows;
+    the previous window is weighted by how much of it still overlaps the
+    sliding window. Keys are filed under the second they expire, and
+    every hit drops the buckets that have passed, so cleanup never scans
+    live keys.
     """
-    client_ip = request.client.host
-    current_minute = datetime.utcnow().strftime("%Y-%m-%d-%H-%M")
-    key = f"{client_ip}:{current_minute}"
     
-    # Increment counter
-    _request_counts[key] = _request_counts.get(key, 0) + 1
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        # key -> [window index, count in window, count in previous window, expires at]
+        self._counters: Dict[str, List] = {}
+        self._expiry: Dict[int, Set[str]] = {}
+    
+    async def hit(self, key: str, limit: int, window: float) -> Decision:
+        """Count a request against ``limit`` per ``window`` seconds."""
+        now = self._clock()
+        self._expire(now)
+        
+        index = int(now // window)
+        entry = self._counters.get(key)
+        if entry is None:
+            entry = self._counters[key] = [index, 0, 0, 0.0]
+        elif entry[0] != index:
+            # Roll the window; a gap of more than one window leaves nothing behind
+            entry[2] = entry[1] if entry[0] == index - 1 else 0
+            entry[0], entry[1] = index, 0
+        
+        overlap = 1.0 - (now - index * window) / window
+        estimate = entry[2] * overlap + entry[1]
+        if estimate + 1 > limit:
+            # Wait until enough of the previous window has slid out
+            if entry[2] and entry[1] < limit:
+                retry_after = (estimate + 1 - limit) / entry[2] * window
+            else:
+                retry_after = (index + 1) * window - now
+            return False, min(retry_after, window)
+        
+        entry[1] += 1
+        # Counts matter until the end of the next window
+        expires = int(math.ceil((index + 2) * window))
+        if expires != entry[3]:
+            entry[3] = expires
+            self._expiry.setdefault(expires, set()).add(key)
+        return True, 0.0
+    
+    def __len__(self) -> int:
+        return len(self._counters)
+    
+    def _expire(self, now: float) -> None:
+        # Only a couple of buckets are ever pending (one per live window)
+        while self._expiry:
+            due = min(self._expiry)
+            if due > now:
+                return
+            for key in self._expiry.pop(due):
+                entry = self._counters.get(key)
+                # Keys hit since are filed under a later bucket too
+                if entry is not None and entry[3] <= due:
+                    del self._counters[key]
+
+
+# GCRA: one "theoretical arrival time" per key, advanced by limit/window per request.
+# Uses the Redis server clock so every worker agrees on time.
+_GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000000 + tonumber(t[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if now < allow_at then
+    return {0, allow_at - now}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil((new_tat - now) / 1000))
+return {1, 0}
+"""
+
+
+class RedisRateLimiter:
+    """GCRA limiter shared by all processes through Redis (needs the redis package)."""
+    
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        import redis.asyncio as redis
+        
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_GCRA_SCRIPT)
     
-    if _request_counts[key] > calls_per_minute:
-        raise HTTPException(
-            status_code=429,
-            detail="Rate limit exceeded. Try again later.",
+    async def hit(self, key: str, limit: int, window: float) -> Decision:
+        """Count a request against ``limit`` per ``window`` seconds."""
+        period = int(window * 1_000_000)
+        allowed, wait_us = await self._script(
+            keys=[self.prefix + key],
+            args=[period // limit, period],
         )
+        return bool(allowed), int(wait_us) / 1_000_000
+    
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class RateLimiter:
+    """Applies the per-IP and per-user limits, falling back to memory if the backend fails."""
+    
+    def __init__(
+        self,
+        backend=None,
+        ip_limit: int = 60,
+        user_limit: int = 120,
+        window_seconds: float = 60.0,
+    ):
+        self.fallback = InMemoryRateLimiter()
+        self.backend = backend or self.fallback
+        self.ip_limit = ip_limit
+        self.user_limit = user_limit
+        self.window_seconds = window_seconds
+        
+        # Counters
+        self.allowed = 0
+        self.limited = 0
+        self.backend_errors = 0
+    
+    async def check(self, client_ip: str, user_id: Optional[str] = None) -> None:
+        """
+        Count one request.
+        
+        Raises:
+            HTTPException: 429 with Retry-After when a limit is exceeded
+        """
+        limits = [(f"ip:{client_ip}", self.ip_limit)]
+        if user_id is not None:
+            limits.append((f"user:{user_id}", self.user_limit))
+        
+        for key, limit in limits:
+            allowed, retry_after = await self._hit(key, limit)
+            if not allowed:
+                self.limited += 1
+                raise HTTPException(
+                    status_code=429,
+                    detail="Rate limit exceeded. Try again later.",
+                    headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+                )
+        self.allowed += 1
+    
+    def stats(self) -> dict:
+        """Counters for monitoring."""
+        return {
+            "backend": type(self.backend).__name__,
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "backend_errors": self.backend_errors,
+            "local_keys": len(self.fallback),
+        }
+    
+    async def close(self) -> None:
+        if self.backend is not self.fallback:
+            await self.backend.close()
+    
+    async def _hit(self, key: str, limit: int) -> Decision:
+        try:
+            return await self.backend.hit(key, limit, self.window_seconds)
+        except Exception:
+            # Redis down: keep limiting per process instead of failing requests
+            if self.backend is self.fallback:
+                raise
+            self.backend_errors += 1
+            return await self.fallback.hit(key, limit, self.window_seconds)
+
+
+def create_rate_limiter() -> RateLimiter:
+    """Limiter configured from settings (Redis only when selected and installed)."""
+    backend = None
+    if settings.RATE_LIMIT_BACKEND == "redis" and importlib.util.find_spec("redis") is not None:
+        backend = RedisRateLimiter(settings.REDIS_URL)
+    return RateLimiter(
+        backend,
+        ip_limit=settings.RATE_LIMIT_IP_PER_MINUTE,
+        user_limit=settings.RATE_LIMIT_USER_PER_MINUTE,
+    )
+
+
+# Singleton instance
+rate_limiter = create_rate_limiter()
+
+
+async def rate_limit_middleware(request: Request):
+    """
+    Rate limiting dependency.
+    
+    Use as ``dependencies=[Depends(rate_limit_middleware)]`` on a router.
+    """
+    client_ip = request.client.host if request.client else "unknown"
+    
+    user_id = None
+    auth_header = request.headers.get("Authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        token_data = await verify_token(auth_header.split(" ")[1])
+        if token_data:
+            user_id = token_data.user_id
     
-    # Clean old entries (basic cleanup)
-    keys_to_remove = [
-        k for k in _request_counts.keys()
-        if k.split(":")[1] != current_minute
-    ]
-    for k in keys_to_remove:
-        del _request_counts[k]
+    await rate_limiter.check(client_ip, user_id)
@@ -0,0 +1,88 @@
+"""
+API Pagination
+--------------
+Keyset (cursor) pagination helpers for list endpoints.
+
+A page is fetched with ``WHERE (sort key) < (last row's sort key)`` on an
+index matching the ORDER BY, so every page costs the same no matter how
+deep it is (OFFSET would scan and discard all previous rows).
+
+The cursor is the last row's sort key, base64-encoded; clients pass back
+the ``X-Next-Cursor`` header of one page as ``cursor`` for the next.
+Cursors come from clients, so decoded values are checked against the sort
+columns' types before they reach SQL.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Postgres INTEGER range
+INT_MIN, INT_MAX = -2**31, 2**31 - 1
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for a row's sort key (datetimes and scalars)."""
+    payload = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> List[Any]:
+    """
+    Sort key values from a cursor, one of each of ``types``.
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed or a value has the wrong type
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("wrong cursor size")
+        values = [
+            datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+            for value in payload
+        ]
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+    
+    if not all(_valid(value, expected) for value, expected in zip(values, types)):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def after_cursor(query, columns: Sequence, cursor: Optional[str]):
+    """Restrict a query ordered by ``columns`` (all DESC) to rows after the cursor."""
+    if not cursor:
+        return query
+    values = decode_cursor(cursor, [column.type.python_type for column in columns])
+    return query.where(tuple_(*columns) < tuple_(*values))
+
+
+def set_next_cursor(response: Response, rows: Sequence, limit: int, key) -> None:
+    """Set the next-page cursor header when the page is full."""
+    if rows and len(rows) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(key(rows[-1]))
+
+
+def _valid(value: Any, expected: type) -> bool:
+    # Anything the database would reject must fail here as a 400, not a 500
+    if expected is int:
+        # bool is an int subclass
+        return type(value) is int and INT_MIN <= value <= INT_MAX
+    if expected is datetime:
+        # Sort columns are naive UTC
+        return isinstance(value, datetime) and value.tzinfo is None
+    if expected is str:
+        return isinstance(value, str) and "\x00" not in value
+    return isinstance(value, expected)
@@ -5,8 +5,12 @@ OAuth endpoints for Gmail and Outlook.
 """
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.security import HTTPAuthorizationCredentials
 from pydantic import BaseModel
 
+from api.middleware.auth import security
+from core.auth.jwt import revoke_token
+
 router = APIRouter()
 
 
@@ -55,6 +59,7 @@ async def get_current_user():
 
 
 @router.post("/logout")
-async def logout():
-    """Logout current user."""
+async def logout(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Logout current user (the access token stops verifying)."""
+    await revoke_token(credentials.credentials)
     return {"message": "Logged out"}
@@ -4,28 +4,81 @@ API Routes - Emails
 Email sync and management endpoints.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
+from api.middleware.auth import get_current_user
+from core.auth.jwt import TokenData
+from core.storage import get_db
+from core.sync import sync_queue, sync_workers
+from models.connected_account import ConnectedAccount
+
 router = APIRouter()
 
 
 @router.post("/sync")
-async def sync_emails():
+async def sync_emails(
+    user: TokenData = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Trigger email sync from provider.
     
-    Fetches new emails since last sync.
+    Queues one sync job per connected account; workers fetch new emails
+    since the last sync. An account already queued or syncing keeps its
+    current job.
     """
-    # TODO: Implement email sync
-    return {"message": "Sync started", "status": "pending"}
+    result = await db.execute(
+        select(ConnectedAccount.id).where(ConnectedAccount.user_id == user.user_id)
+    )
+    account_ids = list(result.scalars())
+    if not account_ids:
+        raise HTTPException(status_code=404, detail="No connected accounts")
+    
+    jobs = [await sync_queue.enqueue(user.user_id, account_id) for account_id in account_ids]
+    return {
+        "message": "Sync started",
+        "status": "pending",
+        "job_ids": [job.id for job in jobs],
+    }
 
 
 @router.get("/sync/status")
-async def sync_status():
-    """Get current sync status."""
+async def sync_status(user: TokenData = Depends(get_current_user)):
+    """Get current sync status (latest job per account, live counters)."""
+    latest = {}
+    for job in await sync_queue.jobs_for_user(user.user_id):
+        latest.setdefault(job.account_id, job)
+    
+    accounts = []
+    for job in latest.values():
+        counters = {
+            "threads_fetched": job.threads_fetched,
+            "threads_analyzed": job.threads_analyzed,
+            "tasks_created": job.tasks_created,
+        }
+        # Jobs running in this process report fresher counters than the DB
+        live = sync_workers.progress(job.id)
+        if live is not None:
+            counters = live.as_dict()
+        accounts.append({
+            "account_id": job.account_id,
+            "job_id": job.id,
+            "status": job.status.value,
+            "attempts": job.attempts,
+            "error": job.error,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+            **counters,
+        })
+    
+    statuses = {a["status"] for a in accounts}
+    finished = [a["finished_at"] for a in accounts if a["status"] == "succeeded"]
     return {
-        "status": "idle",
-        "last_sync": None,
-        "threads_synced": 0,
+        "status": next((s for s in ("running", "queued", "failed") if s in statuses), "idle"),
+        "last_sync": max(finished, default=None),
+        "threads_synced": sum(a["threads_fetched"] for a in accounts),
+        "accounts": accounts,
     }
@@ -5,29 +5,85 @@ Task management endpoints.
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.middleware.auth import get_current_user
+from api.pagination import after_cursor, set_next_cursor
 from contracts import TaskDTOv1, PriorityLevel, TaskStatus
 from contracts.mocks import create_mock_task
+from core.auth.jwt import TokenData
+from core.storage import get_db
+from models import task as task_model
+from models.task import Task
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[TaskDTOv1])
 async def list_tasks(
+    response: Response,
     status: Optional[TaskStatus] = None,
     priority: Optional[PriorityLevel] = None,
-    limit: int = Query(default=50, le=100),
+    limit: int = Query(default=50, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None),
+    user: TokenData = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     List tasks for current user.
     
-    Returns tasks sorted by priority_score descending.
+    Returns tasks sorted by priority_score descending. Pass the
+    ``X-Next-Cursor`` response header back as ``cursor`` for the next page.
     """
-    # TODO: Replace with real DB query
-    mock_tasks = [create_mock_task() for _ in range(3)]
-    return mock_tasks
+    result = await db.execute(list_tasks_query(user.user_id, limit, cursor, status, priority))
+    tasks = list(result.scalars())
+    set_next_cursor(response, tasks, limit, lambda task: (task.priority_score, task.id))
+    return [_task_dto(task) for task in tasks]
+
+
+def list_tasks_query(
+    user_id: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    status: Optional[TaskStatus] = None,
+    priority: Optional[PriorityLevel] = None,
+):
+    """
+    One page of the task list.
+    
+    Served by idx_tasks_user_status_priority when filtered by status,
+    otherwise by idx_tasks_user_priority.
+    """
+    query = select(Task).where(Task.user_id == user_id)
+    if status is not None:
+        query = query.where(Task.status == task_model.TaskStatus(status.value))
+    if priority is not None:
+        query = query.where(Task.priority == task_model.PriorityLevel(priority.value))
+    query = query.order_by(Task.priority_score.desc(), Task.id.desc()).limit(limit)
+    return after_cursor(query, [Task.priority_score, Task.id], cursor)
+
+
+def _task_dto(task: Task) -> TaskDTOv1:
+    return TaskDTOv1(
+        task_id=task.id,
+        thread_id=task.thread_id,
+        user_id=task.user_id,
+        title=task.title,
+        description=task.description,
+        task_type=task.task_type.value,
+        priority=task.priority.value,
+        priority_score=task.priority_score,
+        priority_explanation=task.priority_explanation,
+        effort=task.effort.value,
+        deadline=task.deadline,
+        deadline_source=task.deadline_source,
+        status=task.status.value,
+        created_at=task.created_at,
+        updated_at=task.updated_at,
+    )
 
 
 @router.get("/{task_id}", response_model=TaskDTOv1)
@@ -5,18 +5,27 @@ Email thread endpoints.
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
 from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.middleware.auth import get_current_user
+from api.pagination import after_cursor, set_next_cursor
 from contracts import ThreadIntelV1
 from contracts.mocks import create_mock_thread_intel
+from core.auth.jwt import TokenData
+from core.intelligence import intel_cache
+from core.storage import get_db
+from core.storage.thread_reader import load_threads
+from models.thread import ThreadSummary
 
 router = APIRouter()
 
 
 class ThreadListItem(BaseModel):
-    """Lightweight thread for list view."""
+    """Lightweight thread for list view (a thread_summaries row)."""
     thread_id: str
     subject: str
     summary: str
@@ -28,25 +37,41 @@ class ThreadListItem(BaseModel):
 
 @router.get("/", response_model=List[ThreadListItem])
 async def list_threads(
-    limit: int = Query(default=20, le=50),
-    offset: int = Query(default=0, ge=0),
+    response: Response,
+    limit: int = Query(default=20, ge=1, le=50),
+    cursor: Optional[str] = Query(default=None),
+    user: TokenData = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     List email threads for current user.
     
-    Returns threads sorted by last_updated descending.
+    Returns threads sorted by last_updated descending. Pass the
+    ``X-Next-Cursor`` response header back as ``cursor`` for the next page.
     """
-    # TODO: Replace with real DB query
-    intel = create_mock_thread_intel()
-    return [{
-        "thread_id": intel.thread_id,
-        "subject": "Contract Review - Final Terms",
-        "summary": intel.summary,
-        "intent": intel.intent.value,
-        "urgency_score": intel.urgency_score,
-        "last_updated": datetime.utcnow(),
-        "has_attachments": len(intel.attachment_summaries) > 0,
-    }]
+    result = await db.execute(list_threads_query(user.user_id, limit, cursor))
+    rows = result.all()
+    set_next_cursor(response, rows, limit, lambda row: (row.last_updated, row.thread_id))
+    return [ThreadListItem(**row._mapping) for row in rows]
+
+
+def list_threads_query(user_id: str, limit: int, cursor: Optional[str] = None):
+    """One page of the thread list, read from the thread_summaries projection."""
+    query = (
+        select(
+            ThreadSummary.thread_id,
+            ThreadSummary.subject,
+            ThreadSummary.summary,
+            ThreadSummary.intent,
+            ThreadSummary.urgency_score,
+            ThreadSummary.last_updated,
+            ThreadSummary.has_attachments,
+        )
+        .where(ThreadSummary.user_id == user_id)
+        .order_by(ThreadSummary.last_updated.desc(), ThreadSummary.thread_id.desc())
+        .limit(limit)
+    )
+    return after_cursor(query, [ThreadSummary.last_updated, ThreadSummary.thread_id], cursor)
 
 
 @router.get("/{thread_id}", response_model=ThreadIntelV1)
@@ -63,11 +88,21 @@ async def get_thread(thread_id: str):
 
 
 @router.post("/{thread_id}/refresh")
-async def refresh_thread(thread_id: str):
+async def refresh_thread(
+    thread_id: str,
+    user: TokenData = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Re-process thread intelligence.
     
     Useful after new emails arrive or if user wants updated analysis.
+    Goes through the intel cache: a thread whose content has not changed
+    since its last analysis is not sent to the LLM again.
     """
-    # TODO: Trigger re-analysis
+    stored = (await load_threads(db, user.user_id, [thread_id])).get(thread_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Thread not found")
+    
+    await intel_cache.get_or_analyze(stored.thread)
     return {"thread_id": thread_id, "refreshed": True}
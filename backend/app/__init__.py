@@ -1,5 +1,12 @@
 # SortMail Backend App
 from .config import settings
-from .main import app
 
 __all__ = ["settings", "app"]
+
+
+def __getattr__(name):
+    # Imported lazily: app.main imports core modules, which import app.config
+    if name == "app":
+        from .main import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,10 +3,17 @@ SortMail Backend - FastAPI Application Entry Point
 """
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
+from api.middleware import rate_limiter, require_operator
+from core.auth import token_manager, token_revocations, verified_tokens
+from core.ingestion import gmail_quota, graph_quota
+from core.intelligence import document_parser
+from core.network import http_pool
+from core.storage import db_pool_metrics, file_storage
+from core.sync import sync_workers
 
 
 @asynccontextmanager
@@ -15,8 +22,18 @@ async def lifespan(app: FastAPI):
     # Startup
     print(f"🚀 Starting SortMail API v{settings.VERSION}")
     print(f"📧 Environment: {settings.ENVIRONMENT}")
+    await http_pool.start()
+    token_manager.start(settings.TOKEN_RENEWAL_INTERVAL_SECONDS)
+    if settings.SYNC_WORKERS:
+        sync_workers.start()
     yield
     # Shutdown
+    await sync_workers.stop()
+    await token_manager.stop()
+    await rate_limiter.close()
+    await token_revocations.close()
+    await document_parser.close()
+    await http_pool.close()
     print("👋 Shutting down SortMail API")
 
 
@@ -53,6 +70,23 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", dependencies=[Depends(require_operator)], include_in_schema=False)
+async def metrics():
+    """Runtime metrics for capacity planning (operator token only)."""
+    return {
+        "http_pool": http_pool.stats(),
+        "db_pool": db_pool_metrics.stats(),
+        "file_storage": file_storage.stats(),
+        "document_parser": document_parser.stats(),
+        "tokens": token_manager.stats(),
+        "jwt_cache": verified_tokens.stats(),
+        "token_revocations": token_revocations.stats(),
+        "quota": {"gmail": gmail_quota.stats(), "outlook": graph_quota.stats()},
+        "sync": sync_workers.stats(),
+        "rate_limit": rate_limiter.stats(),
+    }
+
+
 # Import and include routers (uncomment as implemented)
 # from api.routes import auth, emails, threads, tasks, drafts, reminders
 # app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
@@ -11,7 +11,7 @@ No Gmail/Outlook specific fields should leak through.
 """
 
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -37,6 +37,10 @@ class AttachmentRef(BaseModel):
         ge=0,
         description="File size in bytes"
     )
+    message_id: Optional[str] = Field(
+        default=None,
+        description="message_id of the EmailMessage it was attached to (if known)"
+    )
 
 
 class EmailMessage(BaseModel):
@@ -80,6 +84,7 @@ class EmailThreadV1(BaseModel):
     
     Version History:
     - v1.0 (2026-01-18): Initial version
+    - v1.1: Added optional AttachmentRef.message_id (attachment → message link)
     """
     
     thread_id: str = Field(
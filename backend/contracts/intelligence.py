@@ -16,7 +16,7 @@ All analysis flows through the single ThreadIntelV1 contract.
 
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -95,6 +95,7 @@ class ThreadIntelV1(BaseModel):
     
     Version History:
     - v1.0 (2026-01-18): Initial version
+    - v1.1: Added optional stage_timings_ms and degraded_stages (observability)
     """
     
     thread_id: str = Field(
@@ -156,6 +157,16 @@ class ThreadIntelV1(BaseModel):
         description="When this intelligence was generated"
     )
     
+    # Observability (optional, v1.1)
+    stage_timings_ms: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Wall time per analysis stage in milliseconds (plus 'total')"
+    )
+    degraded_stages: List[str] = Field(
+        default_factory=list,
+        description="Stages that timed out or failed and used a fallback value"
+    )
+    
     class Config:
         json_schema_extra = {
             "example": {
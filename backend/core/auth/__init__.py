@@ -1,13 +1,19 @@
 # Auth Module
-from .jwt import create_access_token, create_refresh_token, create_token_pair, verify_token
+from .jwt import create_access_token, create_refresh_token, create_token_pair, verify_token, revoke_token, verified_tokens, token_revocations
 from .oauth_google import get_google_auth_url
 from .oauth_microsoft import get_microsoft_auth_url
+from .token_manager import TokenManager, token_manager
 
 __all__ = [
     "create_access_token",
     "create_refresh_token", 
     "create_token_pair",
     "verify_token",
+    "revoke_token",
+    "verified_tokens",
+    "token_revocations",
     "get_google_auth_url",
     "get_microsoft_auth_url",
+    "TokenManager",
+    "token_manager",
 ]
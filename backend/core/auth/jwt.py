@@ -2,10 +2,34 @@
 JWT Token Management
 --------------------
 Handles JWT creation, validation, and refresh.
+
+Verified tokens are cached per process (keyed by the token's SHA-256,
+until the token's own ``exp``), so polling clients don't pay for a
+decode and HMAC check on every request.
+
+Logout revokes a token by its ``jti`` until it would have expired anyway.
+Revocations live in one of two interchangeable stores:
+
+- RedisRevocationStore: one key per revoked token with the token's
+  remaining life as TTL, so a logout holds on every worker and node
+- InMemoryRevocationStore: per process
+
+Every verification checks for revocation, cached or not. Revocations
+made in this process apply at once. A "not revoked" answer from Redis is
+remembered locally for ``check_seconds``, so a polling client costs one
+Redis round trip per interval rather than one per request; a logout on
+another worker takes effect within that interval. If Redis is
+unreachable, the revocations this process has seen still apply.
 """
 
+import hashlib
+import importlib.util
+import math
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
 from jose import JWTError, jwt
 from pydantic import BaseModel
 
@@ -17,6 +41,8 @@ class TokenData(BaseModel):
     user_id: str
     email: str
     exp: datetime
+    # Revocation key; tokens issued before it existed are keyed by digest
+    jti: Optional[str] = None
 
 
 class TokenPair(BaseModel):
@@ -34,6 +60,7 @@ def create_access_token(user_id: str, email: str) -> str:
         "email": email,
         "exp": expire,
         "type": "access",
+        "jti": uuid.uuid4().hex,
     }
     return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
@@ -45,6 +72,7 @@ def create_refresh_token(user_id: str) -> str:
         "sub": user_id,
         "exp": expire,
         "type": "refresh",
+        "jti": uuid.uuid4().hex,
     }
     return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
@@ -57,8 +85,263 @@ def create_token_pair(user_id: str, email: str) -> TokenPair:
     )
 
 
-def verify_token(token: str) -> Optional[TokenData]:
-    """Verify and decode a JWT token."""
+class VerifiedTokenCache:
+    """
+    Bounded LRU of verified tokens, each expiring at its ``exp``.
+    
+    Only valid tokens are cached, so garbage tokens cannot evict real
+    ones. Revocation is not checked here (see TokenRevocations).
+    """
+    
+    def __init__(self, max_entries: int = 10000, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[bytes, Tuple[TokenData, float]]" = OrderedDict()
+        
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, token: str) -> Optional[TokenData]:
+        """Cached TokenData, or None if not cached (or expired)."""
+        if not self.max_entries:
+            return None
+        key = _digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        token_data, expires_at = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return token_data
+    
+    def put(self, token: str, token_data: TokenData, expires_at: float) -> None:
+        if not self.max_entries:
+            return
+        key = _digest(token)
+        self._entries[key] = (token_data, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def discard(self, token: str) -> None:
+        self._entries.pop(_digest(token), None)
+    
+    def clear(self) -> None:
+        """Forget all cached tokens."""
+        self._entries.clear()
+    
+    def stats(self) -> dict:
+        """Counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+class InMemoryRevocationStore:
+    """Revoked token keys of a single process, each kept until its token expires."""
+    
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._revoked: Dict[str, float] = {}
+    
+    async def revoke(self, key: str, ttl: float) -> None:
+        now = self._clock()
+        # Forget revocations of tokens that have expired anyway
+        self._revoked = {k: exp for k, exp in self._revoked.items() if exp > now}
+        self._revoked[key] = now + ttl
+    
+    async def is_revoked(self, key: str) -> bool:
+        expires_at = self._revoked.get(key)
+        return expires_at is not None and expires_at > self._clock()
+    
+    def clear(self) -> None:
+        self._revoked.clear()
+    
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+class RedisRevocationStore:
+    """Revoked token keys shared by all processes through Redis (needs the redis package)."""
+    
+    def __init__(self, url: str, prefix: str = "revoked:"):
+        import redis.asyncio as redis
+        
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+    
+    async def revoke(self, key: str, ttl: float) -> None:
+        await self._client.set(self.prefix + key, 1, ex=max(1, math.ceil(ttl)))
+    
+    async def is_revoked(self, key: str) -> bool:
+        return bool(await self._client.exists(self.prefix + key))
+    
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class TokenRevocations:
+    """Revoked tokens, falling back to this process's revocations if the backend fails."""
+    
+    def __init__(
+        self,
+        backend=None,
+        clock: Callable[[], float] = time.time,
+        check_seconds: float = 5.0,
+        max_checked: int = 10000,
+    ):
+        self.fallback = InMemoryRevocationStore(clock)
+        self.backend = backend if backend is not None else self.fallback
+        self.check_seconds = check_seconds
+        self.max_checked = max_checked
+        self._clock = clock
+        # Keys the backend said were not revoked -> until when to trust that
+        self._not_revoked: "OrderedDict[str, float]" = OrderedDict()
+        
+        # Counters
+        self.revocations = 0
+        self.backend_checks = 0
+        self.local_hits = 0
+        self.backend_errors = 0
+    
+    async def revoke(self, key: str, expires_at: float) -> None:
+        """Reject ``key`` until ``expires_at`` (the token's ``exp``)."""
+        ttl = expires_at - self._clock()
+        if ttl <= 0:
+            return
+        self.revocations += 1
+        self._not_revoked.pop(key, None)
+        if self.backend is not self.fallback:
+            # Kept locally too: applies here at once, and while Redis is down
+            await self.fallback.revoke(key, ttl)
+        try:
+            await self.backend.revoke(key, ttl)
+        except Exception:
+            if self.backend is self.fallback:
+                raise
+            self.backend_errors += 1
+    
+    async def is_revoked(self, key: str) -> bool:
+        if await self.fallback.is_revoked(key):
+            return True
+        if self.backend is self.fallback:
+            return False
+        
+        now = self._clock()
+        checked_until = self._not_revoked.get(key)
+        if checked_until is not None and checked_until > now:
+            self.local_hits += 1
+            return False
+        
+        try:
+            self.backend_checks += 1
+            revoked = await self.backend.is_revoked(key)
+        except Exception:
+            # Redis down: this process's revocations (checked above) still apply
+            self.backend_errors += 1
+            return False
+        if not revoked and self.check_seconds > 0:
+            self._not_revoked[key] = now + self.check_seconds
+            self._not_revoked.move_to_end(key)
+            while len(self._not_revoked) > self.max_checked:
+                self._not_revoked.popitem(last=False)
+        return revoked
+    
+    def clear(self) -> None:
+        """Forget this process's revocations and remembered checks."""
+        self.fallback.clear()
+        self._not_revoked.clear()
+    
+    def stats(self) -> dict:
+        """Counters for monitoring."""
+        return {
+            "backend": type(self.backend).__name__,
+            "revocations": self.revocations,
+            "backend_checks": self.backend_checks,
+            "local_hits": self.local_hits,
+            "backend_errors": self.backend_errors,
+            "local_revoked": len(self.fallback),
+        }
+    
+    async def close(self) -> None:
+        if self.backend is not self.fallback:
+            await self.backend.close()
+
+
+def create_token_revocations() -> TokenRevocations:
+    """Revocation store configured from settings (Redis only when selected and installed)."""
+    backend = None
+    if settings.JWT_REVOCATION_BACKEND == "redis" and importlib.util.find_spec("redis") is not None:
+        backend = RedisRevocationStore(settings.REDIS_URL)
+    return TokenRevocations(
+        backend,
+        check_seconds=settings.JWT_REVOCATION_CHECK_SECONDS,
+        max_checked=settings.JWT_CACHE_MAX_ENTRIES,
+    )
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _revocation_key(token: str, token_data: TokenData) -> str:
+    return token_data.jti or _digest(token).hex()
+
+
+# Singleton instances
+verified_tokens = VerifiedTokenCache(settings.JWT_CACHE_MAX_ENTRIES)
+token_revocations = create_token_revocations()
+
+
+async def verify_token(token: str) -> Optional[TokenData]:
+    """Verify and decode a JWT token (None if invalid, expired or revoked)."""
+    token_data = verified_tokens.get(token)
+    if token_data is None:
+        decoded = _decode_token(token)
+        if decoded is None:
+            return None
+        token_data, expires_at = decoded
+        verified_tokens.put(token, token_data, expires_at)
+    
+    # Cache hits too: the logout may have happened on another worker
+    if await token_revocations.is_revoked(_revocation_key(token, token_data)):
+        verified_tokens.discard(token)
+        return None
+    return token_data
+
+
+async def revoke_token(token: str) -> bool:
+    """
+    Revoke a token on every worker sharing the revocation store (logout).
+    
+    Returns:
+        False if the token was not valid to begin with
+    """
+    decoded = _decode_token(token)
+    if decoded is None:
+        return False
+    token_data, expires_at = decoded
+    await token_revocations.revoke(_revocation_key(token, token_data), expires_at)
+    verified_tokens.discard(token)
+    return True
+
+
+def _decode_token(token: str) -> Optional[Tuple[TokenData, float]]:
+    """TokenData and the ``exp`` timestamp, or None if the token is invalid."""
     try:
         payload = jwt.decode(
             token,
@@ -69,6 +352,7 @@ def verify_token(token: str) -> Optional[TokenData]:
             user_id=payload.get("sub"),
             email=payload.get("email", ""),
             exp=datetime.fromtimestamp(payload.get("exp")),
-        )
+            jti=payload.get("jti"),
+        ), float(payload.get("exp"))
     except JWTError:
         return None
@@ -5,9 +5,12 @@ Handles Google OAuth 2.0 flow for Gmail access.
 """
 
 from typing import Optional
+
+import httpx
 from pydantic import BaseModel
 
 from app.config import settings
+from core.network import http_pool
 
 
 class GoogleTokens(BaseModel):
@@ -56,20 +59,48 @@ def get_google_auth_url(state: str = "") -> str:
     return f"{GOOGLE_AUTH_URL}?{query}"
 
 
-async def exchange_code_for_tokens(code: str) -> GoogleTokens:
+async def exchange_code_for_tokens(
+    code: str,
+    http_client: Optional[httpx.AsyncClient] = None,
+) -> GoogleTokens:
     """Exchange authorization code for tokens."""
-    # TODO: Implement actual token exchange
-    # Use httpx to POST to GOOGLE_TOKEN_URL
-    raise NotImplementedError("Implement Google token exchange")
+    client = http_client or http_pool.client
+    response = await client.post(GOOGLE_TOKEN_URL, data={
+        "code": code,
+        "client_id": settings.GOOGLE_CLIENT_ID,
+        "client_secret": settings.GOOGLE_CLIENT_SECRET,
+        "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+        "grant_type": "authorization_code",
+    })
+    response.raise_for_status()
+    return GoogleTokens.model_validate(response.json())
 
 
-async def get_user_info(access_token: str) -> GoogleUserInfo:
+async def get_user_info(
+    access_token: str,
+    http_client: Optional[httpx.AsyncClient] = None,
+) -> GoogleUserInfo:
     """Get user info from Google."""
-    # TODO: Implement actual user info fetch
-    raise NotImplementedError("Implement Google user info fetch")
-
-
-async def refresh_access_token(refresh_token: str) -> GoogleTokens:
+    client = http_client or http_pool.client
+    response = await client.get(
+        GOOGLE_USERINFO_URL,
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    response.raise_for_status()
+    return GoogleUserInfo.model_validate(response.json())
+
+
+async def refresh_access_token(
+    refresh_token: str,
+    http_client: Optional[httpx.AsyncClient] = None,
+) -> GoogleTokens:
     """Refresh an expired access token."""
-    # TODO: Implement token refresh
-    raise NotImplementedError("Implement Google token refresh")
+    client = http_client or http_pool.client
+    response = await client.post(GOOGLE_TOKEN_URL, data={
+        "refresh_token": refresh_token,
+        "client_id": settings.GOOGLE_CLIENT_ID,
+        "client_secret": settings.GOOGLE_CLIENT_SECRET,
+        "grant_type": "refresh_token",
+    })
+    response.raise_for_status()
+    return GoogleTokens.model_validate(response.json())
@@ -5,9 +5,12 @@ Handles Microsoft OAuth 2.0 flow for Outlook access.
 """
 
 from typing import Optional
+
+import httpx
 from pydantic import BaseModel
 
 from app.config import settings
+from core.network import http_pool
 
 
 class MicrosoftTokens(BaseModel):
@@ -28,6 +31,7 @@ class MicrosoftUserInfo(BaseModel):
 # OAuth configuration
 MICROSOFT_AUTH_URL = "https://login.microsoftonline.com/common/oauth2/v2.0/authorize"
 MICROSOFT_TOKEN_URL = "https://login.microsoftonline.com/common/oauth2/v2.0/token"
+MICROSOFT_GRAPH_ME_URL = "https://graph.microsoft.com/v1.0/me"
 
 # Scopes needed for Outlook access
 MICROSOFT_SCOPES = [
@@ -53,19 +57,55 @@ def get_microsoft_auth_url(state: str = "") -> str:
     return f"{MICROSOFT_AUTH_URL}?{query}"
 
 
-async def exchange_code_for_tokens(code: str) -> MicrosoftTokens:
+async def exchange_code_for_tokens(
+    code: str,
+    http_client: Optional[httpx.AsyncClient] = None,
+) -> MicrosoftTokens:
     """Exchange authorization code for tokens."""
-    # TODO: Implement actual token exchange using MSAL
-    raise NotImplementedError("Implement Microsoft token exchange")
+    client = http_client or http_pool.client
+    response = await client.post(MICROSOFT_TOKEN_URL, data={
+        "code": code,
+        "client_id": settings.MICROSOFT_CLIENT_ID,
+        "client_secret": settings.MICROSOFT_CLIENT_SECRET,
+        "redirect_uri": settings.MICROSOFT_REDIRECT_URI,
+        "scope": " ".join(MICROSOFT_SCOPES),
+        "grant_type": "authorization_code",
+    })
+    response.raise_for_status()
+    return MicrosoftTokens.model_validate(response.json())
 
 
-async def get_user_info(access_token: str) -> MicrosoftUserInfo:
+async def get_user_info(
+    access_token: str,
+    http_client: Optional[httpx.AsyncClient] = None,
+) -> MicrosoftUserInfo:
     """Get user info from Microsoft Graph."""
-    # TODO: Implement actual user info fetch
-    raise NotImplementedError("Implement Microsoft user info fetch")
-
-
-async def refresh_access_token(refresh_token: str) -> MicrosoftTokens:
+    client = http_client or http_pool.client
+    response = await client.get(
+        MICROSOFT_GRAPH_ME_URL,
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    response.raise_for_status()
+    me = response.json()
+    return MicrosoftUserInfo(
+        id=me["id"],
+        email=me.get("mail") or me.get("userPrincipalName", ""),
+        display_name=me.get("displayName") or "",
+    )
+
+
+async def refresh_access_token(
+    refresh_token: str,
+    http_client: Optional[httpx.AsyncClient] = None,
+) -> MicrosoftTokens:
     """Refresh an expired access token."""
-    # TODO: Implement token refresh
-    raise NotImplementedError("Implement Microsoft token refresh")
+    client = http_client or http_pool.client
+    response = await client.post(MICROSOFT_TOKEN_URL, data={
+        "refresh_token": refresh_token,
+        "client_id": settings.MICROSOFT_CLIENT_ID,
+        "client_secret": settings.MICROSOFT_CLIENT_SECRET,
+        "scope": " ".join(MICROSOFT_SCOPES),
+        "grant_type": "refresh_token",
+    })
+    response.raise_for_status()
+    return MicrosoftTokens.model_validate(response.json())
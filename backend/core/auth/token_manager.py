@@ -0,0 +1,236 @@
+"""
+Token Manager
+-------------
+Valid provider access tokens for connected accounts.
+
+- In-memory cache of each account's current token
+- Single-flight refresh: concurrent callers share one refresh per account
+- Proactive renewal: tokens close to token_expires_at are refreshed in
+  the background (on access, and by a periodic sweep) so callers keep
+  getting the still-valid token instead of waiting on a refresh
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from core.storage.database import async_session
+from models.connected_account import ConnectedAccount
+from . import oauth_google, oauth_microsoft
+
+
+class CachedToken:
+    """An account's current credentials."""
+    
+    def __init__(
+        self,
+        provider: str,
+        access_token: str,
+        refresh_token: Optional[str],
+        expires_at: Optional[datetime],
+    ):
+        self.provider = provider
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.expires_at = expires_at
+
+
+def _default_refreshers() -> Dict[str, Callable[[str], Awaitable]]:
+    # Looked up at call time so tests can patch the OAuth modules
+    return {
+        "gmail": lambda token: oauth_google.refresh_access_token(token),
+        "outlook": lambda token: oauth_microsoft.refresh_access_token(token),
+    }
+
+
+class TokenManager:
+    """Caches, refreshes and proactively renews connected-account tokens."""
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_session,
+        refresh_margin_seconds: int = 300,
+        refreshers: Optional[Dict[str, Callable[[str], Awaitable]]] = None,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ):
+        self._session_factory = session_factory
+        self.refresh_margin = timedelta(seconds=refresh_margin_seconds)
+        self._refreshers = refreshers or _default_refreshers()
+        self._clock = clock
+        self._tokens: Dict[str, CachedToken] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._renewal_task: Optional[asyncio.Task] = None
+        
+        # Counters
+        self.hits = 0
+        self.loads = 0
+        self.refreshes = 0
+        self.coalesced = 0
+        self.background_refreshes = 0
+        self.refresh_errors = 0
+    
+    async def get_access_token(self, account_id: str) -> str:
+        """
+        Return a valid access token for the account.
+        
+        Only waits on a refresh when the cached token has already expired.
+        
+        Raises:
+            LookupError: if the account does not exist
+        """
+        token = self._tokens.get(account_id)
+        if token is None:
+            token = await self._load(account_id)
+        
+        now = self._clock()
+        if token.expires_at is None or token.expires_at - now > self.refresh_margin:
+            self.hits += 1
+            return token.access_token
+        
+        if token.expires_at > now:
+            # Still valid: renew in the background, answer immediately
+            self.hits += 1
+            self._start_refresh(account_id, background=True)
+            return token.access_token
+        
+        return await self.refresh(account_id)
+    
+    async def refresh(self, account_id: str) -> str:
+        """Refresh now (e.g. after a 401), sharing any refresh already in flight."""
+        task = self._start_refresh(account_id, background=False)
+        # Shielded so a cancelled caller does not cancel the shared refresh
+        token = await asyncio.shield(task)
+        return token.access_token
+    
+    def invalidate(self, account_id: str) -> None:
+        """Forget the cached token (e.g. account disconnected)."""
+        self._tokens.pop(account_id, None)
+    
+    async def renew_expiring(self) -> int:
+        """Start background refreshes for cached tokens inside the margin."""
+        deadline = self._clock() + self.refresh_margin
+        started = 0
+        for account_id, token in list(self._tokens.items()):
+            expiring = token.expires_at is not None and token.expires_at <= deadline
+            if expiring and account_id not in self._refreshing:
+                self._start_refresh(account_id, background=True)
+                started += 1
+        return started
+    
+    def start(self, interval_seconds: float = 60.0) -> None:
+        """Run renew_expiring periodically (called from the app lifespan)."""
+        if self._renewal_task is None:
+            self._renewal_task = asyncio.create_task(self._renewal_loop(interval_seconds))
+    
+    async def stop(self) -> None:
+        """Cancel the renewal sweep and any refreshes in flight."""
+        tasks = [t for t in [self._renewal_task, *self._refreshing.values()] if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._renewal_task = None
+        self._refreshing.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring."""
+        return {
+            "cached_tokens": len(self._tokens),
+            "refreshes_in_flight": len(self._refreshing),
+            "hits": self.hits,
+            "loads": self.loads,
+            "refreshes": self.refreshes,
+            "coalesced": self.coalesced,
+            "background_refreshes": self.background_refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
+    
+    def _start_refresh(self, account_id: str, background: bool) -> asyncio.Task:
+        task = self._refreshing.get(account_id)
+        if task is not None:
+            self.coalesced += 1
+            return task
+        
+        if background:
+            self.background_refreshes += 1
+        task = asyncio.create_task(self._do_refresh(account_id))
+        self._refreshing[account_id] = task
+        task.add_done_callback(lambda t: self._finish_refresh(account_id, t))
+        return task
+    
+    def _finish_refresh(self, account_id: str, task: asyncio.Task) -> None:
+        if self._refreshing.get(account_id) is task:
+            del self._refreshing[account_id]
+        # Retrieve the exception so unawaited background failures are not reported
+        if not task.cancelled() and task.exception() is not None:
+            self.refresh_errors += 1
+    
+    async def _do_refresh(self, account_id: str) -> CachedToken:
+        token = self._tokens.get(account_id) or await self._load(account_id)
+        if not token.refresh_token:
+            raise PermissionError(f"Account {account_id} has no refresh token; reconnect required")
+        
+        refresher = self._refreshers[token.provider]
+        issued_at = self._clock()
+        tokens = await refresher(token.refresh_token)
+        self.refreshes += 1
+        
+        refreshed = CachedToken(
+            provider=token.provider,
+            access_token=tokens.access_token,
+            # Providers may rotate the refresh token
+            refresh_token=tokens.refresh_token or token.refresh_token,
+            expires_at=issued_at + timedelta(seconds=tokens.expires_in),
+        )
+        await self._save(account_id, refreshed)
+        self._tokens[account_id] = refreshed
+        return refreshed
+    
+    async def _renewal_loop(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await self.renew_expiring()
+    
+    async def _load(self, account_id: str) -> CachedToken:
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(
+                    ConnectedAccount.provider,
+                    ConnectedAccount.access_token,
+                    ConnectedAccount.refresh_token,
+                    ConnectedAccount.token_expires_at,
+                ).where(ConnectedAccount.id == account_id)
+            )
+            row = result.first()
+        if row is None:
+            raise LookupError(f"Unknown connected account: {account_id}")
+        
+        self.loads += 1
+        token = CachedToken(
+            provider=getattr(row.provider, "value", row.provider),
+            access_token=row.access_token,
+            refresh_token=row.refresh_token,
+            expires_at=row.token_expires_at,
+        )
+        self._tokens[account_id] = token
+        return token
+    
+    async def _save(self, account_id: str, token: CachedToken) -> None:
+        async with self._session_factory() as session:
+            await session.execute(
+                update(ConnectedAccount)
+                .where(ConnectedAccount.id == account_id)
+                .values(
+                    access_token=token.access_token,
+                    refresh_token=token.refresh_token,
+                    token_expires_at=token.expires_at,
+                )
+            )
+            await session.commit()
+
+
+# Singleton instance
+token_manager = TokenManager(refresh_margin_seconds=settings.TOKEN_REFRESH_MARGIN_SECONDS)
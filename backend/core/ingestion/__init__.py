@@ -1,14 +1,29 @@
 # Ingestion Module
-from .email_fetcher import fetch_threads, normalize_email_thread
+from .email_fetcher import (
+    fetch_threads,
+    normalize_email_thread,
+    parse_gmail_thread,
+    parse_outlook_conversation,
+)
 from .attachment_extractor import extract_attachments, is_supported_attachment
 from .gmail_client import GmailClient
 from .outlook_client import OutlookClient
+from .incremental_sync import GmailHistorySync, OutlookDeltaSync, SyncCursorStore
+from .quota import QuotaScheduler, gmail_quota, graph_quota
 
 __all__ = [
     "fetch_threads",
     "normalize_email_thread",
+    "parse_gmail_thread",
+    "parse_outlook_conversation",
     "extract_attachments",
     "is_supported_attachment",
     "GmailClient",
     "OutlookClient",
+    "GmailHistorySync",
+    "OutlookDeltaSync",
+    "SyncCursorStore",
+    "QuotaScheduler",
+    "gmail_quota",
+    "graph_quota",
 ]
@@ -2,26 +2,34 @@
 Attachment Extractor
 --------------------
 Extracts and stores attachments from emails.
+
+Content is streamed to FileStorage in chunks and stored once per SHA-256:
+the same PDF forwarded in 30 threads is one blob with 30 references, and
+every AttachmentRef.storage_path points at that shared blob.
 """
 
 import os
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
 from datetime import datetime
 
-from app.config import settings
 from contracts import AttachmentRef
+from core.storage.file_storage import CHUNK_SIZE, FileStorage, file_storage
 
 
 async def extract_attachments(
     thread_id: str,
     raw_attachments: List[dict],
+    storage: FileStorage = file_storage,
 ) -> List[AttachmentRef]:
     """
     Extract attachments from email data and store them.
     
     Args:
         thread_id: Parent thread ID
-        raw_attachments: Raw attachment data from email API
+        raw_attachments: Raw attachment data from email API, with the
+            content as ``chunks`` (an async or plain iterable of bytes,
+            e.g. a download stream) or ``data`` bytes
+        storage: Content-addressed file storage
         
     Returns:
         List of AttachmentRef with storage paths
@@ -38,20 +46,19 @@ async def extract_attachments(
             att.get("content_type", "application/octet-stream"),
         )
         
-        # Store file
-        storage_path = await _store_attachment(
-            attachment_id,
-            smart_filename,
-            att.get("data", b""),
-        )
+        # Store file (deduplicated by content)
+        chunks = att.get("chunks")
+        if chunks is None:
+            chunks = _chunked(att.get("data", b""))
+        blob = await storage.save_stream(attachment_id, chunks)
         
         results.append(AttachmentRef(
             attachment_id=attachment_id,
             filename=smart_filename,
             original_filename=original_filename,
             mime_type=att.get("content_type", "application/octet-stream"),
-            storage_path=storage_path,
-            size_bytes=len(att.get("data", b"")),
+            storage_path=blob.path,
+            size_bytes=blob.size_bytes,
         ))
     
     return results
@@ -70,21 +77,11 @@ def _generate_smart_filename(original: str, mime_type: str) -> str:
     return f"{name}_{date_prefix}{ext}"
 
 
-async def _store_attachment(
-    attachment_id: str,
-    filename: str,
-    data: bytes,
-) -> str:
-    """Store attachment to configured storage."""
-    storage_dir = settings.STORAGE_PATH
-    os.makedirs(storage_dir, exist_ok=True)
-    
-    file_path = os.path.join(storage_dir, f"{attachment_id}_{filename}")
-    
-    with open(file_path, "wb") as f:
-        f.write(data)
-    
-    return file_path
+def _chunked(data: bytes) -> Iterator[bytes]:
+    """Already-downloaded content, fed to storage in CHUNK_SIZE pieces."""
+    view = memoryview(data)
+    for start in range(0, len(view), CHUNK_SIZE):
+        yield view[start:start + CHUNK_SIZE]
 
 
 SUPPORTED_MIME_TYPES = [
@@ -7,54 +7,283 @@ This is the main entry point for the Ingestion layer.
 Output: EmailThreadV1 (Boundary Contract)
 """
 
-from typing import List
-from datetime import datetime
+import asyncio
+import base64
+from email.utils import getaddresses
+from typing import AsyncIterator, Dict, List, Optional, Set
+from datetime import datetime, timezone
 
+import httpx
+
+from app.config import settings
 from contracts import EmailThreadV1, EmailMessage, AttachmentRef
+from .gmail_client import GmailClient
+
+
+# Thread ids requested per Gmail list call (API maximum is 500)
+GMAIL_PAGE_SIZE = 100
 
 
 async def fetch_threads(
     user_id: str,
     provider: str,
     access_token: str,
-    max_results: int = 50,
-) -> List[EmailThreadV1]:
+    max_results: Optional[int] = 50,
+    concurrency: Optional[int] = None,
+    http_client: Optional[httpx.AsyncClient] = None,
+    batch_size: Optional[int] = None,
+) -> AsyncIterator[EmailThreadV1]:
     """
-    Fetch email threads from provider.
+    Stream email threads from provider.
+    
+    Threads are yielded as soon as they are hydrated (not in mailbox
+    order), so downstream analysis can start before the listing finishes.
     
     Args:
         user_id: Internal user ID
         provider: 'gmail' or 'outlook'
         access_token: OAuth access token
-        max_results: Maximum threads to fetch
+        max_results: Maximum threads to fetch (None for the whole mailbox)
+        concurrency: Thread fetches in flight (default: settings.INGESTION_FETCH_CONCURRENCY)
+        http_client: HTTP client (default: the shared app pool)
+        batch_size: Gmail threads per batch request (default: settings.INGESTION_GMAIL_BATCH_SIZE)
         
-    Returns:
-        List of EmailThreadV1 contracts
+    Yields:
+        EmailThreadV1 contracts
     """
+    concurrency = concurrency or settings.INGESTION_FETCH_CONCURRENCY
+    batch_size = batch_size or settings.INGESTION_GMAIL_BATCH_SIZE
+    
     if provider == "gmail":
-        return await _fetch_gmail_threads(access_token, max_results)
+        async with GmailClient(access_token, http_client=http_client) as client:
+            async for thread in _stream_gmail_threads(client, max_results, concurrency, batch_size):
+                yield thread
     elif provider == "outlook":
-        return await _fetch_outlook_threads(access_token, max_results)
+        async for thread in _fetch_outlook_threads(access_token, max_results):
+            yield thread
     else:
         raise ValueError(f"Unknown provider: {provider}")
 
 
-async def _fetch_gmail_threads(access_token: str, max_results: int) -> List[EmailThreadV1]:
-    """Fetch threads from Gmail API."""
-    # TODO: Implement Gmail API integration
-    # 1. Use googleapiclient to list threads
-    # 2. For each thread, get full thread data
-    # 3. Convert to EmailThreadV1 contract
-    raise NotImplementedError("Implement Gmail thread fetching")
+async def _stream_gmail_threads(
+    client: GmailClient,
+    max_results: Optional[int],
+    concurrency: int,
+    batch_size: int = 1,
+) -> AsyncIterator[EmailThreadV1]:
+    """
+    Follow Gmail list pages and hydrate listed threads concurrently.
+    
+    Listed threads are fetched in chunks of ``batch_size`` (one multipart
+    batch request per chunk; 1 means a plain GET per thread), with at most
+    ``concurrency`` requests in flight. The next page is listed while the
+    current one hydrates, but only once fewer than ``concurrency`` requests
+    are queued, so memory stays bounded by one page regardless of mailbox
+    size.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    remaining = max_results
+    
+    async def hydrate(thread_ids: List[str]) -> List[EmailThreadV1]:
+        async with semaphore:
+            threads = await hydrate_gmail_threads(client, thread_ids, batch_size)
+        # Threads deleted between listing and fetching are skipped
+        return [thread for thread in threads.values() if thread is not None]
+    
+    def list_page(page_token: Optional[str]) -> asyncio.Task:
+        page_size = GMAIL_PAGE_SIZE if remaining is None else min(GMAIL_PAGE_SIZE, remaining)
+        return asyncio.create_task(client.list_threads(page_size, page_token))
+    
+    listing: Optional[asyncio.Task] = list_page(None)
+    next_page_token: Optional[str] = None
+    pending: Set[asyncio.Task] = set()
+    
+    try:
+        while listing is not None or pending:
+            waiting = pending | {listing} if listing is not None else pending
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            
+            if listing in done:
+                page = listing.result()
+                listing = None
+                thread_ids = [ref["id"] for ref in page.get("threads", [])]
+                if remaining is not None:
+                    thread_ids = thread_ids[:remaining]
+                    remaining -= len(thread_ids)
+                pending.update(
+                    asyncio.create_task(hydrate(thread_ids[start:start + batch_size]))
+                    for start in range(0, len(thread_ids), batch_size)
+                )
+                next_page_token = page.get("nextPageToken") if remaining != 0 else None
+            
+            for task in done:
+                if task in pending:
+                    pending.discard(task)
+                    for thread in task.result():
+                        yield thread
+            
+            if listing is None and next_page_token and len(pending) < concurrency:
+                listing = list_page(next_page_token)
+                next_page_token = None
+    finally:
+        for task in pending | ({listing} if listing is not None else set()):
+            task.cancel()
 
 
-async def _fetch_outlook_threads(access_token: str, max_results: int) -> List[EmailThreadV1]:
+async def hydrate_gmail_threads(
+    client: GmailClient,
+    thread_ids: List[str],
+    batch_size: int = 1,
+) -> Dict[str, Optional[EmailThreadV1]]:
+    """
+    Fetch and normalize Gmail threads, batched when ``batch_size`` > 1.
+    
+    Returns:
+        thread id -> EmailThreadV1, or None if the thread no longer exists
+    """
+    if batch_size > 1:
+        raw_threads = await client.get_threads(thread_ids)
+        return {
+            thread_id: parse_gmail_thread(raw) if raw is not None else None
+            for thread_id, raw in raw_threads.items()
+        }
+    return {thread_id: await hydrate_gmail_thread(client, thread_id) for thread_id in thread_ids}
+
+
+async def hydrate_gmail_thread(client: GmailClient, thread_id: str) -> Optional[EmailThreadV1]:
+    """Fetch and normalize one Gmail thread; None if it no longer exists."""
+    try:
+        raw = await client.get_thread(thread_id)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            return None
+        raise
+    return parse_gmail_thread(raw)
+
+
+async def _fetch_outlook_threads(
+    access_token: str,
+    max_results: Optional[int],
+) -> AsyncIterator[EmailThreadV1]:
     """Fetch threads from Outlook/Microsoft Graph API."""
     # TODO: Implement Outlook API integration
     # 1. Use Microsoft Graph API to list conversations
     # 2. For each conversation, get messages
     # 3. Convert to EmailThreadV1 contract
     raise NotImplementedError("Implement Outlook thread fetching")
+    yield  # unreachable; makes this an async generator
+
+
+def parse_gmail_thread(raw: dict) -> EmailThreadV1:
+    """Convert a Gmail API thread resource (format=full) to EmailThreadV1."""
+    raw_messages = raw.get("messages", [])
+    messages = [_parse_gmail_message(m) for m in raw_messages]
+    attachments = [
+        {**att, "message_id": m["id"]}
+        for m in raw_messages
+        for att in _gmail_attachments(m.get("payload", {}))
+    ]
+    subject = messages[0]["subject"] if messages else ""
+    
+    return normalize_email_thread(raw["id"], subject, messages, attachments, "gmail")
+
+
+def _parse_gmail_message(message: dict) -> dict:
+    payload = message.get("payload", {})
+    headers = {h["name"].lower(): h["value"] for h in payload.get("headers", [])}
+    
+    sent_at = (
+        datetime.utcfromtimestamp(int(message["internalDate"]) / 1000)
+        if message.get("internalDate")
+        else datetime.utcnow()
+    )
+    senders = _addresses(headers.get("from", ""))
+    
+    return {
+        "id": message["id"],
+        "from": senders[0] if senders else "",
+        "to": _addresses(headers.get("to", "")),
+        "cc": _addresses(headers.get("cc", "")),
+        "subject": headers.get("subject", ""),
+        "body_text": _gmail_body_text(payload),
+        "sent_at": sent_at,
+        "is_from_user": "SENT" in message.get("labelIds", []),
+    }
+
+
+def parse_outlook_conversation(
+    conversation_id: str,
+    messages: List[dict],
+    user_email: Optional[str] = None,
+) -> EmailThreadV1:
+    """
+    Convert Graph message resources of one conversation to EmailThreadV1.
+    
+    Args:
+        conversation_id: Graph conversationId (becomes external_id)
+        messages: Graph message resources, in any order
+        user_email: Connected mailbox address, to mark the user's own messages
+    """
+    parsed = sorted((_parse_outlook_message(m, user_email) for m in messages), key=lambda m: m["sent_at"])
+    subject = parsed[0]["subject"] if parsed else ""
+    
+    return normalize_email_thread(conversation_id, subject, parsed, [], "outlook")
+
+
+def _parse_outlook_message(message: dict, user_email: Optional[str]) -> dict:
+    sender = _graph_address(message.get("from"))
+    timestamp = message.get("sentDateTime") or message.get("receivedDateTime")
+    sent_at = (
+        datetime.fromisoformat(timestamp).astimezone(timezone.utc).replace(tzinfo=None)
+        if timestamp
+        else datetime.utcnow()
+    )
+    
+    return {
+        "id": message["id"],
+        "from": sender,
+        "to": [_graph_address(r) for r in message.get("toRecipients", [])],
+        "cc": [_graph_address(r) for r in message.get("ccRecipients", [])],
+        "subject": message.get("subject") or "",
+        "body_text": (message.get("body") or {}).get("content", ""),
+        "sent_at": sent_at,
+        "is_from_user": bool(user_email) and sender == user_email.lower(),
+    }
+
+
+def _graph_address(recipient: Optional[dict]) -> str:
+    return ((recipient or {}).get("emailAddress") or {}).get("address", "").lower()
+
+
+def _addresses(header: str) -> List[str]:
+    return [addr.lower() for _, addr in getaddresses([header]) if addr]
+
+
+def _gmail_body_text(payload: dict) -> str:
+    """First text/plain part of a (possibly multipart) payload."""
+    if payload.get("mimeType") == "text/plain" and payload.get("body", {}).get("data"):
+        data = payload["body"]["data"]
+        return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4)).decode("utf-8", "replace")
+    for part in payload.get("parts", []):
+        text = _gmail_body_text(part)
+        if text:
+            return text
+    return ""
+
+
+def _gmail_attachments(payload: dict) -> List[dict]:
+    attachments = []
+    body = payload.get("body", {})
+    if payload.get("filename") and body.get("attachmentId"):
+        attachments.append({
+            "id": body["attachmentId"],
+            "filename": payload["filename"],
+            "mime_type": payload.get("mimeType", "application/octet-stream"),
+            "size_bytes": body.get("size", 0),
+        })
+    for part in payload.get("parts", []):
+        attachments.extend(_gmail_attachments(part))
+    return attachments
 
 
 def normalize_email_thread(
@@ -93,6 +322,7 @@ def normalize_email_thread(
             mime_type=a.get("mime_type", "application/octet-stream"),
             storage_path=a.get("storage_path", ""),
             size_bytes=a.get("size_bytes", 0),
+            message_id=f"msg-{a['message_id']}" if a.get("message_id") else None,
         )
         for a in attachments
     ]
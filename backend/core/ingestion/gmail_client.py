@@ -2,47 +2,216 @@
 Gmail API Client
 ----------------
 Low-level client for Gmail API operations.
+
+Talks to the Gmail REST API with httpx so calls never block the event loop.
+Bulk reads go through Gmail's multipart batch endpoint (up to 100 calls
+per HTTP round trip).
 """
 
-from typing import List, Optional
+import asyncio
+import json
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
+from urllib.parse import urlsplit
+
+import httpx
+
+from core.network import http_pool
+from .quota import GMAIL_QUOTA_COSTS, QuotaScheduler, gmail_quota
+
+
+GMAIL_API_URL = "https://gmail.googleapis.com/gmail/v1/users/me"
+GMAIL_BATCH_URL = "https://gmail.googleapis.com/batch/gmail/v1"
+
+# Gmail rejects batches with more than 100 calls
+GMAIL_BATCH_LIMIT = 100
+
+# Sub-request statuses worth retrying (rate limited / transient)
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class GmailBatchError(Exception):
+    """Sub-requests of a batch that still failed after retries."""
+    
+    def __init__(self, failures: Dict[str, int]):
+        self.failures = failures
+        super().__init__(f"{len(failures)} Gmail batch sub-requests failed: {failures}")
 
 
 class GmailClient:
     """Gmail API client wrapper."""
     
-    def __init__(self, access_token: str):
+    def __init__(
+        self,
+        access_token: str,
+        http_client: Optional[httpx.AsyncClient] = None,
+        base_url: str = GMAIL_API_URL,
+        batch_url: str = GMAIL_BATCH_URL,
+        max_batch_retries: int = 3,
+        retry_backoff: float = 0.5,
+        account_id: Optional[str] = None,
+        scheduler: Optional[QuotaScheduler] = None,
+    ):
         self.access_token = access_token
-        self._service = None
+        # Calls are paced against the account's quota when an account id is given
+        self.account_id = account_id
+        self._scheduler = scheduler or gmail_quota
+        self._base_url = base_url.rstrip("/")
+        self._batch_url = batch_url
+        self.max_batch_retries = max_batch_retries
+        self.retry_backoff = retry_backoff
+        # Defaults to the shared app pool; never closed here
+        self._client = http_client
+        
+        # Counters
+        self.batch_requests = 0
+        self.batch_sub_requests = 0
+        self.batch_retries = 0
     
     async def initialize(self):
-        """Initialize the Gmail API service."""
-        # TODO: Implement
-        # from googleapiclient.discovery import build
-        # from google.oauth2.credentials import Credentials
-        # creds = Credentials(token=self.access_token)
-        # self._service = build('gmail', 'v1', credentials=creds)
-        pass
+        """Attach to the shared HTTP client pool (if no client was passed in)."""
+        if self._client is None:
+            self._client = http_pool.client
+    
+    async def close(self):
+        """Detach from the HTTP client (connections stay pooled)."""
+        self._client = None
+    
+    async def __aenter__(self) -> "GmailClient":
+        await self.initialize()
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.close()
     
     async def list_threads(
         self,
         max_results: int = 50,
         page_token: Optional[str] = None,
     ) -> dict:
-        """List email threads."""
-        # TODO: Implement
-        # results = self._service.users().threads().list(
-        #     userId='me',
-        #     maxResults=max_results,
-        #     pageToken=page_token,
-        # ).execute()
-        # return results
-        raise NotImplementedError("Implement Gmail thread listing")
+        """
+        List one page of thread ids.
+        
+        Returns:
+            {"threads": [{"id", "historyId", ...}], "nextPageToken"?: str}
+        """
+        params = {"maxResults": max_results}
+        if page_token:
+            params["pageToken"] = page_token
+        return await self._get("/threads", params=params, operation="list")
     
     async def get_thread(self, thread_id: str) -> dict:
         """Get a single thread with all messages."""
-        # TODO: Implement
-        raise NotImplementedError("Implement Gmail thread fetch")
+        return await self._get(f"/threads/{thread_id}", params={"format": "full"})
+    
+    async def get_profile(self) -> dict:
+        """Mailbox profile, including the current ``historyId``."""
+        return await self._get("/profile", operation="profile")
+    
+    async def list_history(
+        self,
+        start_history_id: str,
+        page_token: Optional[str] = None,
+        max_results: int = 500,
+    ) -> dict:
+        """
+        List one page of mailbox changes since ``start_history_id``.
+        
+        Raises httpx.HTTPStatusError (404) once the start id is too old.
+        
+        Returns:
+            {"history": [...], "historyId": str, "nextPageToken"?: str}
+        """
+        params = {"startHistoryId": start_history_id, "maxResults": max_results}
+        if page_token:
+            params["pageToken"] = page_token
+        return await self._get("/history", params=params, operation="history")
+    
+    async def get_threads(self, thread_ids: Iterable[str]) -> Dict[str, Optional[dict]]:
+        """
+        Get many threads through batch requests.
+        
+        Returns:
+            thread id -> thread resource, or None if the thread no longer exists
+        """
+        thread_ids = list(dict.fromkeys(thread_ids))
+        results = await self.batch_get(
+            [f"/threads/{thread_id}?format=full" for thread_id in thread_ids]
+        )
+        return dict(zip(thread_ids, results))
+    
+    async def get_attachment_metadata(
+        self,
+        refs: Iterable[Tuple[str, str]],
+    ) -> Dict[Tuple[str, str], Optional[dict]]:
+        """
+        Get many attachments (``{"size", "data"}``) through batch requests.
+        
+        Args:
+            refs: (message id, attachment id) pairs
+        """
+        refs = list(dict.fromkeys(refs))
+        results = await self.batch_get(
+            [f"/messages/{message_id}/attachments/{attachment_id}" for message_id, attachment_id in refs],
+            operation="attachment",
+        )
+        return dict(zip(refs, results))
+    
+    async def batch_get(self, paths: List[str], operation: str = "get") -> List[Optional[dict]]:
+        """
+        GET many resources (paths relative to the user) in batch requests.
+        
+        Sub-requests that come back rate limited or with a transient error are
+        retried on their own, with exponential backoff; 404s map to None.
+        Each sub-request costs the quota of ``operation``.
+        
+        Returns:
+            One result per path, in order
+            
+        Raises:
+            GmailBatchError: if sub-requests still fail after the retries
+        """
+        results: List[Optional[dict]] = [None] * len(paths)
+        pending = list(range(len(paths)))
+        failures: Dict[str, int] = {}
+        
+        for attempt in range(self.max_batch_retries + 1):
+            if attempt:
+                self.batch_retries += len(pending)
+                await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            
+            retry = []
+            failures = {}
+            for start in range(0, len(pending), GMAIL_BATCH_LIMIT):
+                chunk = pending[start:start + GMAIL_BATCH_LIMIT]
+                responses = await self._paced(
+                    operation,
+                    lambda chunk=chunk: self._send_batch([paths[i] for i in chunk]),
+                    count=len(chunk),
+                )
+                for i, (status, body) in zip(chunk, responses):
+                    if status == 200:
+                        results[i] = body
+                    elif status == 404:
+                        results[i] = None
+                    elif status in RETRYABLE_STATUSES:
+                        retry.append(i)
+                        failures[paths[i]] = status
+                    else:
+                        failures[paths[i]] = status
+            
+            if len(failures) > len(retry):
+                break
+            if self.account_id is not None and 429 in failures.values():
+                self._scheduler.report_throttled(self.account_id)
+            pending = retry
+            if not pending:
+                return results
+        
+        raise GmailBatchError(failures)
     
     async def get_attachment(
         self,
@@ -63,3 +232,86 @@ class GmailClient:
         """Create a draft email."""
         # TODO: Implement
         raise NotImplementedError("Implement Gmail draft creation")
+    
+    async def _get(self, path: str, params: Optional[dict] = None, operation: str = "get") -> dict:
+        """GET a Gmail API resource; raises httpx.HTTPStatusError on failure."""
+        await self.initialize()
+        
+        async def send() -> dict:
+            response = await self._client.get(
+                f"{self._base_url}{path}",
+                params=params,
+                headers={"Authorization": f"Bearer {self.access_token}"},
+            )
+            response.raise_for_status()
+            return response.json()
+        
+        return await self._paced(operation, send)
+    
+    async def _paced(self, operation: str, send, count: int = 1):
+        """Run ``send`` through the quota scheduler (if pacing this account)."""
+        if self.account_id is None:
+            return await send()
+        cost = GMAIL_QUOTA_COSTS[operation] * count
+        return await self._scheduler.run(self.account_id, send, cost)
+    
+    async def _send_batch(self, paths: List[str]) -> List[Tuple[int, Optional[dict]]]:
+        """Send one multipart batch; returns (status, json body) per path, in order."""
+        await self.initialize()
+        boundary = f"batch_{uuid.uuid4().hex}"
+        prefix = urlsplit(self._base_url).path
+        
+        parts = [
+            f"--{boundary}\r\n"
+            f"Content-Type: application/http\r\n"
+            f"Content-ID: <item-{i}>\r\n\r\n"
+            f"GET {prefix}{path}\r\n\r\n"
+            for i, path in enumerate(paths)
+        ]
+        body = "".join(parts) + f"--{boundary}--\r\n"
+        
+        self.batch_requests += 1
+        self.batch_sub_requests += len(paths)
+        response = await self._client.post(
+            self._batch_url,
+            content=body.encode(),
+            headers={
+                "Authorization": f"Bearer {self.access_token}",
+                "Content-Type": f"multipart/mixed; boundary={boundary}",
+            },
+        )
+        response.raise_for_status()
+        
+        # Parts missing from the response are treated as retryable
+        results: List[Tuple[int, Optional[dict]]] = [(503, None)] * len(paths)
+        for content_id, status, payload in parse_batch_response(
+            response.headers["content-type"], response.content
+        ):
+            index = int(content_id.rsplit("-", 1)[1])
+            if 0 <= index < len(paths):
+                results[index] = (status, payload)
+        return results
+
+
+def parse_batch_response(content_type: str, content: bytes) -> List[Tuple[str, int, Optional[dict]]]:
+    """
+    Split a multipart/mixed batch response.
+    
+    Returns:
+        (Content-ID without "<response-"/">", HTTP status, JSON body) per part
+    """
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + content
+    )
+    parts = []
+    for part in message.iter_parts():
+        content_id = (part.get("Content-ID") or "").strip("<>").removeprefix("response-")
+        embedded = part.get_payload(decode=True) or b""
+        head, _, body = embedded.replace(b"\r\n", b"\n").partition(b"\n\n")
+        status = int(head.split(b"\n", 1)[0].split()[1])
+        try:
+            payload = json.loads(body) if body.strip() else None
+        except ValueError:
+            payload = None
+        parts.append((content_id, status, payload))
+    return parts
@@ -0,0 +1,262 @@
+"""
+Incremental Sync
+----------------
+Fetches only what changed in a mailbox since the previous sync.
+
+Gmail: the history API, keyed by the mailbox historyId stored in
+ConnectedAccount.sync_cursor. When the stored id has expired (Gmail keeps
+roughly a week of history) the account falls back to a full resync.
+
+Outlook: Microsoft Graph delta queries, resumed from the deltaLink stored
+in ConnectedAccount.sync_cursor. The changed messages of each delta page
+are regrouped by conversationId into EmailThreadV1 deltas and yielded
+before the next page is fetched.
+
+Usage (OutlookDeltaSync works the same way):
+    cursors = SyncCursorStore()
+    sync = GmailHistorySync(client, await cursors.get(account_id))
+    async for thread in sync.changed_threads():
+        ...
+    await cursors.save(account_id, sync.cursor)
+
+Both report deletions the same way: ``deleted_thread_ids`` (provider
+thread ids) and ``removed_message_ids`` (provider message ids). While
+``partial`` is true the yielded threads hold only the changed messages and
+must be merged with the stored thread.
+
+On a full resync nothing reports what was deleted while the cursor was
+stale: the caller compares what it stored against what was listed.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from contracts import EmailThreadV1
+from core.storage.database import async_session
+from models.connected_account import ConnectedAccount
+from .email_fetcher import _stream_gmail_threads, hydrate_gmail_threads, parse_outlook_conversation
+from .gmail_client import GmailClient
+from .outlook_client import OutlookClient
+
+
+# History record keys that carry a changed message (and its threadId)
+GMAIL_HISTORY_CHANGE_KEYS = ("messagesAdded", "messagesDeleted", "labelsAdded", "labelsRemoved")
+
+
+class GmailHistorySync:
+    """
+    One sync run for a Gmail account.
+    
+    Iterate ``changed_threads()`` to receive every thread that changed since
+    ``cursor``; afterwards ``cursor`` holds the id to store for the next run,
+    ``deleted_thread_ids`` the external ids of threads that no longer exist,
+    and ``full_resync`` whether the whole mailbox had to be re-listed.
+    Threads are always yielded whole (``partial`` is False), so removed
+    messages show up as changed threads rather than in
+    ``removed_message_ids``: the thread writer deletes stored messages a
+    written thread no longer has.
+    """
+    
+    partial = False
+    
+    def __init__(
+        self,
+        client: GmailClient,
+        cursor: Optional[str],
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self.client = client
+        self.start_cursor = cursor
+        self.cursor = cursor
+        self.concurrency = concurrency or settings.INGESTION_FETCH_CONCURRENCY
+        self.batch_size = batch_size or settings.INGESTION_GMAIL_BATCH_SIZE
+        self.full_resync = False
+        self.deleted_thread_ids: List[str] = []
+        self.removed_message_ids: List[str] = []
+        
+        # Counters
+        self.history_pages = 0
+        self.threads_fetched = 0
+    
+    async def changed_threads(self) -> AsyncIterator[EmailThreadV1]:
+        """Yield threads changed since the cursor (all threads on full resync)."""
+        thread_ids: Optional[List[str]] = None
+        if self.start_cursor:
+            thread_ids = await self._changed_thread_ids()
+        
+        if thread_ids is None:
+            self.full_resync = True
+            stream = self._full_resync()
+        else:
+            stream = self._hydrate(thread_ids)
+        
+        async for thread in stream:
+            self.threads_fetched += 1
+            yield thread
+    
+    async def _changed_thread_ids(self) -> Optional[List[str]]:
+        """Distinct thread ids touched since the cursor; None if it expired."""
+        thread_ids = {}
+        page_token = None
+        
+        while True:
+            try:
+                page = await self.client.list_history(self.start_cursor, page_token)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 404:
+                    return None
+                raise
+            self.history_pages += 1
+            
+            for record in page.get("history", []):
+                for key in GMAIL_HISTORY_CHANGE_KEYS:
+                    for change in record.get(key, []):
+                        thread_ids.setdefault(change["message"]["threadId"], None)
+            
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                self.cursor = page.get("historyId", self.cursor)
+                return list(thread_ids)
+    
+    async def _hydrate(self, thread_ids: List[str]) -> AsyncIterator[EmailThreadV1]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def fetch(chunk: List[str]):
+            async with semaphore:
+                return await hydrate_gmail_threads(self.client, chunk, self.batch_size)
+        
+        tasks = [
+            asyncio.create_task(fetch(thread_ids[start:start + self.batch_size]))
+            for start in range(0, len(thread_ids), self.batch_size)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for thread_id, thread in (await next_done).items():
+                    if thread is None:
+                        self.deleted_thread_ids.append(thread_id)
+                    else:
+                        yield thread
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _full_resync(self) -> AsyncIterator[EmailThreadV1]:
+        # Take the cursor before listing so changes made during the
+        # listing are picked up by the next incremental run
+        profile = await self.client.get_profile()
+        self.cursor = profile["historyId"]
+        
+        async for thread in _stream_gmail_threads(self.client, None, self.concurrency, self.batch_size):
+            yield thread
+
+
+class OutlookDeltaSync:
+    """
+    One sync run for an Outlook account.
+    
+    Iterate ``changed_threads()`` to receive EmailThreadV1 deltas of the
+    conversations with added or changed messages, one per conversation and
+    delta page; each delta holds only those messages (``partial`` is
+    always true: a conversation may continue on a later page). Afterwards
+    ``cursor`` holds the deltaLink to store, ``removed_message_ids`` the
+    ids of deleted messages, and ``full_resync`` whether the delta query
+    had to start from scratch. ``deleted_thread_ids`` stays empty: a
+    conversation whose messages were all removed is dropped by the thread
+    writer once it has none left.
+    """
+    
+    partial = True
+    
+    def __init__(
+        self,
+        client: OutlookClient,
+        cursor: Optional[str],
+        user_email: Optional[str] = None,
+        page_size: int = 100,
+    ):
+        self.client = client
+        self.start_cursor = cursor
+        self.cursor = cursor
+        self.user_email = user_email
+        self.page_size = page_size
+        self.full_resync = False
+        self.deleted_thread_ids: List[str] = []
+        self.removed_message_ids: List[str] = []
+        
+        # Counters
+        self.delta_pages = 0
+        self.messages_changed = 0
+    
+    async def changed_threads(self) -> AsyncIterator[EmailThreadV1]:
+        """Yield per-conversation deltas since the cursor (everything on full resync), page by page."""
+        link = self.start_cursor
+        self.full_resync = link is None
+        
+        while True:
+            try:
+                page = await self.client.get_message_delta(link, page_size=self.page_size)
+            except httpx.HTTPStatusError as e:
+                # Expired delta token: restart the delta query from scratch
+                if e.response.status_code == 410 and not self.full_resync:
+                    self.full_resync = True
+                    link = None
+                    continue
+                raise
+            self.delta_pages += 1
+            
+            for conversation_id, messages in self._page_conversations(page).items():
+                yield parse_outlook_conversation(conversation_id, messages, self.user_email)
+            
+            link = page.get("@odata.nextLink")
+            if link is None:
+                self.cursor = page.get("@odata.deltaLink", self.cursor)
+                return
+    
+    def _page_conversations(self, page: dict) -> Dict[str, List[dict]]:
+        """The page's changed messages grouped by conversation; records its removed ones."""
+        # Keyed by message id so a message changed twice appears once (latest wins)
+        changed: Dict[str, dict] = {}
+        for message in page.get("value", []):
+            if "@removed" in message:
+                changed.pop(message["id"], None)
+                self.removed_message_ids.append(message["id"])
+            else:
+                changed[message["id"]] = message
+        
+        self.messages_changed += len(changed)
+        conversations: Dict[str, List[dict]] = {}
+        for message in changed.values():
+            conversations.setdefault(message.get("conversationId") or message["id"], []).append(message)
+        return conversations
+
+
+class SyncCursorStore:
+    """Per-account sync cursors persisted on ConnectedAccount."""
+    
+    def __init__(self, session_factory: Callable[[], AsyncSession] = async_session):
+        self._session_factory = session_factory
+    
+    async def get(self, account_id: str) -> Optional[str]:
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(ConnectedAccount.sync_cursor).where(ConnectedAccount.id == account_id)
+            )
+            return result.scalar_one_or_none()
+    
+    async def save(self, account_id: str, cursor: Optional[str]) -> None:
+        """Store the cursor and stamp last_sync_at."""
+        async with self._session_factory() as session:
+            await session.execute(
+                update(ConnectedAccount)
+                .where(ConnectedAccount.id == account_id)
+                .values(sync_cursor=cursor, last_sync_at=datetime.utcnow())
+            )
+            await session.commit()
+
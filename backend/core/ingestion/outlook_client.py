@@ -7,13 +7,55 @@ Low-level client for Microsoft Graph API (Outlook).
 from typing import List, Optional
 from datetime import datetime
 
+import httpx
+
+from core.network import http_pool
+from .quota import GRAPH_QUOTA_COSTS, QuotaScheduler, graph_quota
+
+
+GRAPH_API_URL = "https://graph.microsoft.com/v1.0"
+
+# Message fields needed to build EmailThreadV1
+GRAPH_MESSAGE_FIELDS = [
+    "id", "conversationId", "subject", "from", "toRecipients", "ccRecipients",
+    "body", "sentDateTime", "receivedDateTime",
+]
+
 
 class OutlookClient:
     """Microsoft Graph API client for Outlook."""
     
-    def __init__(self, access_token: str):
+    def __init__(
+        self,
+        access_token: str,
+        http_client: Optional[httpx.AsyncClient] = None,
+        base_url: str = GRAPH_API_URL,
+        account_id: Optional[str] = None,
+        scheduler: Optional[QuotaScheduler] = None,
+    ):
         self.access_token = access_token
-        self._base_url = "https://graph.microsoft.com/v1.0"
+        # Calls are paced against the mailbox's throttling limit when an account id is given
+        self.account_id = account_id
+        self._scheduler = scheduler or graph_quota
+        self._base_url = base_url.rstrip("/")
+        # Defaults to the shared app pool; never closed here
+        self._client = http_client
+    
+    async def initialize(self):
+        """Attach to the shared HTTP client pool (if no client was passed in)."""
+        if self._client is None:
+            self._client = http_pool.client
+    
+    async def close(self):
+        """Detach from the HTTP client (connections stay pooled)."""
+        self._client = None
+    
+    async def __aenter__(self) -> "OutlookClient":
+        await self.initialize()
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.close()
     
     async def list_conversations(
         self,
@@ -31,6 +73,44 @@ class OutlookClient:
         #     return response.json()
         raise NotImplementedError("Implement Outlook conversation listing")
     
+    async def get_message_delta(
+        self,
+        link: Optional[str] = None,
+        folder: str = "inbox",
+        page_size: int = 100,
+    ) -> dict:
+        """
+        Get one page of a message delta query.
+        
+        Pass the previous page's ``@odata.nextLink``, or a stored
+        ``@odata.deltaLink`` to resume; with no link a new delta query
+        starts (returning every message in the folder).
+        
+        Raises httpx.HTTPStatusError (410) when a delta link has expired.
+        
+        Returns:
+            {"value": [...], "@odata.nextLink" | "@odata.deltaLink": str}
+        """
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Prefer": f'odata.maxpagesize={page_size}, outlook.body-content-type="text"',
+        }
+        params = None
+        if link is None:
+            link = f"{self._base_url}/me/mailFolders/{folder}/messages/delta"
+            params = {"$select": ",".join(GRAPH_MESSAGE_FIELDS)}
+        
+        await self.initialize()
+        
+        async def send() -> dict:
+            response = await self._client.get(link, params=params, headers=headers)
+            response.raise_for_status()
+            return response.json()
+        
+        if self.account_id is None:
+            return await send()
+        return await self._scheduler.run(self.account_id, send, GRAPH_QUOTA_COSTS["delta"])
+    
     async def get_message(self, message_id: str) -> dict:
         """Get a single message with details."""
         # TODO: Implement
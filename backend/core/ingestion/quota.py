@@ -0,0 +1,285 @@
+"""
+Provider Quota Scheduler
+------------------------
+Paces provider API calls per connected account.
+
+- Token bucket per account, refilled at the provider's per-user quota rate;
+  every call costs the quota units of its operation (list, get, ...)
+- 429 / Retry-After: the account pauses for the advertised time (or an
+  exponential backoff) and its rate is halved, then recovers gradually
+- Round-robin dispatch across accounts, so one huge mailbox cannot starve
+  the others of the shared concurrency slots
+- Achieved throughput per account for monitoring
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+import httpx
+
+from app.config import settings
+
+
+T = TypeVar("T")
+
+# Gmail quota units per method (per-user limit: 250 units/second)
+GMAIL_QUOTA_COSTS = {
+    "list": 10,        # threads.list
+    "get": 10,         # threads.get
+    "attachment": 5,   # messages.attachments.get
+    "history": 2,      # history.list
+    "profile": 1,      # getProfile
+}
+
+# Graph throttles on request count (10,000 per 10 minutes per mailbox)
+GRAPH_QUOTA_COSTS = {
+    "delta": 1,
+    "get": 1,
+    "attachment": 1,
+}
+
+
+class _AccountState:
+    """Token bucket, backoff and counters for one account."""
+    
+    def __init__(self, rate: float, burst: float, now: float):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+        self.blocked_until = 0.0
+        self.consecutive_throttles = 0
+        self.waiters: Deque[Tuple[float, asyncio.Future]] = deque()
+        
+        # Counters
+        self.requests = 0
+        self.units = 0.0
+        self.throttled = 0
+        self.first_request_at: Optional[float] = None
+        self.last_request_at: Optional[float] = None
+    
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def delay_for(self, cost: float, now: float) -> float:
+        """Seconds until ``cost`` units can be spent (0 if now)."""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self.refill(now)
+        # A call costing more than the burst waits for a full bucket
+        needed = min(cost, self.burst)
+        if self.tokens >= needed:
+            return 0.0
+        return (needed - self.tokens) / self.rate
+
+
+class QuotaScheduler:
+    """
+    Schedules provider calls against per-account token buckets.
+    
+    Wrap each API call in ``run(account_id, call, cost)``.
+    """
+    
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        max_concurrency: int = 32,
+        max_retries: int = 5,
+        base_backoff: float = 1.0,
+        min_rate_fraction: float = 0.1,
+    ):
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.min_rate_fraction = min_rate_fraction
+        
+        # Accounts with queued calls, in round-robin order
+        self._accounts: "OrderedDict[str, _AccountState]" = OrderedDict()
+        self._in_flight = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+    
+    async def run(
+        self,
+        account_id: str,
+        call: Callable[[], Awaitable[T]],
+        cost: float = 1,
+    ) -> T:
+        """
+        Run ``call`` once the account has quota and a slot is free.
+        
+        Throttled calls (429, or Gmail 403 rate-limit errors) are retried
+        after the provider's Retry-After or an exponential backoff.
+        
+        Raises:
+            httpx.HTTPStatusError: if still throttled after max_retries
+        """
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(account_id, cost)
+            try:
+                result = await call()
+            except httpx.HTTPStatusError as e:
+                if not _is_throttled(e.response) or attempt == self.max_retries:
+                    raise
+                self.report_throttled(account_id, _retry_after(e.response))
+                continue
+            finally:
+                self._release()
+            
+            self._report_success(account_id)
+            return result
+    
+    def report_throttled(self, account_id: str, retry_after: Optional[float] = None) -> None:
+        """Back off an account (also used for throttled batch sub-requests)."""
+        state = self._state(account_id)
+        state.throttled += 1
+        state.consecutive_throttles += 1
+        
+        delay = retry_after
+        if delay is None:
+            delay = self.base_backoff * 2 ** (state.consecutive_throttles - 1)
+        now = self._now()
+        state.blocked_until = max(state.blocked_until, now + delay)
+        # Multiplicative decrease; the bucket restarts empty after the pause
+        state.rate = max(state.rate / 2, state.max_rate * self.min_rate_fraction)
+        state.tokens = 0.0
+        state.updated = state.blocked_until
+    
+    def stats(self) -> Dict[str, dict]:
+        """Achieved throughput and current pacing per account."""
+        now = self._now()
+        report = {}
+        for account_id, state in self._accounts.items():
+            elapsed = (
+                (state.last_request_at - state.first_request_at)
+                if state.first_request_at is not None else 0.0
+            )
+            report[account_id] = {
+                "requests": state.requests,
+                "quota_units": state.units,
+                "throttled": state.throttled,
+                "queued": len(state.waiters),
+                "current_rate": state.rate,
+                "backoff_remaining_s": max(0.0, state.blocked_until - now),
+                "units_per_second": state.units / elapsed if elapsed > 0 else 0.0,
+                "requests_per_second": (state.requests - 1) / elapsed if elapsed > 0 else 0.0,
+            }
+        return report
+    
+    async def _acquire(self, account_id: str, cost: float) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self._state(account_id).waiters.append((cost, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before cancellation: hand the slot back
+                self._release()
+            raise
+    
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._dispatch()
+    
+    def _report_success(self, account_id: str) -> None:
+        state = self._accounts[account_id]
+        state.consecutive_throttles = 0
+        # Additive recovery towards the configured rate
+        state.rate = min(state.max_rate, state.rate + state.max_rate * 0.05)
+    
+    def _dispatch(self) -> None:
+        """Grant slots round-robin to accounts whose bucket allows the next call."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        next_delay: Optional[float] = None
+        while self._in_flight < self.max_concurrency:
+            now = self._now()
+            granted = False
+            for account_id, state in list(self._accounts.items()):
+                while state.waiters and state.waiters[0][1].done():
+                    state.waiters.popleft()  # cancelled while queued
+                if not state.waiters:
+                    continue
+                
+                cost, future = state.waiters[0]
+                delay = state.delay_for(cost, now)
+                if delay > 0:
+                    next_delay = delay if next_delay is None else min(next_delay, delay)
+                    continue
+                
+                state.waiters.popleft()
+                state.tokens -= cost
+                state.requests += 1
+                state.units += cost
+                if state.first_request_at is None:
+                    state.first_request_at = now
+                state.last_request_at = now
+                self._in_flight += 1
+                future.set_result(None)
+                # Served: go to the back of the round-robin order
+                self._accounts.move_to_end(account_id)
+                granted = True
+                break
+            
+            if not granted:
+                break
+        
+        if next_delay is not None and self._in_flight < self.max_concurrency:
+            self._timer = asyncio.get_running_loop().call_later(next_delay, self._dispatch)
+    
+    def _state(self, account_id: str) -> _AccountState:
+        state = self._accounts.get(account_id)
+        if state is None:
+            state = _AccountState(self.rate, self.burst, self._now())
+            self._accounts[account_id] = state
+        return state
+    
+    @staticmethod
+    def _now() -> float:
+        return time.monotonic()
+
+
+def _is_throttled(response: httpx.Response) -> bool:
+    if response.status_code == 429:
+        return True
+    # Gmail reports per-user rate limits as 403 rateLimitExceeded
+    return response.status_code == 403 and "ratelimitexceeded" in response.text.lower()
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Retry-After header in seconds (delta-seconds or HTTP date)."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+# Per-provider schedulers (quota is per user, per provider)
+gmail_quota = QuotaScheduler(
+    rate=settings.GMAIL_QUOTA_UNITS_PER_SECOND,
+    max_concurrency=settings.QUOTA_MAX_CONCURRENCY,
+    max_retries=settings.QUOTA_MAX_RETRIES,
+)
+graph_quota = QuotaScheduler(
+    rate=settings.GRAPH_REQUESTS_PER_SECOND,
+    max_concurrency=settings.QUOTA_MAX_CONCURRENCY,
+    max_retries=settings.QUOTA_MAX_RETRIES,
+)
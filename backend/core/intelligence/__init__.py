@@ -1,16 +1,34 @@
 # Intelligence Module
-from .email_intel import analyze_thread
-from .summarizer import summarize_thread
-from .intent_classifier import classify_intent
-from .deadline_extractor import extract_deadlines
-from .entity_extractor import extract_entities
+from .email_intel import analyze_thread, update_thread_intel
+from .batch_intel import analyze_threads
+from .intel_cache import IntelCache, intel_cache, compute_thread_hash
+from .summarizer import summarize_thread, update_summary, SummaryBatcher
+from .intent_classifier import classify_intent, classify_intents, KeywordMatcher
+from .deadline_extractor import extract_deadlines, extract_message_deadlines
+from .entity_extractor import extract_entities, extract_message_entities
 from .attachment_intel import analyze_attachments
+from .document_parser import DocumentParserPool, DocumentParseError, DocumentText, document_parser
 
 __all__ = [
     "analyze_thread",
+    "update_thread_intel",
+    "analyze_threads",
+    "IntelCache",
+    "intel_cache",
+    "compute_thread_hash",
     "summarize_thread",
+    "update_summary",
+    "SummaryBatcher",
     "classify_intent",
+    "classify_intents",
+    "KeywordMatcher",
     "extract_deadlines",
+    "extract_message_deadlines",
     "extract_entities",
+    "extract_message_entities",
     "analyze_attachments",
+    "DocumentParserPool",
+    "DocumentParseError",
+    "DocumentText",
+    "document_parser",
 ]
@@ -10,6 +10,7 @@ from typing import List
 
 from contracts import AttachmentRef, AttachmentIntel
 from app.config import settings
+from .document_parser import DocumentParseError, DocumentText, document_parser
 
 
 async def analyze_attachments(
@@ -41,8 +42,9 @@ async def _analyze_single_attachment(
     model: str,
 ) -> AttachmentIntel:
     """Analyze a single attachment."""
-    # Extract text based on type
-    text = await _extract_text(attachment)
+    # Extract text based on type (only as much as summarization uses)
+    document = await _extract_text(attachment)
+    text = document.text
     
     if not text:
         return AttachmentIntel(
@@ -54,7 +56,7 @@ async def _analyze_single_attachment(
         )
     
     # Generate summary with LLM
-    summary = await _summarize_document(text, model)
+    summary = await _summarize_document(document, model)
     key_points = await _extract_key_points(text, model)
     doc_type = _classify_document_type(attachment, text)
     importance = _assess_importance(doc_type, key_points)
@@ -68,63 +70,28 @@ async def _analyze_single_attachment(
     )
 
 
-async def _extract_text(attachment: AttachmentRef) -> str:
-    """Extract text from attachment file."""
+async def _extract_text(attachment: AttachmentRef) -> DocumentText:
+    """Extract text from attachment file (parsed off the event loop)."""
     if not attachment.storage_path:
-        return ""
+        return DocumentText("")
     
     try:
-        if attachment.mime_type == "application/pdf":
-            return _extract_pdf_text(attachment.storage_path)
-        elif "word" in attachment.mime_type or attachment.mime_type.endswith(".document"):
-            return _extract_docx_text(attachment.storage_path)
-        elif "powerpoint" in attachment.mime_type or attachment.mime_type.endswith(".presentation"):
-            return _extract_pptx_text(attachment.storage_path)
-        else:
-            return ""
-    except Exception:
-        return ""
-
-
-def _extract_pdf_text(path: str) -> str:
-    """Extract text from PDF."""
-    # TODO: Implement with pypdf
-    # from pypdf import PdfReader
-    # reader = PdfReader(path)
-    # text = ""
-    # for page in reader.pages:
-    #     text += page.extract_text()
-    # return text
-    return ""
-
-
-def _extract_docx_text(path: str) -> str:
-    """Extract text from DOCX."""
-    # TODO: Implement with python-docx
-    # from docx import Document
-    # doc = Document(path)
-    # return "\n".join(p.text for p in doc.paragraphs)
-    return ""
-
-
-def _extract_pptx_text(path: str) -> str:
-    """Extract text from PPTX."""
-    # TODO: Implement with python-pptx
-    # from pptx import Presentation
-    # prs = Presentation(path)
-    # text = ""
-    # for slide in prs.slides:
-    #     for shape in slide.shapes:
-    #         if hasattr(shape, "text"):
-    #             text += shape.text + "\n"
-    # return text
-    return ""
-
-
-async def _summarize_document(text: str, model: str) -> str:
-    """Generate document summary with LLM."""
+        return await document_parser.extract_text(
+            attachment.storage_path,
+            attachment.mime_type,
+            settings.DOC_TEXT_BUDGET_CHARS,
+        )
+    except DocumentParseError:
+        return DocumentText("")
+
+
+async def _summarize_document(document: DocumentText, model: str) -> str:
+    """Generate document summary with LLM (stating its coverage if partial)."""
     # TODO: Implement LLM summarization
-    return f"Document summary (first 100 chars): {text[:100]}..."
+    summary = f"Document summary (first 100 chars): {document.text[:100]}..."
+    if document.truncated:
+        summary += f" (Covers {document.coverage()}.)"
+    return summary
 
 
 async def _extract_key_points(text: str, model: str) -> List[str]:
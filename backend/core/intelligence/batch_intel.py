@@ -0,0 +1,95 @@
+"""
+Batch Intelligence Engine
+-------------------------
+Analyzes many email threads at once (e.g. initial sync).
+
+Input: Iterable / AsyncIterable of EmailThreadV1 (from Ingestion)
+Output: ThreadIntelV1 per thread, yielded as each one completes
+"""
+
+import asyncio
+import contextvars
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional, Union
+
+from contracts import EmailThreadV1, ThreadIntelV1
+from app.config import settings
+from .email_intel import analyze_thread
+from .intel_cache import IntelCache
+from .summarizer import SummaryBatcher, active_summary_batcher
+
+
+async def analyze_threads(
+    threads: Union[Iterable[EmailThreadV1], AsyncIterable[EmailThreadV1]],
+    model: str = "gemini-1.5-pro",
+    max_concurrency: Optional[int] = None,
+    coalesce_summaries: bool = True,
+    cache: Optional[IntelCache] = None,
+) -> AsyncIterator[ThreadIntelV1]:
+    """
+    Analyze a stream of threads with bounded concurrency.
+
+    At most ``max_concurrency`` threads are in flight; the source is only
+    pulled as slots free up, so an async source is never fully buffered.
+    Results are yielded in completion order, not input order.
+
+    Args:
+        threads: Threads to analyze (list or async iterator)
+        model: LLM model to use
+        max_concurrency: Threads analyzed at once (default: settings.INTEL_BATCH_CONCURRENCY)
+        coalesce_summaries: Merge concurrent summarization prompts into batched LLM calls
+        cache: If given, unchanged threads are served from it instead of re-analyzed
+
+    Yields:
+        ThreadIntelV1 for each input thread
+    """
+    limit = max(1, max_concurrency or settings.INTEL_BATCH_CONCURRENCY)
+    analyze = cache.get_or_analyze if cache is not None else analyze_thread
+
+    # Tasks run in a context where summarize_thread routes through the batcher
+    context = contextvars.copy_context()
+    if coalesce_summaries:
+        batcher = SummaryBatcher(
+            max_batch_size=settings.INTEL_SUMMARY_BATCH_SIZE,
+            max_wait_ms=settings.INTEL_SUMMARY_BATCH_WAIT_MS,
+        )
+        context.run(active_summary_batcher.set, batcher)
+
+    source = _aiter(threads)
+    pending: set = set()
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(pending) < limit:
+                try:
+                    thread = await anext(source)
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.create_task(
+                    analyze(thread, model),
+                    context=context.copy(),
+                ))
+
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        # Consumer stopped early or a result raised - don't leak work
+        for task in pending:
+            task.cancel()
+
+
+async def _aiter(
+    threads: Union[Iterable[EmailThreadV1], AsyncIterable[EmailThreadV1]],
+) -> AsyncIterator[EmailThreadV1]:
+    """Normalize a sync or async iterable to an async iterator."""
+    if hasattr(threads, "__aiter__"):
+        async for thread in threads:
+            yield thread
+    else:
+        for thread in threads:
+            yield thread
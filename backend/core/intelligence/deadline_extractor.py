@@ -6,9 +6,9 @@ Extracts deadlines and time references from email content.
 
 import re
 from datetime import datetime, timedelta
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
-from contracts import EmailThreadV1, ExtractedDeadline
+from contracts import EmailThreadV1, EmailMessage, ExtractedDeadline
 
 
 # Common deadline patterns
@@ -23,6 +23,51 @@ DEADLINE_PATTERNS = [
     (r"(tomorrow|today|next week)", "relative deadline"),
 ]
 
+# Weekday name -> datetime.weekday() number
+WEEKDAYS = (
+    ("monday", 0), ("tuesday", 1), ("wednesday", 2), ("thursday", 3),
+    ("friday", 4), ("saturday", 5), ("sunday", 6),
+)
+
+
+# Literal words that every match of the corresponding DEADLINE_PATTERNS
+# entry starts with. Keep in step with DEADLINE_PATTERNS; a trigger must
+# not be a prefix of, or occur inside, another trigger.
+PATTERN_TRIGGERS = [
+    ("by",),
+    ("by",),
+    ("by",),
+    ("before",),
+    ("deadline",),
+    ("asap", "immediately", "urgent"),
+    ("within",),
+    ("tomorrow", "today", "next week"),
+]
+
+
+def _compile_scanner() -> Tuple["re.Pattern[str]", Dict[str, Tuple[Tuple[int, "re.Pattern[str]"], ...]]]:
+    """
+    Build the single-pass scanner.
+    
+    One alternation finds every trigger word in a single pass; only the
+    patterns a trigger can start are then tried, anchored at that spot.
+    """
+    compiled = [re.compile(pattern) for pattern, _ in DEADLINE_PATTERNS]
+    candidates: Dict[str, List[int]] = {}
+    for index, triggers in enumerate(PATTERN_TRIGGERS):
+        for trigger in triggers:
+            candidates.setdefault(trigger, []).append(index)
+    
+    words = sorted(candidates, key=len, reverse=True)
+    scanner = re.compile("|".join(re.escape(word) for word in words))
+    return scanner, {
+        word: tuple((index, compiled[index]) for index in indexes)
+        for word, indexes in candidates.items()
+    }
+
+
+_TRIGGER_SCANNER, _TRIGGER_PATTERNS = _compile_scanner()
+
 
 async def extract_deadlines(
     thread: EmailThreadV1,
@@ -38,9 +83,37 @@ async def extract_deadlines(
     Returns:
         List of ExtractedDeadline objects
     """
+    deadlines = _extract_from_messages(thread.messages)
+    
+    # Also check subject
+    subject_deadlines = _extract_from_text(thread.subject, "subject")
+    deadlines.extend(subject_deadlines)
+    
+    return _deduplicate(deadlines)
+
+
+async def extract_message_deadlines(
+    messages: List[EmailMessage],
+    model: str = "gemini-1.5-pro",
+) -> List[ExtractedDeadline]:
+    """
+    Extract deadlines from specific messages only (incremental analysis).
+    
+    Args:
+        messages: New messages to scan
+        model: LLM model (for future use)
+        
+    Returns:
+        List of ExtractedDeadline objects
+    """
+    return _deduplicate(_extract_from_messages(messages))
+
+
+def _extract_from_messages(messages: List[EmailMessage]) -> List[ExtractedDeadline]:
+    """Extract deadlines from every message not sent by the user."""
     deadlines = []
     
-    for msg in thread.messages:
+    for msg in messages:
         # Skip user's own messages
         if msg.is_from_user:
             continue
@@ -48,11 +121,11 @@ async def extract_deadlines(
         msg_deadlines = _extract_from_text(msg.body_text, msg.message_id)
         deadlines.extend(msg_deadlines)
     
-    # Also check subject
-    subject_deadlines = _extract_from_text(thread.subject, "subject")
-    deadlines.extend(subject_deadlines)
-    
-    # Deduplicate by raw_text
+    return deadlines
+
+
+def _deduplicate(deadlines: List[ExtractedDeadline]) -> List[ExtractedDeadline]:
+    """Deduplicate by raw_text, keeping the first occurrence."""
     seen = set()
     unique_deadlines = []
     for d in deadlines:
@@ -66,28 +139,48 @@ async def extract_deadlines(
 def _extract_from_text(text: str, source: str) -> List[ExtractedDeadline]:
     """Extract deadlines from text using patterns."""
     deadlines = []
-    text_lower = text.lower()
-    
-    for pattern, description in DEADLINE_PATTERNS:
-        matches = re.finditer(pattern, text_lower)
-        for match in matches:
-            raw_text = match.group(0)
-            normalized = _normalize_deadline(raw_text)
-            confidence = _calculate_confidence(raw_text, description)
-            
-            deadlines.append(ExtractedDeadline(
-                raw_text=raw_text,
-                normalized=normalized,
-                confidence=confidence,
-                source=source,
-            ))
+    now = datetime.utcnow()
+    
+    for index, _, raw_text in _scan(text.lower()):
+        description = DEADLINE_PATTERNS[index][1]
+        deadlines.append(ExtractedDeadline(
+            raw_text=raw_text,
+            normalized=_normalize_deadline(raw_text, now),
+            confidence=_calculate_confidence(raw_text, description),
+            source=source,
+        ))
     
     return deadlines
 
 
-def _normalize_deadline(raw_text: str) -> datetime:
+def _scan(text_lower: str) -> List[Tuple[int, int, str]]:
+    """
+    Find all pattern matches in a single pass over the text.
+    
+    Returns (pattern index, start, matched text) ordered by pattern, then
+    position - the same hits and order as running each pattern separately.
+    """
+    hits = []
+    # Per-pattern end of last hit: like finditer, a pattern never overlaps itself
+    last_end = [0] * len(DEADLINE_PATTERNS)
+    
+    for trigger in _TRIGGER_SCANNER.finditer(text_lower):
+        start = trigger.start()
+        for index, pattern in _TRIGGER_PATTERNS[trigger.group()]:
+            if start < last_end[index]:
+                continue
+            match = pattern.match(text_lower, start)
+            if match:
+                hits.append((index, start, match.group()))
+                last_end[index] = match.end()
+    
+    hits.sort()
+    return hits
+
+
+def _normalize_deadline(raw_text: str, now: Optional[datetime] = None) -> datetime:
     """Try to convert deadline text to actual datetime."""
-    now = datetime.utcnow()
+    now = now or datetime.utcnow()
     text = raw_text.lower()
     
     # Handle relative terms
@@ -101,11 +194,7 @@ def _normalize_deadline(raw_text: str) -> datetime:
         return now.replace(hour=17, minute=0, second=0)
     
     # Handle days of week
-    days = {
-        "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
-        "friday": 4, "saturday": 5, "sunday": 6
-    }
-    for day, num in days.items():
+    for day, num in WEEKDAYS:
         if day in text:
             days_ahead = num - now.weekday()
             if days_ahead <= 0:
@@ -0,0 +1,322 @@
+"""
+Document Parser Pool
+--------------------
+Extracts text from PDF/DOCX/PPTX attachments in worker processes.
+
+pypdf, python-docx and python-pptx are CPU-bound and can take seconds on
+large decks; run inline they would stall the event loop (and every API
+request with it). Parsing runs in a bounded ProcessPoolExecutor instead:
+
+- at most ``max_workers`` documents parse at once, ``max_pending`` more wait
+- each document gets ``timeout_seconds`` (SIGALRM inside the worker; the
+  pool is recycled if a worker ignores it, e.g. stuck in C code, and the
+  other documents that were on that pool are resubmitted once)
+- each worker may grow by ``memory_limit_mb`` of address space beyond its
+  baseline (RLIMIT_AS); a document over the cap fails with MemoryError
+  instead of taking the host down
+- workers are replaced every ``max_tasks_per_child`` documents so parser
+  memory fragmentation does not build up
+
+Only a prefix of a document is ever summarized, so extraction stops at a
+character budget: PDF pages (and PPTX slides) are parsed one at a time and
+the rest of the document is never touched. The result records which
+pages were covered.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from app.config import settings
+
+
+# Seconds past timeout_seconds before a worker that ignores SIGALRM is killed
+TIMEOUT_GRACE_SECONDS = 5.0
+
+
+class DocumentParseError(Exception):
+    """A document could not be parsed (timeout, memory cap, crash or parser error)."""
+    
+    def __init__(self, reason: str, detail: str = ""):
+        self.reason = reason
+        super().__init__(f"Document parsing failed ({reason}){': ' + detail if detail else ''}")
+
+
+class DocumentText:
+    """Extracted text and how much of the document it covers."""
+    
+    def __init__(
+        self,
+        text: str,
+        truncated: bool = False,
+        unit: Optional[str] = None,
+        units_read: int = 0,
+        unit_count: int = 0,
+    ):
+        self.text = text
+        self.truncated = truncated
+        # Pages (PDF) or slides (PPTX); None for flowing text (DOCX)
+        self.unit = unit
+        self.units_read = units_read
+        self.unit_count = unit_count
+    
+    def coverage(self) -> str:
+        """E.g. "pages 1-12 of 300"; "" when the whole document was read."""
+        if not self.truncated:
+            return ""
+        if self.unit is None:
+            return f"the first {len(self.text):,} characters"
+        return f"{self.unit}s 1-{self.units_read} of {self.unit_count}"
+
+
+class DocumentParserPool:
+    """Bounded process pool for document text extraction."""
+    
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout_seconds: float = 30.0,
+        memory_limit_mb: int = 512,
+        max_tasks_per_child: int = 50,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout_seconds = timeout_seconds
+        self.memory_limit_mb = memory_limit_mb
+        self.max_tasks_per_child = max_tasks_per_child
+        # Submitted but not finished: running plus queued in the executor
+        self._slots = asyncio.Semaphore(self.max_workers + (max_pending or self.max_workers))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Pools killed over a timeout: their other documents did nothing wrong
+        self._timed_out: "weakref.WeakSet[ProcessPoolExecutor]" = weakref.WeakSet()
+        
+        # Counters
+        self.documents = 0
+        self.timeouts = 0
+        self.memory_errors = 0
+        self.crashes = 0
+        self.failures = 0
+        self.resubmitted = 0
+        self.waiting = 0
+    
+    async def extract_text(self, path: str, mime_type: str, max_chars: int) -> DocumentText:
+        """Up to ``max_chars`` of a PDF/DOCX/PPTX file's text (empty for unsupported types)."""
+        if _parser_for(mime_type) is None:
+            return DocumentText("")
+        return await self.run(extract_document_text, path, mime_type, max_chars)
+    
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        Run ``fn(*args)`` in a worker under the timeout and memory caps.
+        
+        ``fn`` must be a module-level function (it is pickled by name).
+        
+        Raises:
+            DocumentParseError: on timeout, memory cap, worker crash or parser error
+        """
+        self.waiting += 1
+        async with self._slots:
+            self.waiting -= 1
+            resubmitted = False
+            while True:
+                executor = self._pool()
+                future = asyncio.get_running_loop().run_in_executor(
+                    executor, _run_limited, fn, args, self.timeout_seconds,
+                )
+                try:
+                    # Backstop for a worker that never returns to the interpreter
+                    status, value = await asyncio.wait_for(
+                        future, self.timeout_seconds + TIMEOUT_GRACE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    self._timed_out.add(executor)
+                    self._recycle(executor)
+                    raise DocumentParseError("timeout", "worker unresponsive") from None
+                except BrokenProcessPool as e:
+                    if executor in self._timed_out and not resubmitted:
+                        # Killed along with another document's stuck worker
+                        self.resubmitted += 1
+                        resubmitted = True
+                        continue
+                    # The worker died (segfault, OOM kill): start a fresh pool
+                    self.crashes += 1
+                    self._recycle(executor)
+                    raise DocumentParseError("crash") from e
+                break
+        
+        self.documents += 1
+        if status == "ok":
+            return value
+        if status == "timeout":
+            self.timeouts += 1
+        elif status == "memory":
+            self.memory_errors += 1
+        else:
+            self.failures += 1
+        raise DocumentParseError(status, value)
+    
+    async def close(self) -> None:
+        """Shut the workers down (called from the app lifespan)."""
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+    
+    def stats(self) -> dict:
+        """Counters for monitoring."""
+        return {
+            "started": self._executor is not None,
+            "max_workers": self.max_workers,
+            "waiting": self.waiting,
+            "documents": self.documents,
+            "timeouts": self.timeouts,
+            "memory_errors": self.memory_errors,
+            "crashes": self.crashes,
+            "failures": self.failures,
+            "resubmitted": self.resubmitted,
+        }
+    
+    def _pool(self) -> ProcessPoolExecutor:
+        # Started on first use: API processes that never parse never spawn workers
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                # spawn: forking a process with a running event loop and threads is unsafe
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_limit_memory,
+                initargs=(self.memory_limit_mb,),
+                max_tasks_per_child=self.max_tasks_per_child,
+            )
+        return self._executor
+    
+    def _recycle(self, executor: ProcessPoolExecutor) -> None:
+        if self._executor is executor:
+            self._executor = None
+        # Other documents on this pool, running or queued, fail with BrokenProcessPool
+        for process in list((executor._processes or {}).values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=False)
+
+
+def _limit_memory(memory_limit_mb: int) -> None:
+    """Cap the worker's address space at its baseline plus ``memory_limit_mb``."""
+    try:
+        import resource
+    except ImportError:
+        return  # not available on Windows
+    baseline = 0
+    try:
+        with open("/proc/self/statm") as statm:
+            baseline = int(statm.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        pass
+    limit = baseline + memory_limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _run_limited(fn: Callable[..., Any], args: tuple, timeout_seconds: float):
+    """Run in a worker: ("ok", result) or (failure reason, detail)."""
+    def on_alarm(signum, frame):
+        raise TimeoutError()
+    
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout_seconds)
+    try:
+        return "ok", fn(*args)
+    except TimeoutError:
+        return "timeout", f"over {timeout_seconds:g}s"
+    except MemoryError:
+        return "memory", "over the worker memory limit"
+    except Exception as e:
+        return "error", repr(e)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def extract_document_text(path: str, mime_type: str, max_chars: int) -> DocumentText:
+    """Extract text from a document file (runs in a worker process)."""
+    parser = _parser_for(mime_type)
+    return parser(path, max_chars) if parser is not None else DocumentText("")
+
+
+def iter_page_text(pages: Iterable) -> Iterable[str]:
+    """Text of each page, parsed only when the consumer gets to it."""
+    for page in pages:
+        yield page.extract_text() or ""
+
+
+def take_text(parts: Iterable[str], max_chars: int) -> Tuple[str, int, bool]:
+    """
+    Join parts until ``max_chars``; later parts are never pulled.
+    
+    Returns:
+        (text, parts used, whether the budget cut the document short)
+    """
+    taken, size = [], 0
+    for part in parts:
+        if size + len(part) > max_chars:
+            if size < max_chars:
+                taken.append(part[:max_chars - size])
+            return "\n".join(taken), len(taken), True
+        taken.append(part)
+        size += len(part) + 1
+    return "\n".join(taken), len(taken), False
+
+
+def _parser_for(mime_type: str) -> Optional[Callable[[str, int], DocumentText]]:
+    if mime_type == "application/pdf":
+        return _extract_pdf_text
+    elif "word" in mime_type or mime_type.endswith(".document"):
+        return _extract_docx_text
+    elif "powerpoint" in mime_type or mime_type.endswith(".presentation"):
+        return _extract_pptx_text
+    else:
+        return None
+
+
+def _extract_pdf_text(path: str, max_chars: int) -> DocumentText:
+    """Extract text from PDF, page by page, up to the budget."""
+    from pypdf import PdfReader
+    
+    reader = PdfReader(path)
+    # Pages are parsed lazily by pypdf: unread pages cost nothing
+    text, pages_read, truncated = take_text(iter_page_text(reader.pages), max_chars)
+    return DocumentText(text, truncated, "page", pages_read, len(reader.pages))
+
+
+def _extract_docx_text(path: str, max_chars: int) -> DocumentText:
+    """Extract text from DOCX."""
+    from docx import Document
+    
+    doc = Document(path)
+    text, _, truncated = take_text((p.text for p in doc.paragraphs), max_chars)
+    return DocumentText(text, truncated)
+
+
+def _extract_pptx_text(path: str, max_chars: int) -> DocumentText:
+    """Extract text from PPTX, slide by slide, up to the budget."""
+    from pptx import Presentation
+    
+    prs = Presentation(path)
+    slides = (
+        "\n".join(shape.text for shape in slide.shapes if hasattr(shape, "text"))
+        for slide in prs.slides
+    )
+    text, slides_read, truncated = take_text(slides, max_chars)
+    return DocumentText(text, truncated, "slide", slides_read, len(prs.slides))
+
+
+# Singleton instance
+document_parser = DocumentParserPool(
+    max_workers=settings.DOC_PARSER_WORKERS or None,
+    max_pending=settings.DOC_PARSER_MAX_PENDING or None,
+    timeout_seconds=settings.DOC_PARSER_TIMEOUT_SECONDS,
+    memory_limit_mb=settings.DOC_PARSER_MEMORY_LIMIT_MB,
+    max_tasks_per_child=settings.DOC_PARSER_MAX_TASKS_PER_CHILD,
+)
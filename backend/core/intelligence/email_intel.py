@@ -7,27 +7,42 @@ Input: EmailThreadV1 (from Ingestion)
 Output: ThreadIntelV1 (Boundary Contract to Workflow)
 """
 
+import asyncio
+import logging
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from contracts import (
     EmailThreadV1,
+    EmailMessage,
     ThreadIntelV1,
     IntentType,
     ExtractedDeadline,
     ExtractedEntity,
     AttachmentIntel,
 )
-from .summarizer import summarize_thread
+from app.config import settings
+from .summarizer import summarize_thread, update_summary
 from .intent_classifier import classify_intent
-from .deadline_extractor import extract_deadlines
-from .entity_extractor import extract_entities
+from .deadline_extractor import extract_deadlines, extract_message_deadlines
+from .entity_extractor import extract_entities, extract_message_entities
 from .attachment_intel import analyze_attachments
 
 
+# Sub-analyses combined into ThreadIntelV1, in reporting order
+ANALYSIS_STAGES = ("summary", "intent", "deadlines", "entities", "attachments")
+
+_MISSING = object()
+
+logger = logging.getLogger(__name__)
+
+
 async def analyze_thread(
     thread: EmailThreadV1,
     model: str = "gemini-1.5-pro",
+    concurrent: Optional[bool] = None,
+    stage_timeout: Optional[float] = None,
 ) -> ThreadIntelV1:
     """
     Analyze an email thread and produce complete intelligence.
@@ -35,20 +50,155 @@ async def analyze_thread(
     This is the MAIN entry point for the Intelligence layer.
     All sub-analyses are combined into a single ThreadIntelV1 output.
     
+    Sub-analyses are independent, so by default they run concurrently and
+    the thread costs roughly its slowest stage. A stage that fails or
+    exceeds its timeout falls back to a neutral value and is listed in
+    ``degraded_stages`` instead of failing the whole thread.
+    
     Args:
         thread: EmailThreadV1 from Ingestion
         model: LLM model to use
+        concurrent: Run stages concurrently (default: settings.INTEL_CONCURRENT_STAGES)
+        stage_timeout: Per-stage timeout in seconds (default: settings.INTEL_STAGE_TIMEOUT_SECONDS)
         
     Returns:
         ThreadIntelV1 containing all analysis results
     """
-    # Run all analyses (can be parallelized)
-    summary = await summarize_thread(thread, model)
-    intent, urgency = await classify_intent(thread, model)
-    deadlines = await extract_deadlines(thread, model)
-    entities = await extract_entities(thread, model)
-    attachment_summaries = await analyze_attachments(thread.attachments, model)
+    if concurrent is None:
+        concurrent = settings.INTEL_CONCURRENT_STAGES
+    if stage_timeout is None:
+        stage_timeout = settings.INTEL_STAGE_TIMEOUT_SECONDS
+    
+    stages: Dict[str, Callable[[], Awaitable[Any]]] = {
+        "summary": lambda: summarize_thread(thread, model),
+        "intent": lambda: classify_intent(thread, model),
+        "deadlines": lambda: extract_deadlines(thread, model),
+        "entities": lambda: extract_entities(thread, model),
+        "attachments": lambda: analyze_attachments(thread.attachments, model),
+    }
+    
+    started = time.perf_counter()
+    timings: Dict[str, float] = {}
+    results = await _run_stages(stages, concurrent, stage_timeout, timings)
+    degraded = _apply_fallbacks(results, _stage_fallbacks(thread))
+    
+    intent, urgency = results["intent"]
+    return _build_intel(
+        thread,
+        model,
+        summary=results["summary"],
+        intent=intent,
+        urgency=urgency,
+        deadlines=results["deadlines"],
+        entities=results["entities"],
+        attachment_summaries=results["attachments"],
+        timings=timings,
+        degraded=degraded,
+        started=started,
+    )
+
+
+async def update_thread_intel(
+    thread: EmailThreadV1,
+    previous: ThreadIntelV1,
+    new_messages: List[EmailMessage],
+    model: str = "gemini-1.5-pro",
+    concurrent: Optional[bool] = None,
+    stage_timeout: Optional[float] = None,
+) -> ThreadIntelV1:
+    """
+    Re-analyze a thread after new messages arrived, reusing previous intel.
+    
+    Only ``new_messages`` and attachments not already summarized are
+    scanned; the summary is rolled forward from ``previous.summary``. Cost
+    per update is therefore independent of thread length. Falls back to a
+    full analyze_thread if ``previous`` came from another model or was
+    itself degraded.
+    
+    Args:
+        thread: Current EmailThreadV1 (already including new_messages)
+        previous: ThreadIntelV1 produced before new_messages arrived
+        new_messages: Messages added since ``previous`` was generated
+        model: LLM model to use
+        concurrent: Run stages concurrently (default: settings.INTEL_CONCURRENT_STAGES)
+        stage_timeout: Per-stage timeout in seconds (default: settings.INTEL_STAGE_TIMEOUT_SECONDS)
+        
+    Returns:
+        ThreadIntelV1 for the whole thread
+    """
+    if previous.model_version != model or previous.degraded_stages:
+        return await analyze_thread(thread, model, concurrent, stage_timeout)
+    
+    if concurrent is None:
+        concurrent = settings.INTEL_CONCURRENT_STAGES
+    if stage_timeout is None:
+        stage_timeout = settings.INTEL_STAGE_TIMEOUT_SECONDS
+    
+    known_attachments = {a.attachment_id for a in previous.attachment_summaries}
+    new_attachments = [a for a in thread.attachments if a.attachment_id not in known_attachments]
     
+    stages: Dict[str, Callable[[], Awaitable[Any]]] = {
+        "summary": lambda: update_summary(thread, previous.summary, new_messages, model),
+        "intent": lambda: classify_intent(thread, model),
+        "deadlines": lambda: extract_message_deadlines(new_messages, model),
+        "entities": lambda: extract_message_entities(new_messages, model),
+        "attachments": lambda: analyze_attachments(new_attachments, model),
+    }
+    
+    started = time.perf_counter()
+    timings: Dict[str, float] = {}
+    results = await _run_stages(stages, concurrent, stage_timeout, timings)
+    degraded = _apply_fallbacks(results, {
+        # Keep what we already knew rather than neutral values
+        "summary": previous.summary,
+        "intent": (previous.intent, previous.urgency_score),
+        "deadlines": [],
+        "entities": [],
+        "attachments": [],
+    })
+    
+    seen_deadlines = {d.raw_text for d in previous.extracted_deadlines}
+    deadlines = list(previous.extracted_deadlines) + [
+        d for d in results["deadlines"] if d.raw_text not in seen_deadlines
+    ]
+    
+    seen_entities = {(e.entity_type, e.value) for e in previous.entities}
+    entities = list(previous.entities)
+    for entity in results["entities"]:
+        if (entity.entity_type, entity.value) not in seen_entities:
+            seen_entities.add((entity.entity_type, entity.value))
+            entities.append(entity)
+    
+    intent, urgency = results["intent"]
+    return _build_intel(
+        thread,
+        model,
+        summary=results["summary"],
+        intent=intent,
+        urgency=urgency,
+        deadlines=deadlines,
+        entities=entities,
+        attachment_summaries=list(previous.attachment_summaries) + results["attachments"],
+        timings=timings,
+        degraded=degraded,
+        started=started,
+    )
+
+
+def _build_intel(
+    thread: EmailThreadV1,
+    model: str,
+    summary: str,
+    intent: IntentType,
+    urgency: int,
+    deadlines: List[ExtractedDeadline],
+    entities: List[ExtractedEntity],
+    attachment_summaries: List[AttachmentIntel],
+    timings: Dict[str, float],
+    degraded: List[str],
+    started: float,
+) -> ThreadIntelV1:
+    """Derive suggestions from stage results and assemble ThreadIntelV1."""
     # Extract main ask and decision needed from summary
     main_ask = _extract_main_ask(summary)
     decision_needed = _extract_decision(summary, intent)
@@ -59,6 +209,8 @@ async def analyze_thread(
     # Generate reply points
     reply_points = _generate_reply_points(thread, intent, deadlines)
     
+    timings["total"] = _elapsed_ms(started)
+    
     return ThreadIntelV1(
         thread_id=thread.thread_id,
         summary=summary,
@@ -73,9 +225,75 @@ async def analyze_thread(
         suggested_reply_points=reply_points,
         model_version=model,
         processed_at=datetime.utcnow(),
+        stage_timings_ms=timings,
+        degraded_stages=degraded,
     )
 
 
+async def _run_stages(
+    stages: Dict[str, Callable[[], Awaitable[Any]]],
+    concurrent: bool,
+    timeout: float,
+    timings: Dict[str, float],
+) -> Dict[str, Any]:
+    """Run all stages, either in one task group or one after another."""
+    if not concurrent:
+        return {
+            name: await _run_stage(name, factory, timeout, timings)
+            for name, factory in stages.items()
+        }
+    
+    # _run_stage never raises, so one slow/failed stage cannot cancel the rest
+    async with asyncio.TaskGroup() as group:
+        tasks = {
+            name: group.create_task(_run_stage(name, factory, timeout, timings))
+            for name, factory in stages.items()
+        }
+    return {name: task.result() for name, task in tasks.items()}
+
+
+async def _run_stage(
+    name: str,
+    factory: Callable[[], Awaitable[Any]],
+    timeout: float,
+    timings: Dict[str, float],
+) -> Any:
+    """Run a single stage with a timeout. Returns _MISSING on failure."""
+    started = time.perf_counter()
+    try:
+        async with asyncio.timeout(timeout):
+            return await factory()
+    except Exception as e:
+        reason = "timed out" if isinstance(e, TimeoutError) else "failed"
+        logger.warning("Analysis stage %s %s; using its fallback", name, reason, exc_info=True)
+        return _MISSING
+    finally:
+        timings[name] = _elapsed_ms(started)
+
+
+def _apply_fallbacks(results: Dict[str, Any], fallbacks: Dict[str, Any]) -> List[str]:
+    """Replace missing stage results in place; return the degraded stage names."""
+    degraded = [name for name in ANALYSIS_STAGES if results[name] is _MISSING]
+    for name in degraded:
+        results[name] = fallbacks[name]
+    return degraded
+
+
+def _stage_fallbacks(thread: EmailThreadV1) -> Dict[str, Any]:
+    """Neutral values used when a stage times out or fails."""
+    return {
+        "summary": thread.subject,
+        "intent": (IntentType.UNKNOWN, 0),
+        "deadlines": [],
+        "entities": [],
+        "attachments": [],
+    }
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
 def _extract_main_ask(summary: str) -> Optional[str]:
     """Extract the main ask from summary."""
     # TODO: Use LLM to extract main ask
@@ -7,7 +7,7 @@ Extracts named entities from email content.
 import re
 from typing import List
 
-from contracts import EmailThreadV1, ExtractedEntity
+from contracts import EmailThreadV1, EmailMessage, ExtractedEntity
 
 
 # Email pattern
@@ -34,23 +34,45 @@ async def extract_entities(
     Returns:
         List of ExtractedEntity objects
     """
-    entities = []
-    
     # Combine all message content
     all_text = " ".join(msg.body_text for msg in thread.messages)
     all_text += f" {thread.subject}"
     
-    # Extract different entity types
-    entities.extend(_extract_emails(all_text))
-    entities.extend(_extract_money(all_text))
-    entities.extend(_extract_phones(all_text))
-    
     # TODO: Use LLM for more sophisticated entity extraction
     # - People names
     # - Company names
     # - Dates
     # - Project names
     
+    return _extract_from_text(all_text)
+
+
+async def extract_message_entities(
+    messages: List[EmailMessage],
+    model: str = "gemini-1.5-pro",
+) -> List[ExtractedEntity]:
+    """
+    Extract entities from specific messages only (incremental analysis).
+    
+    Args:
+        messages: New messages to scan
+        model: LLM model (for future use)
+        
+    Returns:
+        List of ExtractedEntity objects
+    """
+    return _extract_from_text(" ".join(msg.body_text for msg in messages))
+
+
+def _extract_from_text(text: str) -> List[ExtractedEntity]:
+    """Run all entity extractors over text."""
+    entities = []
+    
+    # Extract different entity types
+    entities.extend(_extract_emails(text))
+    entities.extend(_extract_money(text))
+    entities.extend(_extract_phones(text))
+    
     return entities
 
 
@@ -0,0 +1,224 @@
+"""
+Thread Intelligence Cache
+-------------------------
+Skips re-analysis of threads whose content has not changed.
+
+Two tiers, both keyed by a content hash of the thread:
+- In-process LRU (per worker, bounded)
+- Postgres Thread.intel_json / Thread.intel_hash (shared across workers)
+
+Saving intel also refreshes the thread's thread_summaries row, so the
+inbox list shows what the cache serves.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from contracts import EmailThreadV1, ThreadIntelV1
+from app.config import settings
+from core.storage.database import async_session
+from models.thread import Thread, ThreadSummary
+from .email_intel import analyze_thread
+
+
+# Bump when analysis rules change so previously cached intel is recomputed
+INTEL_PIPELINE_VERSION = "1"
+
+
+def compute_thread_hash(thread: EmailThreadV1, model: str) -> str:
+    """
+    Stable SHA-256 of everything that affects the analysis output.
+
+    Covers the thread's messages, attachment ids, model and pipeline version.
+    """
+    digest = hashlib.sha256()
+
+    def add(value: str) -> None:
+        # Length-prefix each part so field boundaries can't be shifted
+        encoded = value.encode("utf-8")
+        digest.update(f"{len(encoded)}:".encode())
+        digest.update(encoded)
+
+    add(INTEL_PIPELINE_VERSION)
+    add(model)
+    add(thread.thread_id)
+    add(thread.subject)
+    add(",".join(sorted(thread.participants)))
+    for msg in thread.messages:
+        add(msg.message_id)
+        add(msg.from_address)
+        add(msg.sent_at.isoformat())
+        add("1" if msg.is_from_user else "0")
+        add(msg.body_text)
+    for attachment_id in sorted(att.attachment_id for att in thread.attachments):
+        add(attachment_id)
+
+    return digest.hexdigest()
+
+
+class IntelCache:
+    """ThreadIntelV1 cache with an LRU tier in front of the database tier."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ):
+        self.max_entries = max_entries
+        self._session_factory = session_factory
+        # thread_id -> (content hash, intel); one entry per thread
+        self._entries: "OrderedDict[str, tuple[str, ThreadIntelV1]]" = OrderedDict()
+
+        # Counters
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.db_errors = 0
+
+    async def get(self, thread: EmailThreadV1, model: str) -> Optional[ThreadIntelV1]:
+        """Return cached intel if the thread is unchanged, else None."""
+        key = compute_thread_hash(thread, model)
+
+        entry = self._entries.get(thread.thread_id)
+        if entry is not None and entry[0] == key:
+            self._entries.move_to_end(thread.thread_id)
+            self.memory_hits += 1
+            return entry[1]
+
+        intel = await self._load_from_db(thread.thread_id, key)
+        if intel is not None:
+            self.db_hits += 1
+            self._remember(thread.thread_id, key, intel)
+            return intel
+
+        self.misses += 1
+        return None
+
+    async def put(
+        self,
+        thread: EmailThreadV1,
+        model: str,
+        intel: ThreadIntelV1,
+        persist: bool = True,
+    ) -> None:
+        """
+        Store intel for the thread's current content in both tiers.
+
+        With ``persist=False`` it is only kept in memory, for callers that
+        store it with the thread themselves (the sync thread writer).
+        """
+        key = compute_thread_hash(thread, model)
+        self._remember(thread.thread_id, key, intel)
+        if persist:
+            await self._save_to_db(thread, key, intel)
+
+    async def get_or_analyze(
+        self,
+        thread: EmailThreadV1,
+        model: str = "gemini-1.5-pro",
+        persist: bool = True,
+    ) -> ThreadIntelV1:
+        """Return cached intel, or analyze the thread and cache the result (see ``put``)."""
+        cached = await self.get(thread, model)
+        if cached is not None:
+            return cached
+
+        intel = await analyze_thread(thread, model)
+        # Degraded results are partial - let the next run retry them
+        if not intel.degraded_stages:
+            await self.put(thread, model, intel, persist)
+        return intel
+
+    def invalidate(self, thread_id: str) -> None:
+        """Drop the in-process entry (e.g. on explicit refresh)."""
+        self._entries.pop(thread_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring."""
+        return {
+            "entries": len(self._entries),
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "db_errors": self.db_errors,
+        }
+
+    def _remember(self, thread_id: str, key: str, intel: ThreadIntelV1) -> None:
+        self._entries[thread_id] = (key, intel)
+        self._entries.move_to_end(thread_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def _load_from_db(self, thread_id: str, key: str) -> Optional[ThreadIntelV1]:
+        if self._session_factory is None:
+            return None
+
+        # The database tier is best-effort: an outage means a miss, not a failure
+        try:
+            async with self._session_factory() as session:
+                result = await session.execute(
+                    select(Thread.intel_hash, Thread.intel_json).where(Thread.id == thread_id)
+                )
+                row = result.first()
+        except ProgrammingError:
+            # Missing column or table: an unapplied migration, not an outage
+            raise
+        except (SQLAlchemyError, OSError):
+            self.db_errors += 1
+            return None
+
+        if row is None or row.intel_hash != key or row.intel_json is None:
+            return None
+        return ThreadIntelV1.model_validate(row.intel_json)
+
+    async def _save_to_db(self, thread: EmailThreadV1, key: str, intel: ThreadIntelV1) -> None:
+        if self._session_factory is None:
+            return
+        # thread_writer imports this module
+        from core.storage.thread_writer import summary_row
+
+        try:
+            async with self._session_factory() as session:
+                result = await session.execute(
+                    update(Thread)
+                    .where(Thread.id == thread.thread_id)
+                    .values(
+                        summary=intel.summary,
+                        intent=intel.intent.value,
+                        urgency_score=intel.urgency_score,
+                        intel_json=intel.model_dump(mode="json"),
+                        intel_hash=key,
+                        intel_generated_at=intel.processed_at,
+                    )
+                    .returning(Thread.user_id)
+                )
+                user_id = result.scalar_one_or_none()
+                # Not stored yet: the thread writer inserts both rows
+                if user_id is not None:
+                    row = summary_row(user_id, thread, intel)
+                    statement = pg_insert(ThreadSummary).values(row)
+                    await session.execute(statement.on_conflict_do_update(
+                        index_elements=["thread_id"],
+                        set_={column: statement.excluded[column] for column in row if column != "thread_id"},
+                    ))
+                await session.commit()
+        except ProgrammingError:
+            raise
+        except (SQLAlchemyError, OSError):
+            self.db_errors += 1
+
+
+# Singleton instance
+intel_cache = IntelCache(
+    max_entries=settings.INTEL_CACHE_MAX_ENTRIES,
+    session_factory=async_session,
+)
@@ -4,7 +4,12 @@ Intent Classifier
 Classifies email intent and urgency.
 """
 
-from typing import Tuple
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
 from contracts import EmailThreadV1, IntentType
 
 
@@ -26,9 +31,87 @@ FYI_KEYWORDS = [
 ]
 
 
+class KeywordMatcher:
+    """
+    Keyword groups compiled for repeated matching.
+    
+    Call ``scan(text)`` once per text and query group counts from the
+    result: each distinct keyword is searched at most once per text, no
+    matter how many groups list it or how many counts are asked for.
+    """
+    
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        self.groups: Dict[str, List[str]] = {
+            name: [kw.lower() for kw in keywords] for name, keywords in groups.items()
+        }
+        distinct = {kw for keywords in self.groups.values() for kw in keywords}
+        # Keywords contained in another (e.g. "noon" in "afternoon") are
+        # known to be present once the longer one is found
+        self._implied: Dict[str, List[str]] = {
+            kw: [other for other in distinct if other != kw and other in kw]
+            for kw in distinct
+        }
+    
+    def extended(self, extra: Dict[str, Iterable[str]]) -> "KeywordMatcher":
+        """Return a new matcher with extra keywords added to (or as new) groups."""
+        groups = {name: list(keywords) for name, keywords in self.groups.items()}
+        for name, keywords in extra.items():
+            groups.setdefault(name, []).extend(keywords)
+        return KeywordMatcher(groups)
+    
+    def scan(self, text: str) -> "KeywordScan":
+        """Start matching against (already lowercased) text."""
+        return KeywordScan(self, text)
+
+
+class KeywordScan:
+    """Keyword presence for one text, searched lazily and memoized."""
+    
+    def __init__(self, matcher: KeywordMatcher, text: str):
+        self._matcher = matcher
+        self._text = text
+        self._present: Dict[str, bool] = {}
+    
+    def has(self, keyword: str) -> bool:
+        present = self._present.get(keyword)
+        if present is None:
+            present = keyword in self._text
+            self._present[keyword] = present
+            if present:
+                for implied in self._matcher._implied[keyword]:
+                    self._present[implied] = True
+        return present
+    
+    def count(self, group: str, limit: Optional[int] = None) -> int:
+        """
+        Number of the group's keywords present in the text.
+        
+        With ``limit``, stops searching once that many are found.
+        """
+        count = 0
+        for kw in self._matcher.groups.get(group, ()):
+            if self.has(kw):
+                count += 1
+                if limit is not None and count >= limit:
+                    break
+        return count
+    
+    def counts(self) -> Dict[str, int]:
+        """Counts for every group."""
+        return {group: self.count(group) for group in self._matcher.groups}
+
+
+DEFAULT_KEYWORD_MATCHER = KeywordMatcher({
+    "urgent": URGENT_KEYWORDS,
+    "scheduling": SCHEDULING_KEYWORDS,
+    "fyi": FYI_KEYWORDS,
+})
+
+
 async def classify_intent(
     thread: EmailThreadV1,
     model: str = "gemini-1.5-pro",
+    keywords: Optional[KeywordMatcher] = None,
 ) -> Tuple[IntentType, int]:
     """
     Classify the intent of an email thread.
@@ -36,6 +119,7 @@ async def classify_intent(
     Args:
         thread: EmailThreadV1 to classify
         model: LLM model (for future use)
+        keywords: Matcher with custom keyword sets (default: DEFAULT_KEYWORD_MATCHER)
         
     Returns:
         Tuple of (intent type, urgency score 0-100)
@@ -55,7 +139,7 @@ async def classify_intent(
     combined = f"{subject_lower} {body_lower}"
     
     # Rule-based classification
-    intent, base_urgency = _classify_by_keywords(combined)
+    intent, base_urgency = _classify_by_keywords(combined, keywords or DEFAULT_KEYWORD_MATCHER)
     
     # Adjust urgency based on additional signals
     urgency = _calculate_urgency(thread, intent, base_urgency)
@@ -63,22 +147,140 @@ async def classify_intent(
     return intent, urgency
 
 
-def _classify_by_keywords(text: str) -> Tuple[IntentType, int]:
+async def classify_intents(
+    threads: Sequence[EmailThreadV1],
+    model: str = "gemini-1.5-pro",
+    keywords: Optional[KeywordMatcher] = None,
+) -> List[Tuple[IntentType, int]]:
+    """
+    Classify many threads at once (e.g. nightly re-scoring).
+    
+    Applies exactly the rules of classify_intent, but searches each keyword
+    once across the whole batch and evaluates the rules as array operations.
+    
+    Args:
+        threads: EmailThreadV1 list to classify
+        model: LLM model (for future use)
+        keywords: Matcher with custom keyword sets (default: DEFAULT_KEYWORD_MATCHER)
+        
+    Returns:
+        (intent type, urgency score 0-100) per thread, in input order
+    """
+    keywords = keywords or DEFAULT_KEYWORD_MATCHER
+    if not threads:
+        return []
+    
+    no_messages = np.array([not t.messages for t in threads], dtype=bool)
+    from_user = np.array(
+        [bool(t.messages) and t.messages[-1].is_from_user for t in threads], dtype=bool
+    )
+    texts = [
+        "" if skip else f"{t.subject.lower()} {t.messages[-1].body_text.lower()}"
+        for t, skip in zip(threads, no_messages | from_user)
+    ]
+    
+    # Evaluate the keyword rules stage by stage, like _classify_by_keywords
+    # returning early: each stage only searches threads still undecided
+    n = len(threads)
+    pending = np.flatnonzero(~(no_messages | from_user))
+    urgent = _group_counts(texts, pending, keywords.groups.get("urgent", ()), n)
+    pending = pending[urgent[pending] == 0]
+    scheduling = _group_counts(texts, pending, keywords.groups.get("scheduling", ()), n)
+    pending = pending[scheduling[pending] < 2]
+    fyi = _group_counts(texts, pending, keywords.groups.get("fyi", ()), n)
+    pending = pending[fyi[pending] == 0]
+    question = _group_counts(texts, pending, ["?"], n) > 0
+    
+    # Same precedence as classify_intent / _classify_by_keywords
+    rules = [
+        (no_messages, IntentType.UNKNOWN, 0),
+        (from_user, IntentType.FYI, 10),
+        (urgent >= 2, IntentType.URGENT, 90),
+        (urgent >= 1, IntentType.ACTION_REQUIRED, 70),
+        (scheduling >= 2, IntentType.SCHEDULING, 50),
+        (fyi >= 1, IntentType.FYI, 20),
+        (question, IntentType.ACTION_REQUIRED, 50),
+    ]
+    conditions = [condition for condition, _, _ in rules]
+    rule = np.select(conditions, np.arange(len(rules)), default=len(rules))
+    intents = [intent for _, intent, _ in rules] + [IntentType.FYI]
+    base = np.array([score for _, _, score in rules] + [30], dtype=np.int32)[rule]
+    
+    # _calculate_urgency adjustments (not applied to the early returns)
+    has_attachments = np.array([bool(t.attachments) for t in threads], dtype=bool)
+    many_participants = np.array([len(t.participants) > 3 for t in threads], dtype=bool)
+    adjusted = np.minimum(base + 10 * has_attachments + 5 * many_participants, 100)
+    urgency = np.where(no_messages | from_user, base, adjusted)
+    
+    return [(intents[r], int(u)) for r, u in zip(rule.tolist(), urgency.tolist())]
+
+
+def _group_counts(
+    texts: List[str],
+    rows: np.ndarray,
+    group: Sequence[str],
+    size: int,
+) -> np.ndarray:
+    """
+    Per-thread count of a group's keywords present in the text.
+    
+    Only ``rows`` are searched; other entries are 0. A keyword counts once
+    per listing in the group, matching KeywordScan.count.
+    """
+    counts = np.zeros(size, dtype=np.int32)
+    if len(rows) == 0 or not group:
+        return counts
+    
+    columns = sorted(set(group))
+    weights = np.array([group.count(kw) for kw in columns], dtype=np.int32)
+    presence = _keyword_presence([texts[i] for i in rows], columns)
+    counts[rows] = presence.astype(np.int32) @ weights
+    return counts
+
+
+def _keyword_presence(texts: List[str], columns: List[str]) -> np.ndarray:
+    """
+    Boolean texts x columns matrix: does column's keyword occur in text.
+    
+    Texts are joined into one NUL-separated corpus so each keyword costs a
+    single C-level search over the batch; after a hit the search skips to
+    the next text, so work per keyword is bounded by the texts containing it.
+    """
+    corpus = "\0".join(texts)
+    starts = [0, *accumulate(len(t) + 1 for t in texts)]
+    presence = np.zeros((len(texts), len(columns)), dtype=bool)
+    
+    for j, kw in enumerate(columns):
+        pos = corpus.find(kw)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            presence[i, j] = True
+            pos = corpus.find(kw, starts[i + 1])
+    
+    return presence
+
+
+def _classify_by_keywords(
+    text: str,
+    keywords: KeywordMatcher = DEFAULT_KEYWORD_MATCHER,
+) -> Tuple[IntentType, int]:
     """Classify intent based on keyword matching."""
+    scan = keywords.scan(text)
+    
     # Check for urgent indicators
-    urgent_count = sum(1 for kw in URGENT_KEYWORDS if kw in text)
+    urgent_count = scan.count("urgent", limit=2)
     if urgent_count >= 2:
         return IntentType.URGENT, 90
     elif urgent_count >= 1:
         return IntentType.ACTION_REQUIRED, 70
     
     # Check for scheduling
-    scheduling_count = sum(1 for kw in SCHEDULING_KEYWORDS if kw in text)
+    scheduling_count = scan.count("scheduling", limit=2)
     if scheduling_count >= 2:
         return IntentType.SCHEDULING, 50
     
     # Check for FYI
-    fyi_count = sum(1 for kw in FYI_KEYWORDS if kw in text)
+    fyi_count = scan.count("fyi", limit=1)
     if fyi_count >= 1:
         return IntentType.FYI, 20
     
@@ -4,10 +4,25 @@ Thread Summarizer
 Uses LLM to generate executive summaries of email threads.
 """
 
-from typing import Optional
-from contracts import EmailThreadV1
+import asyncio
+import re
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from contracts import EmailThreadV1, EmailMessage
 
 from app.config import settings
+from core.network import http_pool
+
+
+# Batcher that summarize_thread routes through, if one is active (see analyze_threads)
+active_summary_batcher: ContextVar[Optional["SummaryBatcher"]] = ContextVar(
+    "active_summary_batcher", default=None
+)
+
+GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta"
+OPENAI_API_URL = "https://api.openai.com/v1"
+
+_BATCH_SECTION_PATTERN = re.compile(r"^### Thread (\d+)\s*$", re.MULTILINE)
 
 
 async def summarize_thread(
@@ -27,12 +42,112 @@ async def summarize_thread(
     # Build context from thread
     context = _build_thread_context(thread)
     
-    # Generate summary with LLM
+    # Generate summary with LLM (coalesced with other threads when batching)
+    batcher = active_summary_batcher.get()
+    if batcher is not None:
+        return await batcher.submit(context, model)
+    
     summary = await _generate_summary(context, model)
     
     return summary
 
 
+async def update_summary(
+    thread: EmailThreadV1,
+    previous_summary: str,
+    new_messages: List[EmailMessage],
+    model: str = "gemini-1.5-pro",
+) -> str:
+    """
+    Roll an existing summary forward with newly arrived messages.
+    
+    The prompt carries the previous summary instead of the full history,
+    so its size is independent of thread length.
+    
+    Args:
+        thread: Current EmailThreadV1 (subject/participants/attachments)
+        previous_summary: Summary produced for the earlier messages
+        new_messages: Messages that arrived since that summary
+        model: LLM model to use
+        
+    Returns:
+        2-3 sentence executive summary
+    """
+    context = _build_update_context(thread, previous_summary, new_messages)
+    
+    batcher = active_summary_batcher.get()
+    if batcher is not None:
+        return await batcher.submit(context, model)
+    
+    return await _generate_summary(context, model)
+
+
+class SummaryBatcher:
+    """
+    Coalesces concurrent summarization prompts into batched LLM calls.
+    
+    Prompts submitted within ``max_wait_ms`` of each other (up to
+    ``max_batch_size``) are sent as one multi-thread prompt. Each caller
+    still gets back its own summary.
+    """
+    
+    def __init__(self, max_batch_size: int = 8, max_wait_ms: int = 20):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+        self._pending: List[Tuple[str, str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: set = set()
+        
+        # Counters
+        self.prompts_submitted = 0
+        self.llm_calls = 0
+    
+    async def submit(self, context: str, model: str) -> str:
+        """Queue a thread context and wait for its summary."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((context, model, future))
+        self.prompts_submitted += 1
+        
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self.flush)
+        
+        return await future
+    
+    def flush(self) -> None:
+        """Dispatch everything queued so far, one LLM call per model."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        batch, self._pending = self._pending, []
+        by_model: dict = {}
+        for context, model, future in batch:
+            if not future.done():
+                by_model.setdefault(model, []).append((context, future))
+        
+        for model, items in by_model.items():
+            task = asyncio.create_task(self._dispatch(model, items))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+    
+    async def _dispatch(self, model: str, items: List[Tuple[str, asyncio.Future]]) -> None:
+        self.llm_calls += 1
+        try:
+            summaries = await _generate_summaries([context for context, _ in items], model)
+        except Exception as exc:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        
+        for (_, future), summary in zip(items, summaries):
+            if not future.done():
+                future.set_result(summary)
+
+
 def _build_thread_context(thread: EmailThreadV1) -> str:
     """Build context string for LLM prompt."""
     messages_text = []
@@ -52,6 +167,32 @@ Attachments: {len(thread.attachments)} files
 """
 
 
+def _build_update_context(
+    thread: EmailThreadV1,
+    previous_summary: str,
+    new_messages: List[EmailMessage],
+) -> str:
+    """Build context from a previous summary plus new messages only."""
+    messages_text = []
+    
+    for msg in new_messages:
+        sender = "You" if msg.is_from_user else msg.from_address
+        messages_text.append(f"From: {sender}\n{msg.body_text[:500]}")
+    
+    return f"""
+Subject: {thread.subject}
+Participants: {', '.join(thread.participants)}
+
+Summary of earlier messages:
+{previous_summary}
+
+New messages:
+{chr(10).join(messages_text)}
+
+Attachments: {len(thread.attachments)} files
+"""
+
+
 async def _generate_summary(context: str, model: str) -> str:
     """Call LLM to generate summary."""
     prompt = f"""Summarize this email thread in 2-3 sentences. Focus on:
@@ -70,25 +211,82 @@ Summary:"""
         return await _call_openai(prompt, model)
     else:
         # Fallback for testing
-        return f"Summary of thread: {context[:100]}..."
+        return _fallback_summary(context)
+
+
+async def _generate_summaries(contexts: List[str], model: str) -> List[str]:
+    """Summarize several threads with a single LLM call where possible."""
+    if len(contexts) == 1:
+        return [await _generate_summary(contexts[0], model)]
+    
+    if settings.LLM_PROVIDER not in ("gemini", "openai"):
+        # Fallback for testing
+        return [_fallback_summary(context) for context in contexts]
+    
+    sections = "\n".join(
+        f"### Thread {i}\n{context}" for i, context in enumerate(contexts, start=1)
+    )
+    prompt = f"""Summarize each of the {len(contexts)} email threads below in 2-3 sentences. Focus on:
+- What is the main topic?
+- What action is needed (if any)?
+- What is the deadline (if any)?
+
+Answer with one section per thread, in order, each starting with a line "### Thread <number>".
+
+{sections}
+"""
+    
+    if settings.LLM_PROVIDER == "gemini":
+        response = await _call_gemini(prompt, model)
+    else:
+        response = await _call_openai(prompt, model)
+    
+    summaries = _split_batch_response(response, len(contexts))
+    if summaries is not None:
+        return summaries
+    
+    # Model ignored the section format - fall back to one call per thread
+    return list(await asyncio.gather(*(_generate_summary(c, model) for c in contexts)))
+
+
+def _split_batch_response(response: str, expected: int) -> Optional[List[str]]:
+    """Split a batched response into per-thread summaries (None if malformed)."""
+    parts = _BATCH_SECTION_PATTERN.split(response)
+    # parts = [preamble, "1", text, "2", text, ...]
+    numbered = {int(num): text.strip() for num, text in zip(parts[1::2], parts[2::2])}
+    if sorted(numbered) != list(range(1, expected + 1)):
+        return None
+    return [numbered[i] for i in range(1, expected + 1)]
+
+
+def _fallback_summary(context: str) -> str:
+    return f"Summary of thread: {context[:100]}..."
 
 
 async def _call_gemini(prompt: str, model: str) -> str:
-    """Call Google Gemini API."""
-    # TODO: Implement Gemini API call
-    # import google.generativeai as genai
-    # genai.configure(api_key=settings.GEMINI_API_KEY)
-    # model = genai.GenerativeModel(model)
-    # response = model.generate_content(prompt)
-    # return response.text
-    raise NotImplementedError("Implement Gemini API call")
+    """Call Google Gemini API (REST, through the shared HTTP pool)."""
+    if not settings.GEMINI_API_KEY:
+        raise RuntimeError("GEMINI_API_KEY is not configured")
+    
+    response = await http_pool.client.post(
+        f"{GEMINI_API_URL}/models/{model}:generateContent",
+        params={"key": settings.GEMINI_API_KEY},
+        json={"contents": [{"parts": [{"text": prompt}]}]},
+    )
+    response.raise_for_status()
+    parts = response.json()["candidates"][0]["content"]["parts"]
+    return "".join(part.get("text", "") for part in parts).strip()
 
 
 async def _call_openai(prompt: str, model: str) -> str:
-    """Call OpenAI API."""
-    # TODO: Implement OpenAI API call
-    # from openai import OpenAI
-    # client = OpenAI(api_key=settings.OPENAI_API_KEY)
-    # response = client.chat.completions.create(...)
-    # return response.choices[0].message.content
-    raise NotImplementedError("Implement OpenAI API call")
+    """Call OpenAI API (REST, through the shared HTTP pool)."""
+    if not settings.OPENAI_API_KEY:
+        raise RuntimeError("OPENAI_API_KEY is not configured")
+    
+    response = await http_pool.client.post(
+        f"{OPENAI_API_URL}/chat/completions",
+        headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"},
+        json={"model": model, "messages": [{"role": "user", "content": prompt}]},
+    )
+    response.raise_for_status()
+    return response.json()["choices"][0]["message"]["content"].strip()
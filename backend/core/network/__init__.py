@@ -0,0 +1,7 @@
+# Network Module
+from .http_pool import http_pool, HttpClientPool
+
+__all__ = [
+    "http_pool",
+    "HttpClientPool",
+]
@@ -0,0 +1,190 @@
+"""
+HTTP Client Pool
+----------------
+One application-scoped httpx.AsyncClient shared by every outbound caller
+(Gmail, Outlook, OAuth, LLM providers).
+
+Connections are kept alive and reused across requests, HTTP/2 is used when
+the h2 package is installed, and concurrent requests are capped per host.
+Started and closed by the app lifespan (app/main.py).
+"""
+
+import asyncio
+import importlib.util
+import time
+from typing import Callable, Dict, Optional
+
+import httpx
+
+from app.config import settings
+
+
+class HttpClientPool:
+    """Shared httpx.AsyncClient with per-host limits and utilization counters."""
+    
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        max_per_host: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        http2: bool = True,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.max_per_host = max_per_host
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        # HTTP/2 needs the optional h2 package (httpx[http2])
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self._inner_transport = transport
+        self._transport: Optional[_HostLimitedTransport] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        
+        # Counters (per host, across restarts)
+        self.hosts: Dict[str, Dict[str, float]] = {}
+    
+    async def start(self) -> None:
+        """Create the shared client (idempotent)."""
+        if self._client is None:
+            self._client = self._create_client()
+    
+    async def close(self) -> None:
+        """Close the shared client and its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._transport = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        The shared client.
+        
+        Created on first use if the lifespan has not started the pool (e.g.
+        scripts); it must then be used from a single event loop.
+        """
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+    
+    def stats(self) -> dict:
+        """Pool utilization for monitoring and sizing."""
+        connections = self._connections()
+        return {
+            "started": self._client is not None,
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "max_per_host": self.max_per_host,
+            "connections": len(connections),
+            "idle_connections": sum(1 for c in connections if c.is_idle()),
+            "in_flight": sum(int(h["in_flight"]) for h in self.hosts.values()),
+            "waiting": sum(int(h["waiting"]) for h in self.hosts.values()),
+            "requests": sum(int(h["requests"]) for h in self.hosts.values()),
+            "hosts": {host: dict(counters) for host, counters in self.hosts.items()},
+        }
+    
+    def _create_client(self) -> httpx.AsyncClient:
+        inner = self._inner_transport or httpx.AsyncHTTPTransport(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+        )
+        self._transport = _HostLimitedTransport(inner, self.max_per_host, self.hosts)
+        return httpx.AsyncClient(transport=self._transport, timeout=self.timeout)
+    
+    def _connections(self) -> list:
+        # httpcore's pool is not exposed by httpx; report nothing if that changes
+        pool = getattr(getattr(self._transport, "inner", None), "_pool", None)
+        return list(getattr(pool, "connections", []))
+
+
+class _HostLimitedTransport(httpx.AsyncBaseTransport):
+    """Caps concurrent requests per host and counts them."""
+    
+    def __init__(
+        self,
+        inner: httpx.AsyncBaseTransport,
+        max_per_host: int,
+        hosts: Dict[str, Dict[str, float]],
+    ):
+        self.inner = inner
+        self._max_per_host = max_per_host
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._hosts = hosts
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        slot = self._slots.setdefault(host, asyncio.Semaphore(self._max_per_host))
+        counters = self._hosts.setdefault(host, {
+            "requests": 0, "in_flight": 0, "peak_in_flight": 0, "waiting": 0, "wait_ms_total": 0.0,
+        })
+        
+        counters["waiting"] += 1
+        started = time.perf_counter()
+        try:
+            await slot.acquire()
+        finally:
+            counters["waiting"] -= 1
+        counters["wait_ms_total"] += (time.perf_counter() - started) * 1000
+        counters["requests"] += 1
+        counters["in_flight"] += 1
+        counters["peak_in_flight"] = max(counters["peak_in_flight"], counters["in_flight"])
+        
+        released = False
+        
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                counters["in_flight"] -= 1
+                slot.release()
+        
+        try:
+            response = await self.inner.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        
+        # The slot is held until the body has been read and closed
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, release),
+            extensions=response.extensions,
+        )
+    
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+    
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+    
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+# Singleton instance
+http_pool = HttpClientPool(
+    max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE,
+    max_per_host=settings.HTTP_POOL_MAX_PER_HOST,
+    keepalive_expiry=settings.HTTP_POOL_KEEPALIVE_EXPIRY_SECONDS,
+    timeout=settings.HTTP_POOL_TIMEOUT_SECONDS,
+    http2=settings.HTTP_POOL_HTTP2,
+)
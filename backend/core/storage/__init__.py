@@ -1,5 +1,6 @@
 # Storage Module
-from .database import get_db, init_db, Base
+from .database import get_db, init_db, Base, db_pool_metrics
+from .pool_metrics import PoolMetrics
 from .vector_store import vector_store, VectorStore
 from .file_storage import file_storage, FileStorage
 
@@ -7,6 +8,8 @@ __all__ = [
     "get_db",
     "init_db",
     "Base",
+    "db_pool_metrics",
+    "PoolMetrics",
     "vector_store",
     "VectorStore",
     "file_storage",
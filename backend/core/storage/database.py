@@ -4,18 +4,44 @@ Database Connection
 SQLAlchemy async database setup.
 """
 
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 
 from app.config import settings
+from .pool_metrics import PoolMetrics, instrumented_pool
 
 
+def engine_options(config=settings) -> dict:
+    """Engine and pool arguments from settings."""
+    url = make_url(config.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"))
+    connect_args = {}
+    if config.DB_STATEMENT_CACHE_SIZE is not None:
+        # asyncpg's own cache, and SQLAlchemy's prepared statement cache on top of it
+        # (0 for both behind a transaction-mode pgbouncer)
+        connect_args["statement_cache_size"] = config.DB_STATEMENT_CACHE_SIZE
+        url = url.update_query_dict({"prepared_statement_cache_size": str(config.DB_STATEMENT_CACHE_SIZE)})
+    return {
+        "url": url,
+        "echo": config.DEBUG,
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": config.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+# Pool checkout counters (exported on /metrics)
+db_pool_metrics = PoolMetrics()
+
 # Create async engine
 engine = create_async_engine(
-    settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"),
-    echo=settings.DEBUG,
-    future=True,
+    **engine_options(),
+    poolclass=instrumented_pool(db_pool_metrics),
 )
+db_pool_metrics.bind(engine)
 
 # Session factory
 async_session = async_sessionmaker(
@@ -2,20 +2,70 @@
 File Storage
 ------------
 Cloud/local file storage for attachments.
+
+Attachments are content-addressed: streamed to disk in chunks while
+hashed, then stored once under their SHA-256, however many threads they
+were forwarded in. Each attachment holds a reference on its blob; the
+blob is deleted when the last reference is released.
+    
+    blobs/ab/abcdef...          the content
+    refs/ab/abcdef.../<ref id>  one marker per referencing attachment
+    locks/ab                    lock file of every blob under ab/
+
+Adding and releasing references take the blob's lock, so a blob is never
+deleted while another worker process is adding a reference to it.
 """
 
+import asyncio
+import hashlib
 import os
+import uuid
 import aiofiles
-from typing import Optional
+import aiofiles.os
+from contextlib import asynccontextmanager
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, Optional, Union
 from app.config import settings
 
+try:
+    import fcntl
+except ImportError:  # Windows: locks only hold within the process
+    fcntl = None
+
+
+# Bytes read or written per chunk
+CHUNK_SIZE = 64 * 1024
+
+# Seconds between attempts to take a lock file held by another process
+LOCK_POLL_INTERVAL = 0.005
+
+Chunks = Union[AsyncIterable[bytes], Iterable[bytes]]
+
+
+class StoredBlob:
+    """Result of storing content: its address and whether it was new."""
+    
+    def __init__(self, path: str, digest: str, size_bytes: int, created: bool):
+        self.path = path
+        self.digest = digest
+        self.size_bytes = size_bytes
+        self.created = created
+
 
 class FileStorage:
     """File storage abstraction."""
     
-    def __init__(self):
-        self.storage_path = settings.STORAGE_PATH
+    def __init__(self, storage_path: Optional[str] = None):
+        self.storage_path = storage_path or settings.STORAGE_PATH
         os.makedirs(self.storage_path, exist_ok=True)
+        # Per lock stripe: serializes add/release within this process
+        # (the lock file serializes across processes); dropped when unused
+        self._locks: Dict[str, _StripeLock] = {}
+        
+        # Counters
+        self.blobs_written = 0
+        self.dedup_hits = 0
+        self.bytes_written = 0
+        self.bytes_deduplicated = 0
     
     async def save(
         self,
@@ -34,6 +84,76 @@ class FileStorage:
         
         return full_path
     
+    async def save_stream(self, ref_id: str, chunks: Chunks) -> StoredBlob:
+        """
+        Stream content to its content address and reference it from ``ref_id``.
+        
+        Content already stored is not written again; saving the same
+        ref_id twice holds a single reference.
+        """
+        tmp_dir = os.path.join(self.storage_path, "tmp")
+        await aiofiles.os.makedirs(tmp_dir, exist_ok=True)
+        tmp_path = os.path.join(tmp_dir, uuid.uuid4().hex)
+        
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with aiofiles.open(tmp_path, "wb") as f:
+                async for chunk in _iterate(chunks):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    await f.write(chunk)
+            
+            address = digest.hexdigest()
+            path = self.blob_path(address)
+            async with self._lock(address):
+                created = not await aiofiles.os.path.exists(path)
+                if created:
+                    await aiofiles.os.makedirs(os.path.dirname(path), exist_ok=True)
+                    # Atomic: readers never see a partial blob
+                    await aiofiles.os.replace(tmp_path, path)
+                await self._add_ref(address, ref_id)
+        finally:
+            if await aiofiles.os.path.exists(tmp_path):
+                await aiofiles.os.remove(tmp_path)
+        
+        if created:
+            self.blobs_written += 1
+            self.bytes_written += size
+        else:
+            self.dedup_hits += 1
+            self.bytes_deduplicated += size
+        return StoredBlob(path, address, size, created)
+    
+    async def release(self, path: str, ref_id: str) -> bool:
+        """
+        Drop ``ref_id``'s reference to a blob.
+        
+        Returns:
+            True if that was the last reference and the blob was deleted
+        """
+        address = os.path.basename(path)
+        refs_dir = self._refs_dir(address)
+        async with self._lock(address):
+            marker = os.path.join(refs_dir, _safe(ref_id))
+            if await aiofiles.os.path.exists(marker):
+                await aiofiles.os.remove(marker)
+            if await aiofiles.os.path.exists(refs_dir):
+                if await aiofiles.os.listdir(refs_dir):
+                    return False
+                await aiofiles.os.rmdir(refs_dir)
+            return await self.delete(self.blob_path(address))
+    
+    async def ref_count(self, path: str) -> int:
+        """Number of attachments referencing a blob."""
+        refs_dir = self._refs_dir(os.path.basename(path))
+        if not await aiofiles.os.path.exists(refs_dir):
+            return 0
+        return len(await aiofiles.os.listdir(refs_dir))
+    
+    def blob_path(self, address: str) -> str:
+        return os.path.join(self.storage_path, "blobs", address[:2], address)
+    
     async def get(self, path: str) -> Optional[bytes]:
         """Read a file from storage."""
         if not os.path.exists(path):
@@ -44,8 +164,8 @@ class FileStorage:
     
     async def delete(self, path: str) -> bool:
         """Delete a file."""
-        if os.path.exists(path):
-            os.remove(path)
+        if await aiofiles.os.path.exists(path):
+            await aiofiles.os.remove(path)
             return True
         return False
     
@@ -53,6 +173,84 @@ class FileStorage:
         """Get a URL for a stored file."""
         # In production, return cloud storage URL
         return f"/files/{os.path.basename(path)}"
+    
+    def stats(self) -> dict:
+        """Counters for monitoring."""
+        return {
+            "blobs_written": self.blobs_written,
+            "dedup_hits": self.dedup_hits,
+            "bytes_written": self.bytes_written,
+            "bytes_deduplicated": self.bytes_deduplicated,
+        }
+    
+    async def _add_ref(self, address: str, ref_id: str) -> None:
+        refs_dir = self._refs_dir(address)
+        await aiofiles.os.makedirs(refs_dir, exist_ok=True)
+        async with aiofiles.open(os.path.join(refs_dir, _safe(ref_id)), "wb"):
+            pass
+    
+    def _refs_dir(self, address: str) -> str:
+        return os.path.join(self.storage_path, "refs", address[:2], address)
+    
+    @asynccontextmanager
+    async def _lock(self, address: str) -> AsyncIterator[None]:
+        """Hold the lock of a blob's stripe, in this process and across processes."""
+        stripe = address[:2]
+        entry = self._locks.get(stripe)
+        if entry is None:
+            entry = self._locks[stripe] = _StripeLock()
+        entry.holders += 1
+        try:
+            async with entry.lock:
+                fd = await self._lock_file(stripe)
+                try:
+                    yield
+                finally:
+                    if fd is not None:
+                        os.close(fd)  # Releases the flock
+        finally:
+            entry.holders -= 1
+            if not entry.holders:
+                del self._locks[stripe]
+    
+    async def _lock_file(self, stripe: str) -> Optional[int]:
+        if fcntl is None:
+            return None
+        lock_dir = os.path.join(self.storage_path, "locks")
+        await aiofiles.os.makedirs(lock_dir, exist_ok=True)
+        fd = os.open(os.path.join(lock_dir, stripe), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            # Non-blocking attempts: a blocked flock would tie up an executor thread
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return fd
+                except BlockingIOError:
+                    await asyncio.sleep(LOCK_POLL_INTERVAL)
+        except BaseException:
+            os.close(fd)
+            raise
+
+
+class _StripeLock:
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        # Coroutines holding or waiting for the lock
+        self.holders = 0
+
+
+async def _iterate(chunks: Chunks):
+    if hasattr(chunks, "__aiter__"):
+        async for chunk in chunks:
+            yield chunk
+    else:
+        for chunk in chunks:
+            yield chunk
+
+
+def _safe(ref_id: str) -> str:
+    # Attachment ids become file names
+    return ref_id.replace(os.sep, "_").replace("..", "_")
 
 
 # Singleton instance
@@ -0,0 +1,108 @@
+"""
+Database Pool Metrics
+---------------------
+Instrumentation for the SQLAlchemy connection pool.
+
+The engine's pool class is wrapped so every checkout is timed: how long
+callers wait for a connection, how often they time out, and how many
+connections had to be opened beyond ``pool_size`` (overflow). Together
+with the live checked-out count this shows whether DB_POOL_SIZE fits the
+number of sync workers and concurrent requests.
+"""
+
+import time
+from typing import Optional, Type
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Checkout counters for one engine's pool."""
+    
+    def __init__(self):
+        self._engine: Optional[AsyncEngine] = None
+        
+        # Counters
+        self.checkouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.waits = 0  # checkouts that found no idle connection
+        self.timeouts = 0
+        self.connects = 0
+        self.overflow_connects = 0
+        self.peak_checked_out = 0
+    
+    def bind(self, engine: AsyncEngine) -> None:
+        """Report live gauges from this engine's (current) pool."""
+        self._engine = engine
+    
+    def record_checkout(self, wait_ms: float, waited: bool, checked_out: int) -> None:
+        self.checkouts += 1
+        self.wait_ms_total += wait_ms
+        self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+        if waited:
+            self.waits += 1
+        self.peak_checked_out = max(self.peak_checked_out, checked_out)
+    
+    def stats(self) -> dict:
+        """Pool utilization for monitoring and sizing."""
+        report = {
+            "checkouts": self.checkouts,
+            "wait_ms_avg": self.wait_ms_total / self.checkouts if self.checkouts else 0.0,
+            "wait_ms_max": self.wait_ms_max,
+            "waits": self.waits,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "overflow_connects": self.overflow_connects,
+            "peak_checked_out": self.peak_checked_out,
+        }
+        pool = self._engine.sync_engine.pool if self._engine is not None else None
+        if isinstance(pool, QueuePool):
+            report.update({
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                # Connections beyond pool_size (negative: room left in the pool)
+                "overflow": pool.overflow(),
+            })
+        return report
+
+
+def instrumented_pool(
+    metrics: PoolMetrics,
+    base: Type[QueuePool] = AsyncAdaptedQueuePool,
+) -> Type[QueuePool]:
+    """
+    Pool class recording into ``metrics``.
+    
+    A class (not an instance) so it survives ``engine.dispose()``, which
+    rebuilds the pool from ``pool.__class__``.
+    """
+    
+    class InstrumentedPool(base):
+        def _do_get(self):
+            # No idle connection and no overflow left: the caller queues
+            waited = self.checkedin() == 0 and self._overflow >= self._max_overflow
+            started = time.perf_counter()
+            try:
+                record = super()._do_get()
+            except exc.TimeoutError:
+                metrics.timeouts += 1
+                raise
+            metrics.record_checkout(
+                (time.perf_counter() - started) * 1000,
+                waited=waited,
+                checked_out=self.checkedout(),
+            )
+            return record
+        
+        def _create_connection(self):
+            metrics.connects += 1
+            # _do_get counts the connection in _overflow before opening it
+            if self._overflow > 0:
+                metrics.overflow_connects += 1
+            return super()._create_connection()
+    
+    return InstrumentedPool
@@ -0,0 +1,105 @@
+"""
+Thread Reader
+-------------
+Loads stored threads back into EmailThreadV1, with their cached intel.
+
+The counterpart of the thread writer, for code that has to re-analyze a
+thread from what is stored: the refresh endpoint, and sync deltas that
+carry only the changed messages.
+"""
+
+from typing import Dict, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from contracts import AttachmentRef, EmailMessage, EmailThreadV1, ThreadIntelV1
+from models.attachment import Attachment
+from models.thread import Message, Thread
+
+
+class StoredThread:
+    """A stored thread and the intel last written for it."""
+    
+    def __init__(self, thread: EmailThreadV1, intel: Optional[ThreadIntelV1]):
+        self.thread = thread
+        self.intel = intel
+
+
+async def load_threads(
+    session: AsyncSession,
+    user_id: str,
+    thread_ids: Sequence[str],
+) -> Dict[str, StoredThread]:
+    """Stored threads of ``user_id`` by id; unknown ids are left out."""
+    if not thread_ids:
+        return {}
+    
+    result = await session.execute(
+        select(Thread).where(Thread.user_id == user_id, Thread.id.in_(list(thread_ids)))
+    )
+    rows = result.scalars().all()
+    if not rows:
+        return {}
+    ids = [row.id for row in rows]
+    
+    result = await session.execute(
+        select(Message).where(Message.thread_id.in_(ids)).order_by(Message.sent_at, Message.id)
+    )
+    messages: Dict[str, list] = {}
+    for message in result.scalars().all():
+        messages.setdefault(message.thread_id, []).append(message)
+    
+    result = await session.execute(
+        select(Attachment, Message.thread_id)
+        .join(Message, Message.id == Attachment.message_id)
+        .where(Message.thread_id.in_(ids))
+        .order_by(Attachment.id)
+    )
+    attachments: Dict[str, list] = {}
+    for attachment, thread_id in result.all():
+        attachments.setdefault(thread_id, []).append(attachment)
+    
+    return {
+        row.id: StoredThread(
+            _thread(row, messages.get(row.id, []), attachments.get(row.id, [])),
+            ThreadIntelV1.model_validate(row.intel_json) if row.intel_json else None,
+        )
+        for row in rows
+    }
+
+
+def _thread(row: Thread, messages: list, attachments: list) -> EmailThreadV1:
+    return EmailThreadV1(
+        thread_id=row.id,
+        external_id=row.external_id,
+        subject=row.subject or "",
+        participants=list(row.participants or []),
+        messages=[
+            EmailMessage(
+                message_id=message.id,
+                from_address=message.from_address,
+                to_addresses=list(message.to_addresses or []),
+                cc_addresses=list(message.cc_addresses or []),
+                subject=message.subject or "",
+                body_text=message.body_text or "",
+                sent_at=message.sent_at,
+                is_from_user=bool(message.is_from_user),
+            )
+            for message in messages
+        ],
+        attachments=[
+            AttachmentRef(
+                attachment_id=attachment.id,
+                filename=attachment.filename,
+                original_filename=attachment.original_filename or attachment.filename,
+                mime_type=attachment.mime_type,
+                storage_path=attachment.storage_path or "",
+                size_bytes=attachment.size_bytes or 0,
+                message_id=attachment.message_id,
+            )
+            for attachment in attachments
+        ],
+        last_updated=row.last_email_at or (messages[-1].sent_at if messages else row.created_at),
+        provider=row.provider,
+    )
@@ -0,0 +1,409 @@
+"""
+Thread Writer
+-------------
+Bulk persistence of synced threads and their analysis.
+
+A batch of (EmailThreadV1, ThreadIntelV1, tasks) is written with one
+multi-row ``INSERT ... ON CONFLICT DO UPDATE`` per table, in a single
+transaction:
+
+- threads: keyed on (user_id, external_id); intel is cached on the row.
+  Provider ids are only unique per mailbox (Outlook conversation ids are
+  shared across a tenant), so thread, message and attachment row ids are
+  derived from the user and the provider id (see ``scope_thread``)
+- thread_summaries: the inbox list projection, keyed on thread_id
+- messages / attachments: keyed on their (scoped) ids
+- tasks: keyed on ids derived from the thread (see ``task_id_for``).
+  Pending tasks are updated or dropped; tasks the user already acted on
+  are never touched, so they do not come back on the next sync
+
+Each thread in a batch is the whole conversation: stored messages it no
+longer has (deleted in the mailbox) are deleted with their attachments,
+unless the caller turns pruning off.
+Deletions reported by the sync run (deleted threads, removed messages) are
+applied in the same transaction; a thread left without messages is
+deleted with everything that references it. Once committed, deleted
+attachments release their reference on the stored blob.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+from sqlalchemy import delete, exists, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from contracts import EmailThreadV1, TaskDTOv1, ThreadIntelV1
+from core.intelligence.intel_cache import compute_thread_hash
+from core.workflow.task_generator import task_id_for
+from models.attachment import Attachment
+from models.draft import Draft
+from models.email import Email
+from models.task import EffortLevel, PriorityLevel, Task, TaskStatus, TaskType
+from models.thread import Message, Thread, ThreadSummary
+from .database import async_session
+from .file_storage import FileStorage, file_storage
+
+
+ThreadResult = Tuple[EmailThreadV1, ThreadIntelV1, List[TaskDTOv1]]
+
+# asyncpg allows at most 32767 bind parameters per statement
+MAX_BIND_PARAMS = 32767
+
+# uuid5 namespace of thread row ids
+THREAD_ID_NAMESPACE = uuid.UUID("6f1c2a4e-8d0b-5e7a-9c3f-2b4d6e8f0a1c")
+
+
+def scoped_thread_id(user_id: str, external_id: str) -> str:
+    """Row id of a user's provider thread (stable across syncs)."""
+    return f"thread-{uuid.uuid5(THREAD_ID_NAMESPACE, f'{user_id}:{external_id}')}"
+
+
+def scoped_message_id(user_id: str, message_id: str) -> str:
+    """Row id of a user's message (``message_id`` as the fetcher builds it: msg-<provider id>)."""
+    return f"msg-{uuid.uuid5(THREAD_ID_NAMESPACE, f'{user_id}:message:{message_id}')}"
+
+
+def scoped_attachment_id(user_id: str, attachment_id: str) -> str:
+    """Row id of a user's attachment (``attachment_id`` as the fetcher builds it)."""
+    return f"att-{uuid.uuid5(THREAD_ID_NAMESPACE, f'{user_id}:attachment:{attachment_id}')}"
+
+
+def scope_thread(user_id: str, thread: EmailThreadV1) -> EmailThreadV1:
+    """
+    The thread with its row ids, so intel and tasks derived from it reference the rows.
+    
+    Messages and attachments are rescoped with the thread: a thread whose
+    id is already its row id is returned as is.
+    """
+    thread_id = scoped_thread_id(user_id, thread.external_id)
+    if thread.thread_id == thread_id:
+        return thread
+    return thread.model_copy(update={
+        "thread_id": thread_id,
+        "messages": [
+            message.model_copy(update={"message_id": scoped_message_id(user_id, message.message_id)})
+            for message in thread.messages
+        ],
+        "attachments": [
+            attachment.model_copy(update={
+                "attachment_id": scoped_attachment_id(user_id, attachment.attachment_id),
+                "message_id": attachment.message_id and scoped_message_id(user_id, attachment.message_id),
+            })
+            for attachment in thread.attachments
+        ],
+    })
+
+
+class ThreadWriter:
+    """Writes batches of analyzed threads in one transaction."""
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_session,
+        model: str = "gemini-1.5-pro",
+        storage: FileStorage = file_storage,
+    ):
+        self._session_factory = session_factory
+        self.model = model
+        self._storage = storage
+        
+        # Counters
+        self.batches = 0
+        self.threads_written = 0
+        self.threads_deleted = 0
+        self.messages_deleted = 0
+        self.attachments_deleted = 0
+        self.statements = 0
+    
+    async def write(
+        self,
+        user_id: str,
+        results: Sequence[ThreadResult],
+        deleted_thread_ids: Sequence[str] = (),
+        removed_message_ids: Sequence[str] = (),
+        prune: bool = True,
+    ) -> None:
+        """
+        Upsert threads, messages, attachments and intel; replace pending tasks.
+        
+        ``deleted_thread_ids`` (thread row ids) and ``removed_message_ids``
+        of the user's threads are deleted in the same transaction. Pass
+        ``prune=False`` when the threads may not hold every stored message
+        (deltas merged concurrently): only the reported removals are deleted.
+        """
+        if not results and not deleted_thread_ids and not removed_message_ids:
+            return
+        now = datetime.utcnow()
+        threads, summaries, messages, attachments, tasks = [], [], [], [], []
+        for thread, intel, thread_tasks in results:
+            scoped = scope_thread(user_id, thread)
+            if scoped is not thread:
+                thread_tasks = [_rescoped(task, thread.thread_id, scoped.thread_id) for task in thread_tasks]
+                intel = intel.model_copy(update={"thread_id": scoped.thread_id})
+                thread = scoped
+            threads.append(self._thread_row(user_id, thread, intel, now))
+            summaries.append(summary_row(user_id, thread, intel))
+            messages += [_message_row(thread, message) for message in thread.messages]
+            attachments += [
+                row for row in (_attachment_row(user_id, thread, ref) for ref in thread.attachments)
+                if row["message_id"] is not None
+            ]
+            tasks += [_task_row(task) for task in thread_tasks]
+        
+        released: List[Tuple[str, str]] = []
+        async with self._session_factory() as session:
+            if threads:
+                await self._upsert(session, Thread, _dedupe(threads), ["user_id", "external_id"])
+                await self._upsert(session, ThreadSummary, _dedupe(summaries, "thread_id"), ["thread_id"])
+                await self._upsert(session, Message, _dedupe(messages), ["id"])
+                if prune:
+                    released += await self._prune(session, threads, messages)
+                # Only the provider-side fields; summaries come from attachment analysis
+                await self._upsert(
+                    session, Attachment, _dedupe(attachments), ["id"],
+                    update=["message_id", "filename", "original_filename", "mime_type", "size_bytes", "storage_path"],
+                )
+                # Pending tasks the new analysis no longer yields
+                await session.execute(
+                    delete(Task).where(
+                        Task.user_id == user_id,
+                        Task.thread_id.in_([row["id"] for row in threads]),
+                        Task.status == TaskStatus.PENDING,
+                        Task.id.notin_([row["id"] for row in tasks]),
+                    )
+                )
+                self.statements += 1
+                # Tasks the user acted on keep their status; never another user's row
+                await self._upsert(
+                    session, Task, _dedupe(tasks), ["id"],
+                    where=(Task.status == TaskStatus.PENDING) & (Task.user_id == user_id),
+                )
+            # After the upserts: a batch may refill a thread that loses messages
+            if deleted_thread_ids or removed_message_ids:
+                released += await self._delete(
+                    session, user_id, list(deleted_thread_ids), list(removed_message_ids)
+                )
+            await session.commit()
+        
+        # Only after the commit: a rolled-back delete still references its blob
+        for attachment_id, storage_path in released:
+            if storage_path:
+                await self._storage.release(storage_path, attachment_id)
+        self.batches += 1
+        self.threads_written += len(threads)
+    
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring."""
+        return {
+            "batches": self.batches,
+            "threads_written": self.threads_written,
+            "threads_deleted": self.threads_deleted,
+            "messages_deleted": self.messages_deleted,
+            "attachments_deleted": self.attachments_deleted,
+            "statements": self.statements,
+        }
+    
+    async def _delete(
+        self,
+        session: AsyncSession,
+        user_id: str,
+        thread_ids: List[str],
+        message_ids: List[str],
+    ) -> List[Tuple[str, str]]:
+        """Delete the rows; returns (attachment id, storage path) of deleted attachments."""
+        released: List[Tuple[str, str]] = []
+        owned = select(Thread.id).where(Thread.user_id == user_id)
+        if message_ids:
+            removed = select(Message.id).where(Message.id.in_(message_ids), Message.thread_id.in_(owned))
+            released += await self._delete_attachments(session, removed)
+            result = await session.execute(
+                delete(Message)
+                .where(Message.id.in_(message_ids), Message.thread_id.in_(owned))
+                .returning(Message.thread_id)
+            )
+            rows = result.all()
+            self.messages_deleted += len(rows)
+            touched = sorted({thread_id for thread_id, in rows})
+            self.statements += 2
+            if touched:
+                # Cached intel still covers the removed messages: make the cache miss
+                await session.execute(update(Thread).where(Thread.id.in_(touched)).values(intel_hash=None))
+                # Conversations left without messages are gone from the mailbox
+                result = await session.execute(
+                    select(Thread.id).where(
+                        Thread.id.in_(touched),
+                        ~exists().where(Message.thread_id == Thread.id),
+                    )
+                )
+                thread_ids += list(result.scalars())
+                self.statements += 2
+        
+        if thread_ids:
+            deleted = select(Thread.id).where(Thread.user_id == user_id, Thread.id.in_(thread_ids))
+            released += await self._delete_attachments(
+                session, select(Message.id).where(Message.thread_id.in_(deleted))
+            )
+            # Rows referencing threads without ON DELETE CASCADE
+            for model in (Task, Draft, Email, Message):
+                await session.execute(delete(model).where(model.thread_id.in_(deleted)))
+            result = await session.execute(
+                delete(Thread).where(Thread.user_id == user_id, Thread.id.in_(thread_ids)).returning(Thread.id)
+            )
+            self.threads_deleted += len(result.all())
+            self.statements += 6
+        return released
+    
+    async def _prune(self, session: AsyncSession, threads: List[dict], messages: List[dict]) -> List[Tuple[str, str]]:
+        """Delete stored messages of the batch's threads that the threads no longer have."""
+        kept: Dict[str, List[str]] = {row["id"]: [] for row in threads}
+        for row in messages:
+            kept[row["thread_id"]].append(row["id"])
+        stale = or_(*[
+            (Message.thread_id == thread_id) & Message.id.notin_(message_ids)
+            for thread_id, message_ids in kept.items()
+        ])
+        released = await self._delete_attachments(session, select(Message.id).where(stale))
+        result = await session.execute(delete(Message).where(stale).returning(Message.id))
+        self.messages_deleted += len(result.all())
+        self.statements += 2
+        return released
+    
+    async def _delete_attachments(self, session: AsyncSession, message_ids) -> List[Tuple[str, str]]:
+        result = await session.execute(
+            delete(Attachment)
+            .where(Attachment.message_id.in_(message_ids))
+            .returning(Attachment.id, Attachment.storage_path)
+        )
+        rows = [(attachment_id, storage_path) for attachment_id, storage_path in result.all()]
+        self.attachments_deleted += len(rows)
+        return rows
+    
+    async def _upsert(
+        self,
+        session: AsyncSession,
+        model,
+        rows: List[dict],
+        keys: List[str],
+        update: Sequence[str] = (),
+        where=None,
+    ) -> None:
+        """``where`` limits which conflicting rows are updated (the rest are left as they are)."""
+        if not rows:
+            return
+        for chunk in _chunks(rows, MAX_BIND_PARAMS // len(rows[0])):
+            statement = pg_insert(model).values(chunk)
+            columns = update or [c for c in chunk[0] if c not in keys and c not in ("id", "created_at")]
+            statement = statement.on_conflict_do_update(
+                index_elements=keys,
+                set_={column: statement.excluded[column] for column in columns},
+                where=where,
+            )
+            await session.execute(statement)
+            self.statements += 1
+    
+    def _thread_row(self, user_id: str, thread: EmailThreadV1, intel: ThreadIntelV1, now: datetime) -> dict:
+        return {
+            "id": thread.thread_id,
+            "user_id": user_id,
+            "external_id": thread.external_id,
+            "subject": thread.subject,
+            "participants": thread.participants,
+            "provider": thread.provider,
+            "summary": intel.summary,
+            "intent": intel.intent.value,
+            "urgency_score": intel.urgency_score,
+            "intel_json": intel.model_dump(mode="json"),
+            "intel_hash": compute_thread_hash(thread, self.model),
+            "last_email_at": thread.last_updated,
+            "last_synced_at": now,
+            "intel_generated_at": intel.processed_at,
+            "created_at": now,
+        }
+
+
+def summary_row(user_id: str, thread: EmailThreadV1, intel: ThreadIntelV1) -> dict:
+    """thread_summaries row (the inbox list projection) of an analyzed thread."""
+    return {
+        "thread_id": thread.thread_id,
+        "user_id": user_id,
+        "subject": thread.subject,
+        "summary": intel.summary,
+        "intent": intel.intent.value,
+        "urgency_score": intel.urgency_score,
+        "last_updated": thread.last_updated,
+        "has_attachments": bool(thread.attachments),
+    }
+
+
+def _message_row(thread: EmailThreadV1, message) -> dict:
+    return {
+        "id": message.message_id,
+        "thread_id": thread.thread_id,
+        "from_address": message.from_address,
+        "to_addresses": message.to_addresses,
+        "cc_addresses": message.cc_addresses,
+        "subject": message.subject,
+        "body_text": message.body_text,
+        "is_from_user": message.is_from_user,
+        "sent_at": message.sent_at,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def _attachment_row(user_id: str, thread: EmailThreadV1, ref) -> dict:
+    # Older refs carry no message link: attach to the thread's latest message
+    message_id = ref.message_id or (thread.messages[-1].message_id if thread.messages else None)
+    return {
+        "id": ref.attachment_id,
+        "message_id": message_id,
+        "user_id": user_id,
+        "filename": ref.filename,
+        "original_filename": ref.original_filename,
+        "mime_type": ref.mime_type,
+        "size_bytes": ref.size_bytes,
+        "storage_path": ref.storage_path,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def _task_row(task: TaskDTOv1) -> dict:
+    return {
+        "id": task.task_id,
+        "user_id": task.user_id,
+        "thread_id": task.thread_id,
+        "title": task.title,
+        "description": task.description,
+        "task_type": TaskType(task.task_type.value),
+        "priority": PriorityLevel(task.priority.value),
+        "priority_score": task.priority_score,
+        "priority_explanation": task.priority_explanation,
+        "effort": EffortLevel(task.effort.value),
+        "deadline": task.deadline,
+        "deadline_source": task.deadline_source,
+        "status": TaskStatus(task.status.value),
+        "created_at": task.created_at,
+        "updated_at": task.updated_at,
+    }
+
+
+def _rescoped(task: TaskDTOv1, thread_id: str, row_id: str) -> TaskDTOv1:
+    if task.thread_id != thread_id:
+        return task
+    # Ids derived from the unscoped thread id would be shared across users
+    return task.model_copy(update={"thread_id": row_id, "task_id": task_id_for(row_id, task.task_id)})
+
+
+def _dedupe(rows: List[dict], key: str = "id") -> List[dict]:
+    # ON CONFLICT DO UPDATE cannot touch the same row twice in one statement
+    return list({row[key]: row for row in rows}.values())
+
+
+def _chunks(rows: List[dict], size: int) -> Iterator[List[dict]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+# Singleton instance
+thread_writer = ThreadWriter()
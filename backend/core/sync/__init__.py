@@ -0,0 +1,18 @@
+# Sync Module
+from .pipeline import Pipeline, Stage
+from .job_queue import SyncJobQueue, InMemoryJobQueue, sync_queue
+from .runner import AccountSyncRunner, SyncProgress, run_account_sync
+from .worker import SyncWorkerPool, sync_workers
+
+__all__ = [
+    "Pipeline",
+    "Stage",
+    "SyncJobQueue",
+    "InMemoryJobQueue",
+    "sync_queue",
+    "AccountSyncRunner",
+    "SyncProgress",
+    "run_account_sync",
+    "SyncWorkerPool",
+    "sync_workers",
+]
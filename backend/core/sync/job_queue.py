@@ -0,0 +1,340 @@
+"""
+Sync Job Queue
+--------------
+Persistent queue of per-account sync jobs.
+
+Jobs live in the ``sync_jobs`` table, so any number of worker processes
+(on any node) can share the queue:
+
+- claim: ``FOR UPDATE SKIP LOCKED`` hands each job to exactly one worker
+  and leases it for ``lease_seconds``
+- heartbeat: the owning worker extends the lease and flushes progress
+- a job whose lease expires (worker crashed) is claimed again, up to
+  ``max_attempts`` times
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import and_, case, literal, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from core.storage.database import async_session
+from models.sync_job import ACTIVE_JOB_PREDICATE, SyncJob, SyncJobStatus
+
+
+ACTIVE_STATUSES = (SyncJobStatus.QUEUED, SyncJobStatus.RUNNING)
+
+
+class SyncJobQueue:
+    """Postgres-backed sync job queue with leases."""
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_session,
+        lease_seconds: int = 60,
+        max_attempts: int = 3,
+        retry_backoff_seconds: float = 30.0,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ):
+        self._session_factory = session_factory
+        self.lease = timedelta(seconds=lease_seconds)
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._clock = clock
+    
+    async def enqueue(self, user_id: str, account_id: str) -> SyncJob:
+        """
+        Queue a sync for the account.
+        
+        Returns the account's already queued/running job instead of adding
+        a second one.
+        """
+        now = self._clock()
+        statement = (
+            pg_insert(SyncJob)
+            .values(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                account_id=account_id,
+                status=SyncJobStatus.QUEUED,
+                attempts=0,
+                threads_fetched=0,
+                threads_analyzed=0,
+                tasks_created=0,
+                available_at=now,
+                created_at=now,
+            )
+            .on_conflict_do_nothing(
+                index_elements=[SyncJob.account_id],
+                index_where=text(ACTIVE_JOB_PREDICATE),
+            )
+            .returning(SyncJob)
+        )
+        async with self._session_factory() as session:
+            job = (await session.execute(statement)).scalar_one_or_none()
+            if job is None:
+                result = await session.execute(
+                    select(SyncJob).where(
+                        SyncJob.account_id == account_id,
+                        SyncJob.status.in_(ACTIVE_STATUSES),
+                    )
+                )
+                job = result.scalar_one()
+            await session.commit()
+        return job
+    
+    async def claim(self, worker_id: str) -> Optional[SyncJob]:
+        """Lease the oldest available job (or one whose lease expired)."""
+        now = self._clock()
+        async with self._session_factory() as session:
+            # Jobs that keep losing their worker are given up on
+            await session.execute(
+                update(SyncJob)
+                .where(
+                    SyncJob.status == SyncJobStatus.RUNNING,
+                    SyncJob.lease_expires_at < now,
+                    SyncJob.attempts >= self.max_attempts,
+                )
+                .values(
+                    status=SyncJobStatus.FAILED,
+                    error="Lease expired too many times",
+                    leased_by=None,
+                    finished_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            job = (await session.execute(self.claim_statement(worker_id, now))).scalar_one_or_none()
+            await session.commit()
+        return job
+    
+    def claim_statement(self, worker_id: str, now: datetime):
+        """UPDATE ... RETURNING that leases one job to ``worker_id``."""
+        candidate = (
+            select(SyncJob.id)
+            .where(
+                or_(
+                    and_(SyncJob.status == SyncJobStatus.QUEUED, SyncJob.available_at <= now),
+                    and_(SyncJob.status == SyncJobStatus.RUNNING, SyncJob.lease_expires_at < now),
+                )
+            )
+            .order_by(SyncJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        return (
+            update(SyncJob)
+            .where(SyncJob.id == candidate)
+            .values(
+                status=SyncJobStatus.RUNNING,
+                leased_by=worker_id,
+                lease_expires_at=now + self.lease,
+                heartbeat_at=now,
+                attempts=SyncJob.attempts + 1,
+                error=None,
+                started_at=now,
+            )
+            .returning(SyncJob)
+            .execution_options(synchronize_session=False)
+        )
+    
+    async def heartbeat(self, job_id: str, worker_id: str, progress: Dict[str, int]) -> bool:
+        """
+        Extend the lease and store progress counters.
+        
+        Returns:
+            False if the worker no longer holds the lease (stop working)
+        """
+        now = self._clock()
+        return await self._update_owned(
+            job_id,
+            worker_id,
+            lease_expires_at=now + self.lease,
+            heartbeat_at=now,
+            **progress,
+        )
+    
+    async def complete(self, job_id: str, worker_id: str, progress: Dict[str, int]) -> bool:
+        """Mark the job succeeded with its final counters."""
+        return await self._update_owned(
+            job_id,
+            worker_id,
+            status=SyncJobStatus.SUCCEEDED,
+            leased_by=None,
+            lease_expires_at=None,
+            finished_at=self._clock(),
+            **progress,
+        )
+    
+    async def fail(self, job_id: str, worker_id: str, error: str, progress: Dict[str, int]) -> bool:
+        """Requeue the job with backoff, or mark it failed once out of attempts."""
+        now = self._clock()
+        out_of_attempts = SyncJob.attempts >= self.max_attempts
+        return await self._update_owned(
+            job_id,
+            worker_id,
+            status=case(
+                (out_of_attempts, literal(SyncJobStatus.FAILED, SyncJob.status.type)),
+                else_=literal(SyncJobStatus.QUEUED, SyncJob.status.type),
+            ),
+            available_at=now + timedelta(seconds=self.retry_backoff_seconds),
+            finished_at=case((out_of_attempts, now), else_=None),
+            leased_by=None,
+            lease_expires_at=None,
+            error=error[:2000],
+            **progress,
+        )
+    
+    async def jobs_for_user(self, user_id: str, limit: int = 20) -> List[SyncJob]:
+        """Most recent jobs for the user's accounts, newest first."""
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(SyncJob)
+                .where(SyncJob.user_id == user_id)
+                .order_by(SyncJob.created_at.desc())
+                .limit(limit)
+            )
+            return list(result.scalars())
+    
+    async def _update_owned(self, job_id: str, worker_id: str, **values) -> bool:
+        async with self._session_factory() as session:
+            result = await session.execute(
+                update(SyncJob)
+                .where(
+                    SyncJob.id == job_id,
+                    SyncJob.leased_by == worker_id,
+                    SyncJob.status == SyncJobStatus.RUNNING,
+                )
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        return result.rowcount == 1
+
+
+class InMemoryJobQueue:
+    """
+    Single-process queue with the same interface as SyncJobQueue.
+    
+    For development without Postgres and for tests.
+    """
+    
+    def __init__(
+        self,
+        lease_seconds: int = 60,
+        max_attempts: int = 3,
+        retry_backoff_seconds: float = 30.0,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ):
+        self.lease = timedelta(seconds=lease_seconds)
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._clock = clock
+        self.jobs: Dict[str, SyncJob] = {}
+    
+    async def enqueue(self, user_id: str, account_id: str) -> SyncJob:
+        for job in self.jobs.values():
+            if job.account_id == account_id and job.status in ACTIVE_STATUSES:
+                return job
+        now = self._clock()
+        job = SyncJob(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            account_id=account_id,
+            status=SyncJobStatus.QUEUED,
+            attempts=0,
+            threads_fetched=0,
+            threads_analyzed=0,
+            tasks_created=0,
+            available_at=now,
+            created_at=now,
+        )
+        self.jobs[job.id] = job
+        return job
+    
+    async def claim(self, worker_id: str) -> Optional[SyncJob]:
+        now = self._clock()
+        for job in sorted(self.jobs.values(), key=lambda j: j.created_at):
+            expired = job.status == SyncJobStatus.RUNNING and job.lease_expires_at < now
+            if expired and job.attempts >= self.max_attempts:
+                job.status = SyncJobStatus.FAILED
+                job.error = "Lease expired too many times"
+                job.leased_by = None
+                job.finished_at = now
+                continue
+            available = job.status == SyncJobStatus.QUEUED and job.available_at <= now
+            if available or expired:
+                job.status = SyncJobStatus.RUNNING
+                job.leased_by = worker_id
+                job.lease_expires_at = now + self.lease
+                job.heartbeat_at = now
+                job.attempts += 1
+                job.error = None
+                job.started_at = now
+                return job
+        return None
+    
+    async def heartbeat(self, job_id: str, worker_id: str, progress: Dict[str, int]) -> bool:
+        job = self._owned(job_id, worker_id)
+        if job is None:
+            return False
+        now = self._clock()
+        job.lease_expires_at = now + self.lease
+        job.heartbeat_at = now
+        _apply(job, progress)
+        return True
+    
+    async def complete(self, job_id: str, worker_id: str, progress: Dict[str, int]) -> bool:
+        job = self._owned(job_id, worker_id)
+        if job is None:
+            return False
+        job.status = SyncJobStatus.SUCCEEDED
+        job.leased_by = None
+        job.lease_expires_at = None
+        job.finished_at = self._clock()
+        _apply(job, progress)
+        return True
+    
+    async def fail(self, job_id: str, worker_id: str, error: str, progress: Dict[str, int]) -> bool:
+        job = self._owned(job_id, worker_id)
+        if job is None:
+            return False
+        now = self._clock()
+        if job.attempts >= self.max_attempts:
+            job.status = SyncJobStatus.FAILED
+            job.finished_at = now
+        else:
+            job.status = SyncJobStatus.QUEUED
+            job.available_at = now + timedelta(seconds=self.retry_backoff_seconds)
+        job.leased_by = None
+        job.lease_expires_at = None
+        job.error = error[:2000]
+        _apply(job, progress)
+        return True
+    
+    async def jobs_for_user(self, user_id: str, limit: int = 20) -> List[SyncJob]:
+        jobs = [j for j in self.jobs.values() if j.user_id == user_id]
+        return sorted(jobs, key=lambda j: j.created_at, reverse=True)[:limit]
+    
+    def _owned(self, job_id: str, worker_id: str) -> Optional[SyncJob]:
+        job = self.jobs.get(job_id)
+        if job is None or job.leased_by != worker_id or job.status != SyncJobStatus.RUNNING:
+            return None
+        return job
+
+
+def _apply(job: SyncJob, progress: Dict[str, int]) -> None:
+    for name, value in progress.items():
+        setattr(job, name, value)
+
+
+# Singleton instance
+sync_queue = SyncJobQueue(
+    lease_seconds=settings.SYNC_LEASE_SECONDS,
+    max_attempts=settings.SYNC_MAX_ATTEMPTS,
+    retry_backoff_seconds=settings.SYNC_RETRY_BACKOFF_SECONDS,
+)
@@ -0,0 +1,185 @@
+"""
+Stage Pipeline
+--------------
+In-process pipeline with bounded queues between stages.
+    
+    source ──▶ [queue] ──▶ stage 1 (N workers) ──▶ [queue] ──▶ stage 2 ...
+
+- Every stage runs concurrently with the others, with its own worker count
+- Queues are bounded: when a slow stage (e.g. LLM analysis) falls behind,
+  upstream workers block on ``put`` and the source stops being pulled, so
+  memory holds at most ``queue_size`` items per stage
+- Per-stage queue depth, latency, and time blocked downstream / starved
+  upstream are reported by ``stats()``
+- The first failure cancels the whole run and is re-raised
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+
+# End-of-stream marker passed down the queues
+_DONE = object()
+
+
+class Stage:
+    """
+    A named pipeline step: ``handler(item) -> next item`` (None drops it).
+    
+    With ``batch_size`` > 1 the handler receives a list of the items
+    already waiting (up to batch_size) instead of one item.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Any]],
+        concurrency: int = 1,
+        queue_size: int = 16,
+        batch_size: int = 1,
+    ):
+        self.name = name
+        self.handler = handler
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        
+        # Counters
+        self.processed = 0
+        self.in_flight = 0
+        self.latency_ms_total = 0.0
+        self.latency_ms_max = 0.0
+        self.starved_ms = 0.0
+        self.blocked_ms = 0.0
+    
+    def stats(self, queue: Optional[asyncio.Queue]) -> dict:
+        return {
+            "queue_depth": queue.qsize() if queue is not None else 0,
+            "queue_size": self.queue_size,
+            "workers": self.concurrency,
+            "in_flight": self.in_flight,
+            "processed": self.processed,
+            "latency_ms_avg": self.latency_ms_total / self.processed if self.processed else 0.0,
+            "latency_ms_max": self.latency_ms_max,
+            # Waiting for input (upstream is the bottleneck)
+            "starved_ms": self.starved_ms,
+            # Waiting for room downstream (backpressure from a slower stage)
+            "blocked_ms": self.blocked_ms,
+        }
+
+
+class Pipeline:
+    """Runs items from an async source through a chain of stages."""
+    
+    def __init__(self, source: AsyncIterator[Any], stages: List[Stage], source_name: str = "source"):
+        self.source = source
+        self.source_name = source_name
+        self.stages = stages
+        self._queues: List[Optional[asyncio.Queue]] = [None] * len(stages)
+        
+        # Counters
+        self.produced = 0
+        self.source_ms = 0.0
+        self.source_blocked_ms = 0.0
+    
+    async def run(self) -> None:
+        """Drain the source through every stage; returns once all items are done."""
+        self._queues = [asyncio.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        tasks = [asyncio.create_task(self._produce())]
+        for index, stage in enumerate(self.stages):
+            finished = [0]
+            tasks += [
+                asyncio.create_task(self._work(index, stage, finished))
+                for _ in range(stage.concurrency)
+            ]
+        
+        try:
+            # Fail fast: the first exception cancels every other task
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Lets a generator source cancel its own in-flight fetches
+            if hasattr(self.source, "aclose"):
+                await self.source.aclose()
+    
+    def stats(self) -> Dict[str, dict]:
+        """Throughput, latency and queue depth per stage."""
+        report = {
+            self.source_name: {
+                "produced": self.produced,
+                "latency_ms_avg": self.source_ms / self.produced if self.produced else 0.0,
+                "blocked_ms": self.source_blocked_ms,
+            },
+        }
+        for stage, queue in zip(self.stages, self._queues):
+            report[stage.name] = stage.stats(queue)
+        return report
+    
+    async def _produce(self) -> None:
+        first = self._queues[0]
+        started = time.perf_counter()
+        async for item in self.source:
+            self.produced += 1
+            self.source_ms += _elapsed_ms(started)
+            started = time.perf_counter()
+            await first.put(item)
+            self.source_blocked_ms += _elapsed_ms(started)
+            started = time.perf_counter()
+        for _ in range(self.stages[0].concurrency):
+            await first.put(_DONE)
+    
+    async def _work(self, index: int, stage: Stage, finished: List[int]) -> None:
+        inbox = self._queues[index]
+        outbox = self._queues[index + 1] if index + 1 < len(self.stages) else None
+        
+        done = False
+        while not done:
+            started = time.perf_counter()
+            item = await inbox.get()
+            stage.starved_ms += _elapsed_ms(started)
+            if item is _DONE:
+                break
+            
+            count = 1
+            if stage.batch_size > 1:
+                # Take whatever else is already queued, without waiting
+                item = [item]
+                while len(item) < stage.batch_size and not inbox.empty():
+                    extra = inbox.get_nowait()
+                    if extra is _DONE:
+                        done = True
+                        break
+                    item.append(extra)
+                count = len(item)
+            
+            stage.in_flight += count
+            started = time.perf_counter()
+            try:
+                result = await stage.handler(item)
+            finally:
+                stage.in_flight -= count
+            latency = _elapsed_ms(started)
+            stage.processed += count
+            stage.latency_ms_total += latency * count
+            stage.latency_ms_max = max(stage.latency_ms_max, latency)
+            
+            if outbox is not None and result is not None:
+                started = time.perf_counter()
+                await outbox.put(result)
+                stage.blocked_ms += _elapsed_ms(started)
+        
+        # The last worker of a stage closes the next stage's input
+        finished[0] += 1
+        if outbox is not None and finished[0] == stage.concurrency:
+            for _ in range(self.stages[index + 1].concurrency):
+                await outbox.put(_DONE)
+
+
+def _elapsed_ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
@@ -0,0 +1,340 @@
+"""
+Account Sync Runner
+-------------------
+One sync job: fetch → analyze → task generation for a connected account.
+
+Fetches threads changed since the account's cursor, runs each through
+the Intelligence layer (via the intel cache, so unchanged threads are not
+re-analyzed), generates tasks, bulk-stores the results and finally
+saves the new cursor. The steps run as a pipeline: while one thread is
+being analyzed the next ones are fetched and earlier ones stored, with
+bounded queues in between so a slow LLM stage throttles fetching.
+
+Outlook deltas hold only the changed messages of a conversation. They are
+merged with the stored thread first, and the stored intel is rolled forward
+with update_thread_intel; analyzing a delta on its own would overwrite the
+thread's summary and tasks with ones covering a few messages. Threads and
+messages the provider reports deleted are removed in the same transaction
+as a store batch. A full resync reports no deletions: once it has listed
+the whole mailbox, stored rows it did not list are deleted.
+"""
+
+from contextlib import aclosing
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from contracts import EmailMessage, EmailThreadV1, ThreadIntelV1
+from core.auth import TokenManager, token_manager
+from core.ingestion import (
+    GmailClient,
+    GmailHistorySync,
+    OutlookClient,
+    OutlookDeltaSync,
+    SyncCursorStore,
+)
+from core.intelligence import IntelCache, intel_cache, update_thread_intel
+from core.storage.database import async_session
+from core.storage.thread_reader import load_threads
+from core.storage.thread_writer import (
+    ThreadResult,
+    ThreadWriter,
+    scope_thread,
+    scoped_message_id,
+    scoped_thread_id,
+)
+from core.workflow import generate_tasks
+from models.connected_account import ConnectedAccount
+from models.sync_job import SyncJob
+from models.thread import Message, Thread
+from models.user import User
+from .pipeline import Pipeline, Stage
+
+
+class SyncProgress:
+    """Live progress counters of one sync job."""
+    
+    def __init__(self):
+        self.threads_fetched = 0
+        self.threads_analyzed = 0
+        self.tasks_created = 0
+        # Set while the job's pipeline runs (per-stage metrics)
+        self.pipeline: Optional[Pipeline] = None
+    
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "threads_fetched": self.threads_fetched,
+            "threads_analyzed": self.threads_analyzed,
+            "tasks_created": self.tasks_created,
+        }
+
+
+class SyncDeletions:
+    """
+    Deletions reported by a sync run (GmailHistorySync / OutlookDeltaSync), as row ids.
+    
+    The provider lists grow while the run fetches; ``take()`` hands out
+    each id once, so deletions are written with whichever store batch
+    comes next. During a full resync the fetched rows are recorded
+    (``seen``) so ``finish()`` can tell which stored ones are gone.
+    """
+    
+    def __init__(self, user_id: str, sync):
+        self.user_id = user_id
+        self.sync = sync
+        self._threads_taken = 0
+        self._messages_taken = 0
+        self._seen_threads: Set[str] = set()
+        self._seen_messages: Set[str] = set()
+    
+    def seen(self, thread: EmailThreadV1) -> None:
+        """Record a fetched thread (row ids, as scope_thread returns it)."""
+        if self.sync.full_resync:
+            self._seen_threads.add(thread.thread_id)
+            self._seen_messages.update(message.message_id for message in thread.messages)
+    
+    def removed_message_ids(self) -> Set[str]:
+        """Every removed message so far (taken or not)."""
+        return {self._message_id(message_id) for message_id in self.sync.removed_message_ids}
+    
+    def take(self) -> Tuple[List[str], List[str]]:
+        """(deleted thread ids, removed message ids) not handed out before."""
+        threads = self.sync.deleted_thread_ids[self._threads_taken:]
+        messages = self.sync.removed_message_ids[self._messages_taken:]
+        self._threads_taken += len(threads)
+        self._messages_taken += len(messages)
+        return (
+            [scoped_thread_id(self.user_id, external_id) for external_id in threads],
+            [self._message_id(message_id) for message_id in messages],
+        )
+    
+    def finish(
+        self,
+        stored_thread_ids: Sequence[str] = (),
+        stored_message_ids: Sequence[str] = (),
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Deletions for the run's last write, once every thread was fetched.
+        
+        Besides those not handed out yet: after a full resync, the stored
+        rows it did not list (deleted while the cursor was stale); for a
+        partial sync, every removed message again, as a delta analyzed
+        before its removal was reported may have been stored after it.
+        """
+        threads, messages = self.take()
+        if self.sync.partial:
+            messages = sorted(self.removed_message_ids())
+        if self.sync.full_resync:
+            threads += [thread_id for thread_id in stored_thread_ids if thread_id not in self._seen_threads]
+            messages += [
+                message_id for message_id in stored_message_ids if message_id not in self._seen_messages
+            ]
+        return threads, messages
+    
+    def _message_id(self, provider_id: str) -> str:
+        # Row ids as scope_thread builds them from normalize_email_thread's
+        return scoped_message_id(self.user_id, f"msg-{provider_id}")
+
+
+class AccountSyncRunner:
+    """Runs sync jobs; call with (job, progress)."""
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_session,
+        tokens: TokenManager = token_manager,
+        writer: Optional[ThreadWriter] = None,
+        cache: IntelCache = intel_cache,
+        model: str = "gemini-1.5-pro",
+    ):
+        self._session_factory = session_factory
+        self._tokens = tokens
+        self._writer = writer or ThreadWriter(session_factory, model)
+        self._cache = cache
+        self._cursors = SyncCursorStore(session_factory)
+        self.model = model
+    
+    async def __call__(self, job: SyncJob, progress: SyncProgress) -> None:
+        provider, user_email = await self._account(job.account_id)
+        access_token = await self._tokens.get_access_token(job.account_id)
+        cursor = await self._cursors.get(job.account_id)
+        
+        if provider == "gmail":
+            client = GmailClient(access_token, account_id=job.account_id)
+            sync = GmailHistorySync(client, cursor)
+        else:
+            client = OutlookClient(access_token, account_id=job.account_id)
+            sync = OutlookDeltaSync(client, cursor, user_email=user_email)
+        
+        deletions = SyncDeletions(job.user_id, sync)
+        async with client:
+            progress.pipeline = self.pipeline(job.user_id, sync.changed_threads(), progress, deletions)
+            await progress.pipeline.run()
+        
+        # Deletions reported after the last batch was stored, and after a
+        # full resync whatever the mailbox no longer has
+        stored = ((), ())
+        if sync.full_resync:
+            stored = await self._stored_ids(job.user_id, provider, messages=sync.partial)
+        await self.store(job.user_id, [], *deletions.finish(*stored))
+        await self._cursors.save(job.account_id, sync.cursor)
+    
+    def pipeline(
+        self,
+        user_id: str,
+        threads: AsyncIterator[EmailThreadV1],
+        progress: SyncProgress,
+        deletions: Optional[SyncDeletions] = None,
+    ) -> Pipeline:
+        """fetch → analyze → tasks → store, connected by bounded queues."""
+        async def fetched() -> AsyncIterator[EmailThreadV1]:
+            async with aclosing(threads):
+                async for thread in threads:
+                    progress.threads_fetched += 1
+                    # Row id before analysis: intel and tasks reference it
+                    thread = scope_thread(user_id, thread)
+                    if deletions is not None:
+                        deletions.seen(thread)
+                    yield thread
+        
+        async def analyze(thread: EmailThreadV1) -> Tuple[EmailThreadV1, ThreadIntelV1]:
+            if deletions is not None and deletions.sync.partial:
+                thread, intel = await self.analyze_delta(user_id, thread, deletions.removed_message_ids())
+            else:
+                # The writer stores intel and its hash with the thread
+                intel = await self._cache.get_or_analyze(thread, self.model, persist=False)
+            progress.threads_analyzed += 1
+            return thread, intel
+        
+        async def tasks(item: Tuple[EmailThreadV1, ThreadIntelV1]):
+            thread, intel = item
+            # generate_tasks scores each task with calculate_priority
+            return thread, intel, await generate_tasks(intel, user_id)
+        
+        async def store(batch: List[ThreadResult]) -> None:
+            if deletions is None:
+                await self.store(user_id, batch)
+            else:
+                # Merged deltas of one conversation may be stored out of order:
+                # a stored message missing from one is not a deletion
+                await self.store(user_id, batch, *deletions.take(), prune=not deletions.sync.partial)
+            progress.tasks_created += sum(len(new_tasks) for _, _, new_tasks in batch)
+        
+        queue_size = settings.PIPELINE_QUEUE_SIZE
+        return Pipeline(
+            fetched(),
+            [
+                Stage("analyze", analyze, settings.PIPELINE_ANALYZE_CONCURRENCY, queue_size),
+                Stage("tasks", tasks, settings.PIPELINE_TASK_CONCURRENCY, queue_size),
+                Stage(
+                    "store", store, settings.PIPELINE_STORE_CONCURRENCY, queue_size,
+                    batch_size=settings.PIPELINE_STORE_BATCH_SIZE,
+                ),
+            ],
+            source_name="fetch",
+        )
+    
+    async def analyze_delta(
+        self,
+        user_id: str,
+        delta: EmailThreadV1,
+        removed_message_ids: Set[str] = frozenset(),
+    ) -> Tuple[EmailThreadV1, ThreadIntelV1]:
+        """Intel for the whole conversation a delta belongs to, and that conversation."""
+        async with self._session_factory() as session:
+            stored = (await load_threads(session, user_id, [delta.thread_id])).get(delta.thread_id)
+        if stored is None:
+            # First sight of the conversation: the delta is all of it
+            return delta, await self._cache.get_or_analyze(delta, self.model, persist=False)
+        
+        thread, new_messages = merge_delta(stored.thread, delta, removed_message_ids)
+        if stored.intel is None:
+            return thread, await self._cache.get_or_analyze(thread, self.model, persist=False)
+        
+        intel = await self._cache.get(thread, self.model)
+        if intel is None:
+            # Only the new messages are analyzed; the summary rolls forward
+            intel = await update_thread_intel(thread, stored.intel, new_messages, self.model)
+            if not intel.degraded_stages:
+                await self._cache.put(thread, self.model, intel, persist=False)
+        return thread, intel
+    
+    async def store(
+        self,
+        user_id: str,
+        results: List[ThreadResult],
+        deleted_thread_ids: List[str] = (),
+        removed_message_ids: List[str] = (),
+        prune: bool = True,
+    ) -> None:
+        """Persist a batch of analyzed threads and pending deletions (one transaction)."""
+        await self._writer.write(user_id, results, deleted_thread_ids, removed_message_ids, prune=prune)
+    
+    async def _stored_ids(self, user_id: str, provider: str, messages: bool) -> Tuple[List[str], List[str]]:
+        """Row ids of the user's stored threads from ``provider`` (and their messages if ``messages``)."""
+        owned = (Thread.user_id == user_id) & (Thread.provider == provider)
+        async with self._session_factory() as session:
+            thread_ids = list((await session.execute(select(Thread.id).where(owned))).scalars())
+            message_ids = []
+            if messages:
+                result = await session.execute(
+                    select(Message.id).join(Thread, Thread.id == Message.thread_id).where(owned)
+                )
+                message_ids = list(result.scalars())
+        return thread_ids, message_ids
+    
+    async def _account(self, account_id: str):
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(ConnectedAccount.provider, User.email)
+                .join(User, User.id == ConnectedAccount.user_id)
+                .where(ConnectedAccount.id == account_id)
+            )
+            row = result.first()
+        if row is None:
+            raise LookupError(f"Unknown connected account: {account_id}")
+        return getattr(row.provider, "value", row.provider), row.email
+
+
+def merge_delta(
+    stored: EmailThreadV1,
+    delta: EmailThreadV1,
+    removed_message_ids: Set[str] = frozenset(),
+) -> Tuple[EmailThreadV1, List[EmailMessage]]:
+    """
+    The conversation after applying a delta to its stored version.
+    
+    Returns:
+        (whole thread, the delta's messages that were not stored before)
+    """
+    changed = {message.message_id for message in delta.messages}
+    known = {message.message_id for message in stored.messages}
+    messages = sorted(
+        [
+            message for message in stored.messages
+            if message.message_id not in changed and message.message_id not in removed_message_ids
+        ] + list(delta.messages),
+        key=lambda message: message.sent_at,
+    )
+    
+    kept = {message.message_id for message in messages}
+    delta_attachments = {attachment.attachment_id for attachment in delta.attachments}
+    attachments = [
+        attachment for attachment in stored.attachments
+        if attachment.message_id in kept and attachment.attachment_id not in delta_attachments
+    ] + list(delta.attachments)
+    
+    thread = delta.model_copy(update={
+        "subject": stored.subject or delta.subject,
+        "participants": list(dict.fromkeys(stored.participants + delta.participants)),
+        "messages": messages,
+        "attachments": attachments,
+        "last_updated": max(stored.last_updated, delta.last_updated),
+    })
+    return thread, [message for message in delta.messages if message.message_id not in known]
+
+
+# Singleton instance
+run_account_sync = AccountSyncRunner()
@@ -0,0 +1,169 @@
+"""
+Sync Worker Pool
+----------------
+Async workers that drain the sync job queue.
+
+Each worker claims a job, runs it (fetch → analyze → task generation) and
+heartbeats while it runs: the heartbeat extends the lease and flushes the
+job's progress counters, which back the sync status endpoint. A worker
+that loses its lease stops the job, since another worker has taken it.
+
+Run more pools (``python -m core.sync.worker``) to scale sync across nodes.
+"""
+
+import asyncio
+import os
+import socket
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.config import settings
+from models.sync_job import SyncJob
+from .job_queue import SyncJobQueue, sync_queue
+from .runner import SyncProgress, run_account_sync
+
+
+JobRunner = Callable[[SyncJob, SyncProgress], Awaitable[None]]
+
+
+class SyncWorkerPool:
+    """A fixed number of async workers sharing one job queue."""
+    
+    def __init__(
+        self,
+        queue: SyncJobQueue,
+        run_job: JobRunner = run_account_sync,
+        size: int = 4,
+        heartbeat_seconds: float = 15.0,
+        poll_seconds: float = 2.0,
+        node_id: Optional[str] = None,
+    ):
+        self.queue = queue
+        self.run_job = run_job
+        self.size = size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_seconds = poll_seconds
+        self.node_id = node_id or f"{socket.gethostname()}-{os.getpid()}"
+        self._workers: List[asyncio.Task] = []
+        self._active: Dict[str, SyncProgress] = {}
+        
+        # Counters
+        self.jobs_succeeded = 0
+        self.jobs_failed = 0
+        self.leases_lost = 0
+        self.queue_errors = 0
+    
+    def start(self) -> None:
+        """Start the workers (called from the app lifespan)."""
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._work(f"{self.node_id}/{n}"))
+                for n in range(self.size)
+            ]
+    
+    async def stop(self) -> None:
+        """Stop the workers; jobs in flight go back to the queue."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+    
+    def progress(self, job_id: str) -> Optional[SyncProgress]:
+        """Live counters of a job running in this pool (fresher than the DB)."""
+        return self._active.get(job_id)
+    
+    def stats(self) -> dict:
+        """Counters for monitoring."""
+        return {
+            "workers": len(self._workers),
+            "jobs_running": len(self._active),
+            "jobs_succeeded": self.jobs_succeeded,
+            "jobs_failed": self.jobs_failed,
+            "leases_lost": self.leases_lost,
+            "queue_errors": self.queue_errors,
+            "pipelines": {
+                job_id: progress.pipeline.stats()
+                for job_id, progress in self._active.items()
+                if progress.pipeline is not None
+            },
+        }
+    
+    async def _work(self, worker_id: str) -> None:
+        while True:
+            try:
+                job = await self.queue.claim(worker_id)
+            except Exception:
+                # Database unavailable: keep polling
+                self.queue_errors += 1
+                job = None
+            if job is None:
+                await asyncio.sleep(self.poll_seconds)
+                continue
+            await self._run(job, worker_id)
+    
+    async def _run(self, job: SyncJob, worker_id: str) -> None:
+        progress = SyncProgress()
+        self._active[job.id] = progress
+        task = asyncio.create_task(self.run_job(job, progress))
+        try:
+            while not task.done():
+                await asyncio.wait({task}, timeout=self.heartbeat_seconds)
+                if task.done():
+                    break
+                if not await self._heartbeat(job, worker_id, progress):
+                    # Lease expired and the job was re-claimed elsewhere
+                    self.leases_lost += 1
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                    return
+            
+            error = task.exception()
+            if error is None:
+                await self.queue.complete(job.id, worker_id, progress.as_dict())
+                self.jobs_succeeded += 1
+            else:
+                await self.queue.fail(job.id, worker_id, repr(error), progress.as_dict())
+                self.jobs_failed += 1
+        except asyncio.CancelledError:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await self.queue.fail(job.id, worker_id, "Worker stopped", progress.as_dict())
+            raise
+        finally:
+            self._active.pop(job.id, None)
+    
+    async def _heartbeat(self, job: SyncJob, worker_id: str, progress: SyncProgress) -> bool:
+        try:
+            return await self.queue.heartbeat(job.id, worker_id, progress.as_dict())
+        except Exception:
+            # Transient queue error: keep working, the next beat may land
+            self.queue_errors += 1
+            return True
+
+
+# Singleton instance
+sync_workers = SyncWorkerPool(
+    sync_queue,
+    size=settings.SYNC_WORKERS,
+    heartbeat_seconds=settings.SYNC_HEARTBEAT_SECONDS,
+    poll_seconds=settings.SYNC_POLL_SECONDS,
+)
+
+
+async def main() -> None:
+    """Run a standalone worker node until interrupted."""
+    from core.auth import token_manager
+    from core.network import http_pool
+    
+    await http_pool.start()
+    token_manager.start(settings.TOKEN_RENEWAL_INTERVAL_SECONDS)
+    sync_workers.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await sync_workers.stop()
+        await token_manager.stop()
+        await http_pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
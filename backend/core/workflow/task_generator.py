@@ -23,6 +23,20 @@ from contracts import (
 from .priority_engine import calculate_priority
 
 
+# uuid5 namespace of task ids
+TASK_ID_NAMESPACE = uuid.UUID("3b8e5f0a-6c2d-5a1e-8f4b-9d7c0e2a4b6f")
+
+
+def task_id_for(thread_id: str, key: str) -> str:
+    """
+    Id of a thread's task, stable across re-analysis.
+    
+    The writer replaces a thread's pending tasks on every sync; a stable id
+    lets it recognise tasks the user already completed or dismissed.
+    """
+    return f"task-{uuid.uuid5(TASK_ID_NAMESPACE, f'{thread_id}:{key}')}"
+
+
 async def generate_tasks(
     intel: ThreadIntelV1,
     user_id: str,
@@ -48,7 +62,7 @@ async def generate_tasks(
         deadline = _get_deadline(intel)
         
         task = TaskDTOv1(
-            task_id=f"task-{uuid.uuid4().hex[:8]}",
+            task_id=task_id_for(intel.thread_id, task_type.value),
             thread_id=intel.thread_id,
             user_id=user_id,
             title=_generate_title(intel),
@@ -128,7 +142,7 @@ def _get_deadline(intel: ThreadIntelV1) -> datetime:
 def _create_review_task(intel: ThreadIntelV1, user_id: str, attachment) -> TaskDTOv1:
     """Create a task to review an important attachment."""
     return TaskDTOv1(
-        task_id=f"task-{uuid.uuid4().hex[:8]}",
+        task_id=task_id_for(intel.thread_id, f"review:{attachment.attachment_id}"),
         thread_id=intel.thread_id,
         user_id=user_id,
         title=f"Review: {attachment.document_type.title()}",
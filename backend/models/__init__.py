@@ -1,7 +1,7 @@
-# Models Package - All 13 tables from database_schema.md
+# Models Package - All 15 tables from database_schema.md
 from .user import User, EmailProvider
 from .task import Task, TaskType, TaskStatus, PriorityLevel, EffortLevel
-from .thread import Thread, Message
+from .thread import Thread, ThreadSummary, Message
 from .email import Email
 from .attachment import Attachment
 from .draft import Draft, ToneType
@@ -11,6 +11,7 @@ from .waiting_for import WaitingFor
 from .reminder import Reminder
 from .vip_domain import VIPDomain
 from .calendar_suggestion import CalendarSuggestion
+from .sync_job import SyncJob, SyncJobStatus
 
 __all__ = [
     # Users & Auth
@@ -20,6 +21,7 @@ __all__ = [
     "ProviderType",
     # Threads & Emails
     "Thread",
+    "ThreadSummary",
     "Message",
     "Email",
     "Attachment",
@@ -37,5 +39,8 @@ __all__ = [
     "Reminder",
     "VIPDomain",
     "CalendarSuggestion",
+    # Sync
+    "SyncJob",
+    "SyncJobStatus",
 ]
 
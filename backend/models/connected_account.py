@@ -33,6 +33,7 @@ class ConnectedAccount(Base):
     
     # Sync tracking
     last_sync_at = Column(DateTime)
+    sync_cursor = Column(String)  # Provider change cursor (Gmail historyId / Graph deltaLink)
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
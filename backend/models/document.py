@@ -21,8 +21,8 @@ class Document(Base):
     # Vector index reference
     vector_index_id = Column(String, nullable=False)
     
-    # Metadata for filtering
-    metadata = Column(JSONB, default={})
+    # Metadata for filtering ("metadata" is reserved on declarative models)
+    metadata_ = Column("metadata", JSONB, default={})
     
     # Timestamps
     indexed_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,64 @@
+"""
+Sync Job Model
+--------------
+SQLAlchemy model for the persistent sync job queue.
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Integer, Text, ForeignKey, Enum, Index, text
+import enum
+
+from core.storage import Base
+
+
+class SyncJobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+# Predicate of the one-active-job-per-account index (also the ON CONFLICT target)
+ACTIVE_JOB_PREDICATE = "status IN ('QUEUED', 'RUNNING')"
+
+
+class SyncJob(Base):
+    """One sync run for a connected account, leased by a worker."""
+    __tablename__ = "sync_jobs"
+    
+    id = Column(String, primary_key=True)
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    account_id = Column(String, ForeignKey("connected_accounts.id", ondelete="CASCADE"), nullable=False)
+    
+    # Queue state
+    status = Column(Enum(SyncJobStatus), nullable=False, default=SyncJobStatus.QUEUED)
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    available_at = Column(DateTime)  # Not claimed before this (retry backoff)
+    
+    # Lease (extended by worker heartbeats; expired leases are re-claimed)
+    leased_by = Column(String)
+    lease_expires_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+    
+    # Progress counters (flushed on each heartbeat)
+    threads_fetched = Column(Integer, nullable=False, default=0)
+    threads_analyzed = Column(Integer, nullable=False, default=0)
+    tasks_created = Column(Integer, nullable=False, default=0)
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    
+    __table_args__ = (
+        # Claim order
+        Index("idx_sync_jobs_status_created", "status", "created_at"),
+        # At most one queued/running job per account
+        Index(
+            "uq_sync_jobs_active_account",
+            "account_id",
+            unique=True,
+            postgresql_where=text(ACTIVE_JOB_PREDICATE),
+        ),
+    )
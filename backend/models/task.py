@@ -5,7 +5,7 @@ SQLAlchemy model for tasks table.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Integer, Text, ForeignKey, Enum
+from sqlalchemy import Column, String, DateTime, Integer, Text, ForeignKey, Enum, Index
 import enum
 
 from core.storage import Base
@@ -50,7 +50,7 @@ class Task(Base):
     
     # Priority
     priority = Column(Enum(PriorityLevel), default=PriorityLevel.CAN_WAIT)
-    priority_score = Column(Integer, default=0)
+    priority_score = Column(Integer, nullable=False, default=0, server_default="0")  # keyset sort key: never NULL
     priority_explanation = Column(Text)
     
     # Effort
@@ -66,3 +66,10 @@ class Task(Base):
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        # Task list: by status, highest priority first (keyset pagination on priority_score, id)
+        Index('idx_tasks_user_status_priority', 'user_id', 'status', priority_score.desc(), id.desc()),
+        # Task list without a status filter
+        Index('idx_tasks_user_priority', 'user_id', priority_score.desc(), id.desc()),
+    )
@@ -5,7 +5,7 @@ SQLAlchemy model for email threads.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Integer, Text, ForeignKey
+from sqlalchemy import Column, String, DateTime, Integer, Text, Boolean, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB, ARRAY
 
 from core.storage import Base
@@ -28,12 +28,46 @@ class Thread(Base):
     intent = Column(String)
     urgency_score = Column(Integer)
     intel_json = Column(JSONB)  # Full ThreadIntelV1 cache
+    intel_hash = Column(String(64))  # Content hash intel_json was generated from
     
     # Timestamps
     last_email_at = Column(DateTime)
     last_synced_at = Column(DateTime)
     intel_generated_at = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # Upsert key for sync
+        UniqueConstraint('user_id', 'external_id', name='unique_user_thread'),
+        # Inbox list: newest first per user (keyset pagination on last_email_at, id)
+        Index('idx_threads_user_last_email', 'user_id', last_email_at.desc(), id.desc()),
+    )
+
+
+class ThreadSummary(Base):
+    """
+    Inbox list projection of a thread, one narrow row per thread.
+    
+    Maintained by the thread writer in the same transaction as the thread,
+    so the list endpoint never loads intel_json or counts attachments.
+    """
+    __tablename__ = "thread_summaries"
+    
+    thread_id = Column(String, ForeignKey("threads.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    
+    # ThreadListItem fields
+    subject = Column(String)
+    summary = Column(Text)
+    intent = Column(String)
+    urgency_score = Column(Integer)
+    last_updated = Column(DateTime, nullable=False)
+    has_attachments = Column(Boolean, nullable=False, default=False)
+    
+    __table_args__ = (
+        # Inbox list: newest first per user (keyset pagination on last_updated, thread_id)
+        Index('idx_thread_summaries_user_updated', 'user_id', last_updated.desc(), thread_id.desc()),
+    )
 
 
 class Message(Base):
@@ -50,7 +84,7 @@ class Message(Base):
     body_text = Column(Text)
     
     # Meta
-    is_from_user = Column(String, default=False)
+    is_from_user = Column(Boolean, default=False)
     sent_at = Column(DateTime, nullable=False)
     
     # Timestamps
@@ -0,0 +1,75 @@
+"""
+Deadline Extractor Benchmark
+============================
+Compares the single-pass deadline scanner against the previous
+one-finditer-per-pattern implementation on the demo corpus.
+
+Run from backend/:  python tests/bench_deadline_extractor.py [messages]
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.intelligence.deadline_extractor import (  # noqa: E402
+    DEADLINE_PATTERNS,
+    _extract_from_text,
+    _scan,
+)
+
+
+def legacy_scan(text: str) -> List[str]:
+    """Previous implementation: one re.finditer per pattern."""
+    text_lower = text.lower()
+    return [
+        match.group(0)
+        for pattern, _ in DEADLINE_PATTERNS
+        for match in re.finditer(pattern, text_lower)
+    ]
+
+
+def load_corpus(messages: int) -> List[str]:
+    """Demo message bodies (plus subjects) repeated up to `messages` texts."""
+    from tests.demo_data import ALL_TEST_SCENARIOS
+
+    texts = []
+    for scenario in ALL_TEST_SCENARIOS.values():
+        email = scenario["raw_email"]
+        texts.append(email["subject"])
+        texts.extend(msg["body_text"] for msg in email["messages"])
+
+    return (texts * (messages // len(texts) + 1))[:messages]
+
+
+def bench(name: str, fn, corpus: List[str]) -> float:
+    start = time.perf_counter()
+    for text in corpus:
+        fn(text)
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<28} {elapsed:8.3f}s  {len(corpus) / elapsed:12,.0f} msgs/s")
+    return elapsed
+
+
+def run(messages: int = 100_000) -> None:
+    corpus = load_corpus(messages)
+    print(f"\nDeadline scanning over {len(corpus):,} messages")
+
+    mismatches = sum(
+        1 for text in set(corpus)
+        if legacy_scan(text) != [raw for _, _, raw in _scan(text.lower())]
+    )
+    print(f"  result mismatches vs legacy: {mismatches}")
+
+    legacy = bench("legacy (finditer x8)", legacy_scan, corpus)
+    single = bench("single-pass scanner", lambda t: _scan(t.lower()), corpus)
+    print(f"  speedup (scan only): {legacy / single:.2f}x")
+
+    bench("_extract_from_text (full)", lambda t: _extract_from_text(t, "bench"), corpus)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
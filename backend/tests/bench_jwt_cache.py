@@ -0,0 +1,134 @@
+"""
+JWT Cache Benchmark
+===================
+Requests/sec through an authenticated route (get_current_user) with the
+verified-token cache disabled and enabled, then verify_token with the
+Redis revocation store (JWT_REVOCATION_BACKEND=redis): checking Redis on
+every request vs. reusing "not revoked" answers for
+JWT_REVOCATION_CHECK_SECONDS.
+
+Uses the Redis at REDIS_URL when the redis package is installed and the
+server answers; otherwise a store that sleeps for REDIS_RTT_MS per call.
+
+Run from backend/:  python tests/bench_jwt_cache.py [requests]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+
+from api.middleware.auth import get_current_user  # noqa: E402
+from app.config import settings  # noqa: E402
+from core.auth import jwt as jwt_module  # noqa: E402
+from core.auth.jwt import (  # noqa: E402
+    InMemoryRevocationStore,
+    TokenData,
+    TokenRevocations,
+    create_access_token,
+    verified_tokens,
+    verify_token,
+)
+
+
+# Simulated Redis round trip (same host, loopback) when no server is available
+REDIS_RTT_MS = 0.3
+
+
+class SimulatedRedis(InMemoryRevocationStore):
+    async def is_revoked(self, key: str) -> bool:
+        await asyncio.sleep(REDIS_RTT_MS / 1000)
+        return await super().is_revoked(key)
+
+
+async def redis_backend():
+    """(backend, description): the real Redis if reachable, else SimulatedRedis."""
+    try:
+        from core.auth.jwt import RedisRevocationStore
+        
+        backend = RedisRevocationStore(settings.REDIS_URL)
+        await backend._client.ping()
+        return backend, f"redis at {settings.REDIS_URL}"
+    except Exception:
+        return SimulatedRedis(), f"simulated redis ({REDIS_RTT_MS}ms round trip)"
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    
+    @app.get("/me")
+    async def me(user: TokenData = Depends(get_current_user)):
+        return {"user_id": user.user_id}
+    
+    return app
+
+
+async def bench_route(name: str, requests: int, tokens) -> float:
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for n in range(requests):
+            token = tokens[n % len(tokens)]
+            response = await client.get("/me", headers={"Authorization": f"Bearer {token}"})
+            assert response.status_code == 200
+        elapsed = time.perf_counter() - start
+    print(f"  {name:<28} {elapsed:8.3f}s  {requests / elapsed:12,.0f} req/s")
+    return elapsed
+
+
+async def bench_verify(name: str, requests: int, tokens) -> float:
+    start = time.perf_counter()
+    for n in range(requests):
+        await verify_token(tokens[n % len(tokens)])
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<28} {elapsed:8.3f}s  {requests / elapsed:12,.0f} verifies/s")
+    return elapsed
+
+
+async def run(requests: int = 5_000) -> None:
+    # A handful of dashboard sessions polling with the same tokens
+    tokens = [create_access_token(f"user-{n}", f"user{n}@example.com") for n in range(50)]
+    max_entries = verified_tokens.max_entries
+    
+    print(f"\nAuthenticated route, {requests:,} requests over {len(tokens)} tokens")
+    verified_tokens.max_entries = 0
+    uncached = await bench_route("no cache", requests, tokens)
+    verified_tokens.max_entries = max_entries
+    verified_tokens.clear()
+    cached = await bench_route("verified-token cache", requests, tokens)
+    print(f"  speedup (route): {uncached / cached:.2f}x")
+    
+    print(f"\nverify_token alone, {requests * 10:,} calls")
+    verified_tokens.max_entries = 0
+    uncached = await bench_verify("no cache", requests * 10, tokens)
+    verified_tokens.max_entries = max_entries
+    cached = await bench_verify("verified-token cache", requests * 10, tokens)
+    print(f"  speedup (verify): {uncached / cached:.2f}x")
+    print(f"  cache: {verified_tokens.stats()}")
+    
+    backend, description = await redis_backend()
+    print(f"\nverify_token with cache, revocations in {description}, {requests:,} calls")
+    default_revocations = jwt_module.token_revocations
+    try:
+        jwt_module.token_revocations = TokenRevocations(backend, check_seconds=0)
+        every = await bench_verify("check every request", requests, tokens)
+        revocations = TokenRevocations(backend, check_seconds=settings.JWT_REVOCATION_CHECK_SECONDS)
+        jwt_module.token_revocations = revocations
+        reused = await bench_verify(
+            f"reuse for {settings.JWT_REVOCATION_CHECK_SECONDS:g}s", requests, tokens,
+        )
+        print(f"  speedup (revocation check): {every / reused:.2f}x")
+        print(f"  revocations: {revocations.stats()}")
+    finally:
+        jwt_module.token_revocations = default_revocations
+        if hasattr(backend, "close"):
+            await backend.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000))
@@ -0,0 +1,190 @@
+"""
+Fake Gmail Service
+==================
+In-memory stand-in for the Gmail REST API, served through an httpx
+MockTransport so GmailClient runs unmodified against it (any host; routing
+is by the /gmail/v1/users/me path).
+
+Records every request and the peak number of concurrent requests, and
+answers multipart batch requests (counting their sub-requests). Every
+change is also logged as a history record, so incremental sync via the
+history API can be exercised, including expired history ids.
+"""
+
+import asyncio
+import base64
+import json
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import httpx
+
+
+class FakeGmail:
+    """A mailbox of threads plus request accounting."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.threads: Dict[str, dict] = {}
+        self.history_id = 1000
+        self.history: List[dict] = []
+        self.oldest_history_id = self.history_id
+        self.sub_requests = 0
+        # path suffix -> statuses to answer with before succeeding (e.g. [429])
+        self.failures: Dict[str, List[int]] = {}
+        self.requests: List[httpx.Request] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+
+    def add_thread(
+        self,
+        thread_id: str,
+        subject: str = "Hello",
+        bodies: Optional[List[str]] = None,
+        sender: str = "Sarah <sarah@client.com>",
+    ) -> dict:
+        """Add a thread with one message per body; returns the raw resource."""
+        self.threads[thread_id] = {"id": thread_id, "messages": []}
+        for body in bodies or ["Can you review this?"]:
+            self.add_message(thread_id, body, subject=subject, sender=sender)
+        return self.threads[thread_id]
+
+    def add_message(
+        self,
+        thread_id: str,
+        body: str,
+        subject: str = "Hello",
+        sender: str = "Sarah <sarah@client.com>",
+    ) -> dict:
+        """Append a message to an existing thread."""
+        messages = self.threads[thread_id]["messages"]
+        sent_at = datetime(2026, 1, 18, 9, 0) + timedelta(hours=len(messages))
+        message = {
+            "id": f"{thread_id}-m{len(messages)}",
+            "threadId": thread_id,
+            "labelIds": ["INBOX"],
+            "internalDate": str(int(sent_at.timestamp() * 1000)),
+            "payload": {
+                "mimeType": "multipart/mixed",
+                "headers": [
+                    {"name": "From", "value": sender},
+                    {"name": "To", "value": "You <you@company.com>"},
+                    {"name": "Subject", "value": subject},
+                ],
+                "parts": [
+                    {
+                        "mimeType": "text/plain",
+                        "body": {"data": base64.urlsafe_b64encode(body.encode()).decode().rstrip("=")},
+                    },
+                ],
+            },
+        }
+        messages.append(message)
+        self._record("messagesAdded", message)
+        return message
+
+    def delete_thread(self, thread_id: str) -> None:
+        for message in self.threads.pop(thread_id)["messages"]:
+            self._record("messagesDeleted", message)
+
+    def expire_history(self) -> None:
+        """Drop all history records, as Gmail does after about a week."""
+        self.history.clear()
+        self.oldest_history_id = self.history_id
+        self.sub_requests = 0
+        # path suffix -> statuses to answer with before succeeding (e.g. [429])
+        self.failures: Dict[str, List[int]] = {}
+
+    def _record(self, key: str, message: dict) -> None:
+        self.history_id += 1
+        self.history.append({
+            "id": str(self.history_id),
+            key: [{"message": {"id": message["id"], "threadId": message["threadId"]}}],
+        })
+
+    def paths(self) -> List[str]:
+        return [request.url.path for request in self.requests]
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if request.url.path == "/batch/gmail/v1":
+                return self._batch(request)
+            self.sub_requests += 1
+            return self._route(request)
+        finally:
+            self.in_flight -= 1
+
+    def _route(self, request: httpx.Request) -> httpx.Response:
+        for suffix, statuses in self.failures.items():
+            if statuses and request.url.path.endswith(suffix):
+                status = statuses.pop(0)
+                return httpx.Response(status, json={"error": {"code": status}})
+        path = request.url.path.removeprefix("/gmail/v1/users/me")
+        if path == "/threads":
+            return self._list_threads(request)
+        if path == "/profile":
+            return httpx.Response(200, json={"historyId": str(self.history_id)})
+        if path == "/history":
+            return self._list_history(request)
+        if path.startswith("/threads/"):
+            thread = self.threads.get(path.removeprefix("/threads/"))
+            if thread is None:
+                return httpx.Response(404, json={"error": {"code": 404}})
+            return httpx.Response(200, json=thread)
+        return httpx.Response(404, json={"error": {"code": 404}})
+
+    def _list_threads(self, request: httpx.Request) -> httpx.Response:
+        ids = list(self.threads)
+        offset = int(request.url.params.get("pageToken", "0"))
+        size = int(request.url.params.get("maxResults", "100"))
+        page = {"threads": [{"id": thread_id} for thread_id in ids[offset:offset + size]]}
+        if offset + size < len(ids):
+            page["nextPageToken"] = str(offset + size)
+        return httpx.Response(200, json=page)
+
+    def _list_history(self, request: httpx.Request) -> httpx.Response:
+        start = int(request.url.params["startHistoryId"])
+        if start < self.oldest_history_id:
+            return httpx.Response(404, json={"error": {"code": 404}})
+
+        records = [r for r in self.history if int(r["id"]) > start]
+        offset = int(request.url.params.get("pageToken", "0"))
+        size = int(request.url.params.get("maxResults", "100"))
+        page = {"history": records[offset:offset + size], "historyId": str(self.history_id)}
+        if offset + size < len(records):
+            page["nextPageToken"] = str(offset + size)
+        return httpx.Response(200, json=page)
+
+    def _batch(self, request: httpx.Request) -> httpx.Response:
+        """Answer a multipart/mixed batch by routing each embedded GET."""
+        boundary = re.search(r"boundary=(\S+)", request.headers["content-type"]).group(1)
+        out = []
+        for part in request.content.decode().split(f"--{boundary}")[1:-1]:
+            headers, _, embedded = part.strip("\r\n").partition("\r\n\r\n")
+            content_id = re.search(r"Content-ID: <([^>]+)>", headers).group(1)
+            method, target = embedded.split("\r\n", 1)[0].split(" ", 1)
+            self.sub_requests += 1
+            response = self._route(httpx.Request(method, f"https://gmail.test{target}"))
+            out.append(
+                f"--resp\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {response.status_code} OK\r\n"
+                f"Content-Type: application/json\r\n\r\n"
+                f"{json.dumps(response.json())}\r\n"
+            )
+        # Answer parts in reverse to check the client matches by Content-ID
+        body = "".join(reversed(out)) + "--resp--\r\n"
+        return httpx.Response(
+            200,
+            content=body.encode(),
+            headers={"Content-Type": "multipart/mixed; boundary=resp"},
+        )
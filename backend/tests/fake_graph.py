@@ -0,0 +1,107 @@
+"""
+Fake Microsoft Graph Service
+============================
+In-memory stand-in for the Graph mail delta API, served through an httpx
+MockTransport so OutlookClient runs unmodified against it.
+
+Every change is logged with a sequence number; delta links carry the
+sequence they were issued at, and can be expired to force a resync.
+"""
+
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+import httpx
+
+
+DELTA_URL = "https://graph.microsoft.com/v1.0/me/mailFolders/inbox/messages/delta"
+
+
+class FakeGraph:
+    """An Outlook inbox plus request accounting."""
+
+    def __init__(self):
+        self.messages: Dict[str, dict] = {}
+        self.seq = 0
+        self.oldest_seq = 0
+        self.log: List[Tuple[int, str]] = []
+        self.requests: List[httpx.Request] = []
+        # skiptoken -> (items, sequence at which the query was answered)
+        self._queries: Dict[str, Tuple[List[dict], int]] = {}
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+
+    def add_message(
+        self,
+        conversation_id: str,
+        body: str,
+        sender: str = "sarah@client.com",
+        subject: str = "Hello",
+    ) -> dict:
+        count = sum(1 for m in self.messages.values() if m["conversationId"] == conversation_id)
+        sent_at = datetime(2026, 1, 18, 9, 0) + timedelta(hours=count)
+        message = {
+            "id": f"{conversation_id}-m{count}-{self.seq}",
+            "conversationId": conversation_id,
+            "subject": subject,
+            "from": {"emailAddress": {"name": "", "address": sender}},
+            "toRecipients": [{"emailAddress": {"name": "", "address": "you@company.com"}}],
+            "ccRecipients": [],
+            "body": {"contentType": "text", "content": body},
+            "sentDateTime": sent_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+        self.messages[message["id"]] = message
+        self._record(message["id"])
+        return message
+
+    def update_message(self, message_id: str, **fields) -> None:
+        self.messages[message_id].update(fields)
+        self._record(message_id)
+
+    def delete_message(self, message_id: str) -> None:
+        del self.messages[message_id]
+        self._record(message_id)
+
+    def expire_delta_links(self) -> None:
+        self.oldest_seq = self.seq
+
+    def _record(self, message_id: str) -> None:
+        self.seq += 1
+        self.log.append((self.seq, message_id))
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        params = request.url.params
+        page_size = int(re.search(r"odata.maxpagesize=(\d+)", request.headers.get("Prefer", "")).group(1))
+
+        if "$skiptoken" in params:
+            token = params["$skiptoken"]
+            key, offset = token.rsplit(".", 1)
+            items, seq = self._queries[key]
+            offset = int(offset)
+        else:
+            if "$deltatoken" in params:
+                since = int(params["$deltatoken"])
+                if since < self.oldest_seq:
+                    return httpx.Response(410, json={"error": {"code": "syncStateNotFound"}})
+                items = self._changes_since(since)
+            else:
+                items = list(self.messages.values())
+            key, seq, offset = str(len(self._queries)), self.seq, 0
+            self._queries[key] = (items, seq)
+
+        page = {"value": items[offset:offset + page_size]}
+        if offset + page_size < len(items):
+            page["@odata.nextLink"] = f"{DELTA_URL}?$skiptoken={key}.{offset + page_size}"
+        else:
+            page["@odata.deltaLink"] = f"{DELTA_URL}?$deltatoken={seq}"
+        return httpx.Response(200, json=page)
+
+    def _changes_since(self, since: int) -> List[dict]:
+        changed = dict.fromkeys(message_id for seq, message_id in self.log if seq > since)
+        return [
+            self.messages.get(message_id, {"id": message_id, "@removed": {"reason": "deleted"}})
+            for message_id in changed
+        ]
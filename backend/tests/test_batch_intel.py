@@ -0,0 +1,108 @@
+"""
+Batch Intelligence Tests
+------------------------
+Tests for analyze_threads and summary prompt coalescing.
+"""
+
+import asyncio
+
+import pytest
+
+from app.config import settings
+from contracts.mocks import create_mock_email_thread
+from core.intelligence import batch_intel, summarizer
+from core.intelligence.summarizer import SummaryBatcher, _split_batch_response
+
+
+def _threads(count):
+    threads = []
+    for i in range(count):
+        thread = create_mock_email_thread()
+        thread.thread_id = f"thread-{i}"
+        threads.append(thread)
+    return threads
+
+
+@pytest.fixture(autouse=True)
+def offline_llm(monkeypatch):
+    """Use the local fallback summarizer instead of a real provider."""
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "none")
+
+
+class TestAnalyzeThreads:
+    """Tests for the batch analysis entry point."""
+
+    async def test_yields_every_thread(self):
+        """Every input thread should produce exactly one result."""
+        results = [intel async for intel in batch_intel.analyze_threads(_threads(10))]
+        assert sorted(r.thread_id for r in results) == [f"thread-{i}" for i in range(10)]
+        assert all(r.degraded_stages == [] for r in results)
+
+    async def test_accepts_async_iterator(self):
+        """An async source should be consumed lazily."""
+        async def source():
+            for thread in _threads(4):
+                yield thread
+
+        results = [intel async for intel in batch_intel.analyze_threads(source())]
+        assert len(results) == 4
+
+    async def test_respects_concurrency_limit(self, monkeypatch):
+        """No more than max_concurrency threads should be in flight."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_analyze(thread, model):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return thread.thread_id
+
+        monkeypatch.setattr(batch_intel, "analyze_thread", fake_analyze)
+        results = [r async for r in batch_intel.analyze_threads(_threads(20), max_concurrency=3)]
+
+        assert len(results) == 20
+        assert peak == 3
+
+    async def test_coalesces_summaries(self, monkeypatch):
+        """Concurrent threads should share summarization LLM calls."""
+        calls = []
+        real = summarizer._generate_summaries
+
+        async def counting(contexts, model):
+            calls.append(len(contexts))
+            return await real(contexts, model)
+
+        monkeypatch.setattr(summarizer, "_generate_summaries", counting)
+        monkeypatch.setattr(settings, "INTEL_SUMMARY_BATCH_SIZE", 4)
+
+        results = [r async for r in batch_intel.analyze_threads(_threads(8), max_concurrency=8)]
+
+        assert len(results) == 8
+        assert sum(calls) == 8
+        assert len(calls) < 8
+
+
+class TestSummaryBatcher:
+    """Tests for SummaryBatcher."""
+
+    async def test_one_call_per_batch(self):
+        """Prompts submitted together should go out in one call."""
+        batcher = SummaryBatcher(max_batch_size=10, max_wait_ms=5)
+        summaries = await asyncio.gather(
+            *(batcher.submit(f"context {i}", "model") for i in range(5))
+        )
+        assert len(summaries) == 5
+        assert batcher.llm_calls == 1
+        assert batcher.prompts_submitted == 5
+
+    def test_split_batch_response(self):
+        """Batched responses are split by section header, in order."""
+        response = "Sure!\n### Thread 2\nSecond.\n### Thread 1\nFirst.\n"
+        assert _split_batch_response(response, 2) == ["First.", "Second."]
+
+    def test_split_batch_response_malformed(self):
+        """Missing sections should be reported as malformed."""
+        assert _split_batch_response("### Thread 1\nOnly one", 2) is None
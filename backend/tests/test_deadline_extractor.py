@@ -0,0 +1,47 @@
+"""
+Deadline Extractor Tests
+------------------------
+The single-pass scanner must return exactly what running each
+DEADLINE_PATTERNS entry separately returned.
+"""
+
+import random
+
+from core.intelligence.deadline_extractor import (
+    DEADLINE_PATTERNS,
+    PATTERN_TRIGGERS,
+    _extract_from_text,
+    _scan,
+)
+from tests.bench_deadline_extractor import legacy_scan, load_corpus
+
+
+FRAGMENTS = [
+    "by friday", "by eod", "by end of day", "by 1/24", "before 12-3",
+    "deadline: tomorrow at noon", "deadline next week. ", "asap", "urgent",
+    "immediately", "within 2 days", "within 3\nhour", "today", "tomorrow",
+    "deadline: by friday or asap", "goodbye friday", "by\n\nmonday", " ", ".", "\n",
+    "please", "review", "deadline:deadline: today",
+]
+
+
+class TestScanner:
+    """Equivalence of the single-pass scanner with per-pattern scans."""
+
+    def test_triggers_cover_every_pattern(self):
+        assert len(PATTERN_TRIGGERS) == len(DEADLINE_PATTERNS)
+
+    def test_matches_legacy_on_demo_corpus(self):
+        for text in set(load_corpus(50)):
+            assert [raw for _, _, raw in _scan(text.lower())] == legacy_scan(text)
+
+    def test_matches_legacy_on_random_text(self):
+        rng = random.Random(1234)
+        for _ in range(2000):
+            text = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 12)))
+            assert [raw for _, _, raw in _scan(text.lower())] == legacy_scan(text), text
+
+    def test_overlapping_hits_are_kept(self):
+        """A relative deadline inside an explicit one is reported too."""
+        raw = [d.raw_text for d in _extract_from_text("Deadline: tomorrow at noon", "m1")]
+        assert raw == ["deadline: tomorrow at noon", "tomorrow"]
@@ -0,0 +1,174 @@
+"""
+Document Parser Tests
+---------------------
+Tests for the process pool that extracts document text off the event loop.
+"""
+
+import asyncio
+import importlib
+import os
+import signal
+import time
+
+import pytest
+
+from core.intelligence.attachment_intel import _summarize_document
+from core.intelligence.document_parser import (
+    DocumentParseError,
+    DocumentParserPool,
+    DocumentText,
+    iter_page_text,
+    take_text,
+)
+
+# The package re-exports the `document_parser` singleton under the module's name
+document_parser_module = importlib.import_module("core.intelligence.document_parser")
+
+
+# Worker functions: module level so the pool can pickle them by name
+
+def add(a, b):
+    return a + b
+
+
+def spin(seconds):
+    time.sleep(seconds)
+    return "done"
+
+
+def allocate(megabytes):
+    return len(bytearray(megabytes * 1024 * 1024))
+
+
+def crash():
+    os._exit(1)
+
+
+def hang(seconds):
+    # Like a parser stuck in C code: the SIGALRM timeout never fires
+    signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+    time.sleep(seconds)
+
+
+class FakePage:
+    """PDF page that records when its text is extracted."""
+    
+    def __init__(self, number, parsed):
+        self.number = number
+        self.parsed = parsed
+    
+    def extract_text(self):
+        self.parsed.append(self.number)
+        return f"page {self.number} ".ljust(1000, "x")
+
+
+@pytest.fixture
+async def pool():
+    pool = DocumentParserPool(max_workers=1, timeout_seconds=1.0, memory_limit_mb=256)
+    yield pool
+    await pool.close()
+
+
+class TestDocumentParserPool:
+    """Tests for DocumentParserPool."""
+    
+    async def test_runs_in_worker_without_blocking_the_loop(self, pool):
+        ticks = 0
+        
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+        
+        task = asyncio.create_task(ticker())
+        await pool.run(add, 1, 2)  # warm-up: spawns the worker
+        before = ticks
+        assert await pool.run(spin, 0.3) == "done"
+        task.cancel()
+        
+        # The loop kept running while the worker slept
+        assert ticks - before >= 10
+        assert pool.stats()["documents"] == 2
+    
+    async def test_timeout(self, pool):
+        with pytest.raises(DocumentParseError) as error:
+            await pool.run(spin, 10)
+        
+        assert error.value.reason == "timeout"
+        assert pool.stats()["timeouts"] == 1
+        # The worker is still usable
+        assert await pool.run(add, 2, 2) == 4
+    
+    async def test_memory_cap(self, pool):
+        with pytest.raises(DocumentParseError) as error:
+            await pool.run(allocate, 1024)
+        
+        assert error.value.reason == "memory"
+        assert await pool.run(allocate, 16) == 16 * 1024 * 1024
+    
+    async def test_crashed_worker_is_replaced(self, pool):
+        with pytest.raises(DocumentParseError) as error:
+            await pool.run(crash)
+        
+        assert error.value.reason == "crash"
+        assert await pool.run(add, 1, 1) == 2
+        assert pool.stats()["crashes"] == 1
+    
+    async def test_documents_sharing_a_stuck_workers_pool_are_resubmitted(self, pool, monkeypatch):
+        monkeypatch.setattr(document_parser_module, "TIMEOUT_GRACE_SECONDS", 2.0)
+        await pool.run(add, 0, 0)  # warm-up: spawns the worker
+        
+        stuck = asyncio.create_task(pool.run(hang, 30))
+        await asyncio.sleep(0.1)
+        # Queued behind the stuck document on the same pool
+        innocent = asyncio.create_task(pool.run(add, 1, 2))
+        
+        with pytest.raises(DocumentParseError) as error:
+            await stuck
+        assert error.value.reason == "timeout"
+        assert await innocent == 3
+        stats = pool.stats()
+        assert stats["resubmitted"] == 1
+        assert stats["crashes"] == 0
+    
+    async def test_unsupported_type_skips_the_pool(self, pool):
+        document = await pool.extract_text("/tmp/x.bin", "application/octet-stream", 1000)
+        assert document.text == ""
+        assert pool.stats()["started"] is False
+
+
+class TestTextBudget:
+    """Tests for budgeted, page-streaming extraction."""
+    
+    def test_stops_parsing_pages_at_budget(self):
+        parsed = []
+        pages = [FakePage(n, parsed) for n in range(1, 301)]
+        
+        text, pages_read, truncated = take_text(iter_page_text(pages), 5000)
+        
+        assert len(text) == 5000
+        assert truncated and pages_read == 5
+        # Pages past the budget are never parsed
+        assert parsed == [1, 2, 3, 4, 5]
+    
+    def test_short_document_is_complete(self):
+        parsed = []
+        pages = [FakePage(n, parsed) for n in range(1, 4)]
+        
+        text, pages_read, truncated = take_text(iter_page_text(pages), 5000)
+        
+        assert not truncated and pages_read == 3
+        assert text.startswith("page 1") and "page 3" in text
+    
+    def test_coverage(self):
+        assert DocumentText("abc").coverage() == ""
+        assert DocumentText("x" * 20000, True, "page", 12, 300).coverage() == "pages 1-12 of 300"
+        assert DocumentText("x" * 20000, True).coverage() == "the first 20,000 characters"
+    
+    async def test_summary_states_partial_coverage(self):
+        partial = DocumentText("Master services agreement", True, "page", 12, 300)
+        complete = DocumentText("Master services agreement", False, "page", 2, 2)
+        
+        assert "Covers pages 1-12 of 300" in await _summarize_document(partial, "model")
+        assert "Covers" not in await _summarize_document(complete, "model")
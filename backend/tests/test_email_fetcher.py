@@ -0,0 +1,124 @@
+"""
+Email Fetcher Tests
+-------------------
+Tests for streaming Gmail ingestion against a local fake Gmail.
+"""
+
+import pytest
+
+from core.ingestion import email_fetcher
+from core.ingestion.email_fetcher import fetch_threads, parse_gmail_thread
+from tests.fake_gmail import FakeGmail
+
+
+@pytest.fixture
+def gmail(monkeypatch):
+    """Fake mailbox with small list pages."""
+    monkeypatch.setattr(email_fetcher, "GMAIL_PAGE_SIZE", 10)
+    return FakeGmail()
+
+
+async def _collect(gmail, **kwargs):
+    async with gmail.client() as http:
+        return [t async for t in fetch_threads("user-1", "gmail", "token", http_client=http, **kwargs)]
+
+
+class TestFetchThreads:
+    """Tests for the fetch_threads async generator."""
+
+    async def test_follows_page_tokens(self, gmail):
+        for i in range(35):
+            gmail.add_thread(f"t{i}")
+
+        threads = await _collect(gmail, max_results=None)
+
+        assert sorted(t.external_id for t in threads) == sorted(f"t{i}" for i in range(35))
+        assert gmail.paths().count("/gmail/v1/users/me/threads") == 4
+
+    async def test_respects_max_results(self, gmail):
+        for i in range(35):
+            gmail.add_thread(f"t{i}")
+
+        threads = await _collect(gmail, max_results=15)
+
+        assert len(threads) == 15
+        # Only the listed threads are hydrated
+        assert gmail.sub_requests == 2 + 15
+
+    async def test_hydrates_concurrently_under_limit(self, gmail):
+        gmail.latency = 0.01
+        for i in range(30):
+            gmail.add_thread(f"t{i}")
+
+        threads = await _collect(gmail, max_results=None, concurrency=4, batch_size=1)
+
+        assert len(threads) == 30
+        assert gmail.peak_in_flight <= 4 + 1  # fetches plus one page listing
+        assert gmail.peak_in_flight >= 4
+
+    async def test_yields_before_listing_finishes(self, gmail):
+        for i in range(30):
+            gmail.add_thread(f"t{i}")
+
+        async with gmail.client() as http:
+            stream = fetch_threads("user-1", "gmail", "token", max_results=None, http_client=http)
+            first = await stream.__anext__()
+            await stream.aclose()
+
+        assert first.provider == "gmail"
+        assert gmail.paths().count("/gmail/v1/users/me/threads") < 3
+
+    async def test_skips_threads_deleted_after_listing(self, gmail, monkeypatch):
+        for i in range(3):
+            gmail.add_thread(f"t{i}")
+        route = gmail._route
+
+        def deleting_route(request):
+            if request.url.path.endswith("/t1"):
+                gmail.threads.pop("t1", None)
+            return route(request)
+
+        monkeypatch.setattr(gmail, "_route", deleting_route)
+        threads = await _collect(gmail, max_results=None)
+
+        assert sorted(t.external_id for t in threads) == ["t0", "t2"]
+
+
+class TestParseGmailThread:
+    """Tests for Gmail resource normalization."""
+
+    def test_parses_headers_and_body(self):
+        raw = FakeGmail().add_thread("t1", subject="Contract", bodies=["First", "Second"])
+        raw["messages"][1]["labelIds"] = ["SENT"]
+
+        thread = parse_gmail_thread(raw)
+
+        assert thread.subject == "Contract"
+        assert [m.body_text for m in thread.messages] == ["First", "Second"]
+        assert thread.messages[0].from_address == "sarah@client.com"
+        assert thread.messages[0].to_addresses == ["you@company.com"]
+        assert thread.messages[1].is_from_user
+        assert thread.last_updated == thread.messages[1].sent_at
+
+    def test_collects_attachments(self):
+        raw = FakeGmail().add_thread("t1")
+        raw["messages"][0]["payload"]["parts"].append({
+            "mimeType": "application/pdf",
+            "filename": "contract.pdf",
+            "body": {"attachmentId": "a1", "size": 2048},
+        })
+
+        thread = parse_gmail_thread(raw)
+
+        assert [(a.filename, a.size_bytes) for a in thread.attachments] == [("contract.pdf", 2048)]
+
+    async def test_batches_thread_fetches(self, gmail):
+        for i in range(35):
+            gmail.add_thread(f"t{i}")
+
+        threads = await _collect(gmail, max_results=None, batch_size=10)
+
+        assert len(threads) == 35
+        # 4 list pages + one batch request per page
+        assert len(gmail.requests) == 4 + 4
+        assert gmail.paths().count("/batch/gmail/v1") == 4
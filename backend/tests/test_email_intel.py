@@ -0,0 +1,189 @@
+"""
+Email Intelligence Tests
+------------------------
+Tests for analyze_thread orchestration and incremental re-analysis.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+
+from app.config import settings
+from contracts import EmailMessage, IntentType
+from contracts.mocks import create_mock_email_thread
+from core.intelligence import email_intel, summarizer
+
+
+@pytest.fixture
+def slow_stages(monkeypatch):
+    """Make every stage sleep so concurrency is observable."""
+    delay = 0.05
+
+    async def summary(thread, model):
+        await asyncio.sleep(delay)
+        return "summary"
+
+    async def intent(thread, model):
+        await asyncio.sleep(delay)
+        return IntentType.ACTION_REQUIRED, 70
+
+    async def empty(*args):
+        await asyncio.sleep(delay)
+        return []
+
+    monkeypatch.setattr(email_intel, "summarize_thread", summary)
+    monkeypatch.setattr(email_intel, "classify_intent", intent)
+    monkeypatch.setattr(email_intel, "extract_deadlines", empty)
+    monkeypatch.setattr(email_intel, "extract_entities", empty)
+    monkeypatch.setattr(email_intel, "analyze_attachments", empty)
+    return delay
+
+
+class TestAnalyzeThread:
+    """Tests for analyze_thread stage execution."""
+
+    async def test_concurrent_runs_in_max_stage_time(self, slow_stages):
+        """Concurrent mode should take about one stage, not the sum."""
+        thread = create_mock_email_thread()
+
+        start = time.perf_counter()
+        intel = await email_intel.analyze_thread(thread, concurrent=True)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < slow_stages * 3
+        assert intel.summary == "summary"
+        assert intel.intent == IntentType.ACTION_REQUIRED
+        assert intel.degraded_stages == []
+
+    async def test_records_stage_timings(self, slow_stages):
+        """Every stage plus the total should have a timing entry."""
+        thread = create_mock_email_thread()
+        intel = await email_intel.analyze_thread(thread, concurrent=False)
+
+        for stage in email_intel.ANALYSIS_STAGES:
+            assert intel.stage_timings_ms[stage] >= slow_stages * 1000 * 0.9
+        assert intel.stage_timings_ms["total"] >= slow_stages * 1000 * 5 * 0.9
+
+    async def test_timed_out_stage_falls_back(self, slow_stages, monkeypatch):
+        """A stage over its timeout should degrade, not fail the thread."""
+        async def hanging_summary(thread, model):
+            await asyncio.sleep(10)
+
+        monkeypatch.setattr(email_intel, "summarize_thread", hanging_summary)
+        thread = create_mock_email_thread()
+
+        intel = await email_intel.analyze_thread(thread, stage_timeout=0.2)
+
+        assert intel.degraded_stages == ["summary"]
+        assert intel.summary == thread.subject
+        assert intel.intent == IntentType.ACTION_REQUIRED
+
+    async def test_failing_stage_falls_back(self, slow_stages, monkeypatch, caplog):
+        """A stage that raises should degrade to its neutral value, and say why."""
+        async def broken_intent(thread, model):
+            raise RuntimeError("provider down")
+
+        monkeypatch.setattr(email_intel, "classify_intent", broken_intent)
+        intel = await email_intel.analyze_thread(create_mock_email_thread())
+
+        assert intel.degraded_stages == ["intent"]
+        assert intel.intent == IntentType.UNKNOWN
+        assert intel.urgency_score == 0
+        [record] = [r for r in caplog.records if r.name == email_intel.__name__]
+        assert "intent" in record.getMessage()
+        assert record.exc_info[1].args == ("provider down",)
+
+
+class TestUpdateThreadIntel:
+    """Tests for incremental re-analysis."""
+
+    @pytest.fixture(autouse=True)
+    def offline_llm(self, monkeypatch):
+        monkeypatch.setattr(settings, "LLM_PROVIDER", "none")
+
+    @staticmethod
+    def _reply(body):
+        return EmailMessage(
+            message_id="msg-new",
+            from_address="sarah@client.com",
+            to_addresses=["you@company.com"],
+            subject="Contract Review - Final Terms",
+            body_text=body,
+            sent_at=datetime.utcnow(),
+        )
+
+    async def test_merges_new_deadlines_and_entities(self):
+        """New findings are appended; earlier ones are kept."""
+        thread = create_mock_email_thread()
+        previous = await email_intel.analyze_thread(thread)
+
+        reply = self._reply("Also, the invoice for $12,000 is due tomorrow. Call +1 555 123 4567.")
+        thread.messages.append(reply)
+        updated = await email_intel.update_thread_intel(thread, previous, [reply])
+
+        raw = [d.raw_text for d in updated.extracted_deadlines]
+        assert raw[: len(previous.extracted_deadlines)] == [
+            d.raw_text for d in previous.extracted_deadlines
+        ]
+        assert "tomorrow" in raw
+        assert len(raw) == len(set(raw))
+        assert {"amount", "phone"} <= {e.entity_type for e in updated.entities}
+        assert updated.degraded_stages == []
+
+    async def test_only_scans_new_messages(self, monkeypatch):
+        """Earlier message bodies must not be re-scanned."""
+        scanned = []
+        real = email_intel.extract_message_deadlines
+
+        async def spy(messages, model):
+            scanned.extend(m.message_id for m in messages)
+            return await real(messages, model)
+
+        monkeypatch.setattr(email_intel, "extract_message_deadlines", spy)
+        thread = create_mock_email_thread()
+        previous = await email_intel.analyze_thread(thread)
+
+        reply = self._reply("Thanks!")
+        thread.messages.append(reply)
+        await email_intel.update_thread_intel(thread, previous, [reply])
+
+        assert scanned == ["msg-new"]
+
+    async def test_rolls_summary_forward(self, monkeypatch):
+        """The summary prompt should carry the previous summary, not old bodies."""
+        contexts = []
+
+        async def capture(context, model):
+            contexts.append(context)
+            return "updated summary"
+
+        thread = create_mock_email_thread()
+        previous = await email_intel.analyze_thread(thread)
+        monkeypatch.setattr(summarizer, "_generate_summary", capture)
+
+        reply = self._reply("Signed copy attached.")
+        thread.messages.append(reply)
+        updated = await email_intel.update_thread_intel(thread, previous, [reply])
+
+        assert updated.summary == "updated summary"
+        assert previous.summary in contexts[-1]
+        assert "Signed copy attached." in contexts[-1]
+        assert thread.messages[0].body_text[:40] not in contexts[-1]
+
+    async def test_model_change_triggers_full_analysis(self, monkeypatch):
+        thread = create_mock_email_thread()
+        previous = await email_intel.analyze_thread(thread, model="old-model")
+
+        full_runs = []
+        real = email_intel.analyze_thread
+
+        async def spy(*args, **kwargs):
+            full_runs.append(args)
+            return await real(*args, **kwargs)
+
+        monkeypatch.setattr(email_intel, "analyze_thread", spy)
+        await email_intel.update_thread_intel(thread, previous, [], model="gemini-1.5-pro")
+
+        assert len(full_runs) == 1
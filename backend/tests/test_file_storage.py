@@ -0,0 +1,108 @@
+"""
+File Storage Tests
+------------------
+Tests for streamed, content-addressed, reference-counted attachment storage.
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import os
+
+from core.ingestion.attachment_extractor import extract_attachments
+from core.storage.file_storage import FileStorage
+
+
+PDF = b"%PDF-1.4 " + b"x" * 200_000
+
+
+async def _stream(data, size=1000):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+class TestFileStorage:
+    """Tests for FileStorage.save_stream and release."""
+    
+    async def test_streams_to_sha256_address(self, tmp_path):
+        storage = FileStorage(str(tmp_path))
+        
+        blob = await storage.save_stream("att-1", _stream(PDF))
+        
+        assert blob.digest == hashlib.sha256(PDF).hexdigest()
+        assert blob.path.endswith(os.path.join(blob.digest[:2], blob.digest))
+        assert blob.size_bytes == len(PDF) and blob.created
+        assert await storage.get(blob.path) == PDF
+        assert os.listdir(tmp_path / "tmp") == []
+    
+    async def test_same_content_stored_once(self, tmp_path):
+        storage = FileStorage(str(tmp_path))
+        
+        blobs = [await storage.save_stream(f"att-{n}", [PDF]) for n in range(30)]
+        
+        assert len({blob.path for blob in blobs}) == 1
+        assert await storage.ref_count(blobs[0].path) == 30
+        stats = storage.stats()
+        assert stats["blobs_written"] == 1 and stats["dedup_hits"] == 29
+        assert stats["bytes_written"] == len(PDF)
+    
+    async def test_resaving_a_ref_is_idempotent(self, tmp_path):
+        storage = FileStorage(str(tmp_path))
+        
+        await storage.save_stream("att-1", [PDF])
+        blob = await storage.save_stream("att-1", [PDF])
+        
+        assert await storage.ref_count(blob.path) == 1
+    
+    async def test_blob_deleted_with_last_reference(self, tmp_path):
+        storage = FileStorage(str(tmp_path))
+        blob = await storage.save_stream("att-1", [PDF])
+        await storage.save_stream("att-2", [PDF])
+        
+        assert await storage.release(blob.path, "att-1") is False
+        assert os.path.exists(blob.path)
+        assert await storage.release(blob.path, "att-2") is True
+        assert not os.path.exists(blob.path)
+        assert await storage.ref_count(blob.path) == 0
+    
+    async def test_locks_are_dropped_once_released(self, tmp_path):
+        storage = FileStorage(str(tmp_path))
+        
+        blobs = await asyncio.gather(*(storage.save_stream(f"att-{n}", [bytes([n])]) for n in range(50)))
+        for n, blob in enumerate(blobs):
+            await storage.release(blob.path, f"att-{n}")
+        
+        assert storage._locks == {}
+    
+    async def test_waits_for_a_lock_held_by_another_process(self, tmp_path):
+        storage = FileStorage(str(tmp_path))
+        address = hashlib.sha256(PDF).hexdigest()
+        os.makedirs(tmp_path / "locks")
+        # A separate open file description conflicts like another process would
+        with open(tmp_path / "locks" / address[:2], "w") as other:
+            fcntl.flock(other, fcntl.LOCK_EX)
+            save = asyncio.create_task(storage.save_stream("att-1", [PDF]))
+            await asyncio.sleep(0.05)
+            assert not save.done()
+            assert not os.path.exists(storage.blob_path(address))
+            fcntl.flock(other, fcntl.LOCK_UN)
+            
+            blob = await asyncio.wait_for(save, 1)
+        
+        assert blob.created and await storage.ref_count(blob.path) == 1
+
+
+class TestExtractAttachments:
+    """Tests for extract_attachments with content-addressed storage."""
+    
+    async def test_forwarded_attachment_shares_one_blob(self, tmp_path):
+        storage = FileStorage(str(tmp_path))
+        raw = {"filename": "contract.pdf", "content_type": "application/pdf"}
+        
+        first = await extract_attachments("t1", [{**raw, "data": PDF}], storage=storage)
+        second = await extract_attachments("t2", [{**raw, "chunks": _stream(PDF)}], storage=storage)
+        
+        assert first[0].storage_path == second[0].storage_path
+        assert first[0].attachment_id != second[0].attachment_id
+        assert second[0].size_bytes == len(PDF)
+        assert await storage.ref_count(first[0].storage_path) == 2
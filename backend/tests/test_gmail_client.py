@@ -0,0 +1,94 @@
+"""
+Gmail Client Tests
+------------------
+Tests for multipart batch reads against a local fake Gmail.
+"""
+
+import pytest
+
+from core.ingestion.gmail_client import GmailBatchError, GmailClient
+from tests.fake_gmail import FakeGmail
+
+
+@pytest.fixture
+def gmail():
+    fake = FakeGmail()
+    for i in range(250):
+        fake.add_thread(f"t{i}", bodies=[f"Body {i}"])
+    return fake
+
+
+class TestBatchReads:
+    """Tests for GmailClient.get_threads / batch_get."""
+
+    async def test_demultiplexes_by_content_id(self, gmail):
+        async with gmail.client() as http:
+            client = GmailClient("token", http_client=http)
+            threads = await client.get_threads([f"t{i}" for i in range(5)])
+
+        assert list(threads) == [f"t{i}" for i in range(5)]
+        assert all(raw["id"] == thread_id for thread_id, raw in threads.items())
+
+    async def test_splits_at_batch_limit(self, gmail):
+        async with gmail.client() as http:
+            client = GmailClient("token", http_client=http)
+            threads = await client.get_threads([f"t{i}" for i in range(250)])
+
+        assert len(threads) == 250
+        assert len(gmail.requests) == 3
+        assert gmail.sub_requests == 250
+
+    async def test_round_trip_reduction(self, gmail):
+        """250 single gets vs. batched gets, counted at the stand-in."""
+        async with gmail.client() as http:
+            client = GmailClient("token", http_client=http)
+            for i in range(250):
+                await client.get_thread(f"t{i}")
+            single = len(gmail.requests)
+
+            gmail.requests.clear()
+            await client.get_threads([f"t{i}" for i in range(250)])
+            batched = len(gmail.requests)
+
+        assert single == 250
+        assert batched == 3
+
+    async def test_missing_thread_is_none(self, gmail):
+        async with gmail.client() as http:
+            client = GmailClient("token", http_client=http)
+            threads = await client.get_threads(["t1", "gone"])
+
+        assert threads["gone"] is None
+        assert threads["t1"]["id"] == "t1"
+
+    async def test_retries_only_failed_sub_requests(self, gmail):
+        gmail.failures = {"/threads/t3": [429], "/threads/t7": [503, 500]}
+
+        async with gmail.client() as http:
+            client = GmailClient("token", http_client=http, retry_backoff=0)
+            threads = await client.get_threads([f"t{i}" for i in range(10)])
+
+        assert all(threads[f"t{i}"]["id"] == f"t{i}" for i in range(10))
+        # 10 sub-requests, then t3 + t7, then t7 alone
+        assert gmail.sub_requests == 10 + 2 + 1
+        assert client.batch_retries == 3
+
+    async def test_gives_up_after_max_retries(self, gmail):
+        gmail.failures = {"/threads/t2": [503] * 10}
+
+        async with gmail.client() as http:
+            client = GmailClient("token", http_client=http, retry_backoff=0, max_batch_retries=2)
+            with pytest.raises(GmailBatchError) as error:
+                await client.get_threads(["t1", "t2"])
+
+        assert list(error.value.failures.values()) == [503]
+        assert gmail.sub_requests == 2 + 1 + 1
+
+    async def test_attachment_batch(self, gmail):
+        async with gmail.client() as http:
+            client = GmailClient("token", http_client=http)
+            results = await client.get_attachment_metadata([("m1", "a1")])
+
+        # The fake has no attachments: the sub-request 404s
+        assert results == {("m1", "a1"): None}
+        assert gmail.paths() == ["/batch/gmail/v1"]
@@ -0,0 +1,107 @@
+"""
+HTTP Client Pool Tests
+----------------------
+Tests for the shared outbound HTTP client pool.
+"""
+
+import asyncio
+
+import httpx
+
+from core.auth import oauth_google
+from core.ingestion import gmail_client
+from core.ingestion.gmail_client import GmailClient
+from core.network.http_pool import HttpClientPool
+from tests.fake_gmail import FakeGmail
+
+
+def _slow_transport(delay=0.02):
+    async def handle(request):
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json={"host": request.url.host})
+    return httpx.MockTransport(handle)
+
+
+class TestHttpClientPool:
+    """Tests for HttpClientPool."""
+
+    async def test_limits_concurrency_per_host(self):
+        pool = HttpClientPool(max_per_host=3, transport=_slow_transport())
+        await pool.start()
+
+        await asyncio.gather(
+            *(pool.client.get("https://a.test/") for _ in range(10)),
+            *(pool.client.get("https://b.test/") for _ in range(2)),
+        )
+        stats = pool.stats()
+        await pool.close()
+
+        assert stats["hosts"]["a.test"]["peak_in_flight"] == 3
+        assert stats["hosts"]["a.test"]["requests"] == 10
+        assert stats["hosts"]["b.test"]["peak_in_flight"] == 2
+        assert stats["in_flight"] == 0
+        assert stats["waiting"] == 0
+
+    async def test_slot_released_on_transport_error(self):
+        def broken(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        pool = HttpClientPool(max_per_host=1, transport=httpx.MockTransport(broken))
+        for _ in range(3):
+            try:
+                await pool.client.get("https://a.test/")
+            except httpx.ConnectError:
+                pass
+
+        assert pool.stats()["hosts"]["a.test"]["in_flight"] == 0
+        await pool.close()
+
+    async def test_lifecycle(self):
+        pool = HttpClientPool(transport=_slow_transport(0))
+        assert not pool.stats()["started"]
+
+        await pool.start()
+        client = pool.client
+        await pool.start()
+        assert pool.client is client
+        assert pool.stats()["started"]
+
+        await pool.close()
+        assert not pool.stats()["started"]
+
+
+class TestPoolInjection:
+    """Outbound callers default to the shared pool."""
+
+    async def test_gmail_client_uses_pool(self, monkeypatch):
+        gmail = FakeGmail()
+        gmail.add_thread("t1")
+        pool = HttpClientPool(transport=httpx.MockTransport(gmail.handle))
+        monkeypatch.setattr(gmail_client, "http_pool", pool)
+
+        async with GmailClient("token") as client:
+            await client.get_thread("t1")
+        async with GmailClient("token") as client:
+            await client.get_thread("t1")
+
+        assert pool.stats()["requests"] == 2
+        # Closing a GmailClient leaves the shared client open
+        assert pool.stats()["started"]
+        await pool.close()
+
+    async def test_oauth_refresh_uses_pool(self, monkeypatch):
+        seen = []
+
+        def handle(request):
+            seen.append(request)
+            return httpx.Response(200, json={"access_token": "new", "expires_in": 3600})
+
+        pool = HttpClientPool(transport=httpx.MockTransport(handle))
+        monkeypatch.setattr(oauth_google, "http_pool", pool)
+
+        tokens = await oauth_google.refresh_access_token("refresh-1")
+
+        assert tokens.access_token == "new"
+        assert b"grant_type=refresh_token" in seen[0].content
+        assert pool.stats()["hosts"]["oauth2.googleapis.com"]["requests"] == 1
+        await pool.close()
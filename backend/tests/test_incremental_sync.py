@@ -0,0 +1,84 @@
+"""
+Incremental Sync Tests
+----------------------
+Tests for Gmail history-based sync against a local fake Gmail.
+"""
+
+import pytest
+
+from core.ingestion import email_fetcher
+from core.ingestion.gmail_client import GmailClient
+from core.ingestion.incremental_sync import GmailHistorySync
+from tests.fake_gmail import FakeGmail
+
+
+@pytest.fixture
+def gmail(monkeypatch):
+    monkeypatch.setattr(email_fetcher, "GMAIL_PAGE_SIZE", 10)
+    fake = FakeGmail()
+    for i in range(25):
+        fake.add_thread(f"t{i}")
+    return fake
+
+
+async def _sync(gmail, cursor):
+    async with gmail.client() as http:
+        sync = GmailHistorySync(GmailClient("token", http_client=http), cursor)
+        threads = [t async for t in sync.changed_threads()]
+    return sync, threads
+
+
+class TestGmailHistorySync:
+    """Tests for GmailHistorySync."""
+
+    async def test_first_sync_is_full(self, gmail):
+        sync, threads = await _sync(gmail, None)
+
+        assert sync.full_resync
+        assert len(threads) == 25
+        assert sync.cursor == str(gmail.history_id)
+
+    async def test_fetches_only_changed_threads(self, gmail):
+        first, _ = await _sync(gmail, None)
+        gmail.add_message("t3", "Following up")
+        gmail.add_message("t3", "Any news?")
+        gmail.add_thread("t99", bodies=["New thread"])
+        gmail.requests.clear()
+
+        sync, threads = await _sync(gmail, first.cursor)
+
+        assert not sync.full_resync
+        assert sorted(t.external_id for t in threads) == ["t3", "t99"]
+        assert len(next(t for t in threads if t.external_id == "t3").messages) == 3
+        # No mailbox listing: one history page plus one batch for the changed threads
+        assert "/gmail/v1/users/me/threads" not in gmail.paths()
+        assert len(gmail.requests) == 1 + 1
+        assert sync.cursor == str(gmail.history_id)
+
+    async def test_no_changes(self, gmail):
+        first, _ = await _sync(gmail, None)
+
+        sync, threads = await _sync(gmail, first.cursor)
+
+        assert threads == []
+        assert sync.cursor == first.cursor
+
+    async def test_reports_deleted_threads(self, gmail):
+        first, _ = await _sync(gmail, None)
+        gmail.delete_thread("t7")
+
+        sync, threads = await _sync(gmail, first.cursor)
+
+        assert threads == []
+        assert sync.deleted_thread_ids == ["t7"]
+
+    async def test_expired_cursor_falls_back_to_full_resync(self, gmail):
+        first, _ = await _sync(gmail, None)
+        gmail.add_message("t1", "Hello again")
+        gmail.expire_history()
+
+        sync, threads = await _sync(gmail, first.cursor)
+
+        assert sync.full_resync
+        assert len(threads) == 25
+        assert sync.cursor == str(gmail.history_id)
@@ -0,0 +1,207 @@
+"""
+Intel Cache Tests
+-----------------
+Tests for content-hash keyed ThreadIntelV1 caching.
+"""
+
+import importlib
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from contracts.mocks import create_mock_email_thread, create_mock_thread_intel
+from core.intelligence.intel_cache import IntelCache, compute_thread_hash
+
+# The package re-exports the `intel_cache` singleton under the module's name
+intel_cache_module = importlib.import_module("core.intelligence.intel_cache")
+
+
+MODEL = "gemini-1.5-pro"
+
+
+class FakeSession:
+    """Async session stand-in that returns one stored row."""
+
+    def __init__(self, row):
+        self.row = row
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        return SimpleNamespace(first=lambda: self.row)
+
+
+class RecordingSession(FakeSession):
+    """Session stand-in that records statements; the thread row belongs to user-1."""
+
+    def __init__(self):
+        super().__init__(None)
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        compiled = statement.compile(dialect=postgresql.dialect())
+        self.statements.append((str(compiled), compiled.params))
+        return SimpleNamespace(first=lambda: None, scalar_one_or_none=lambda: "user-1")
+
+    async def commit(self):
+        self.commits += 1
+
+
+class FailingSession(FakeSession):
+    """Session stand-in whose statements fail with ``error``."""
+
+    def __init__(self, error):
+        super().__init__(None)
+        self.error = error
+
+    async def execute(self, statement):
+        raise self.error
+
+
+class TestComputeThreadHash:
+    """Tests for the cache key."""
+
+    def test_stable_for_same_content(self):
+        """Equal threads should hash equally."""
+        thread = create_mock_email_thread()
+        copy = thread.model_copy(deep=True)
+        assert compute_thread_hash(thread, MODEL) == compute_thread_hash(copy, MODEL)
+
+    def test_changes_with_new_message_body(self):
+        """Editing a message body should change the key."""
+        thread = create_mock_email_thread()
+        before = compute_thread_hash(thread, MODEL)
+        thread.messages[0].body_text += " One more line."
+        assert compute_thread_hash(thread, MODEL) != before
+
+    def test_changes_with_model(self):
+        """Different models should not share cached intel."""
+        thread = create_mock_email_thread()
+        assert compute_thread_hash(thread, MODEL) != compute_thread_hash(thread, "gpt-4o")
+
+
+class TestIntelCache:
+    """Tests for the in-process tier and counters."""
+
+    async def test_hit_after_put(self):
+        cache = IntelCache()
+        thread = create_mock_email_thread()
+        intel = create_mock_thread_intel()
+
+        assert await cache.get(thread, MODEL) is None
+        await cache.put(thread, MODEL, intel)
+
+        assert await cache.get(thread, MODEL) is intel
+        assert cache.stats()["memory_hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    async def test_changed_thread_misses(self):
+        cache = IntelCache()
+        thread = create_mock_email_thread()
+        await cache.put(thread, MODEL, create_mock_thread_intel())
+
+        thread.messages[-1].body_text = "Actually, never mind."
+        assert await cache.get(thread, MODEL) is None
+
+    async def test_evicts_least_recently_used(self):
+        cache = IntelCache(max_entries=2)
+        threads = []
+        for i in range(3):
+            thread = create_mock_email_thread()
+            thread.thread_id = f"thread-{i}"
+            threads.append(thread)
+            await cache.put(thread, MODEL, create_mock_thread_intel())
+
+        assert cache.evictions == 1
+        assert await cache.get(threads[0], MODEL) is None
+        assert await cache.get(threads[2], MODEL) is not None
+
+    async def test_get_or_analyze_skips_unchanged(self, monkeypatch):
+        calls = []
+
+        async def fake_analyze(thread, model):
+            calls.append(thread.thread_id)
+            return create_mock_thread_intel()
+
+        monkeypatch.setattr(intel_cache_module, "analyze_thread", fake_analyze)
+        cache = IntelCache()
+        thread = create_mock_email_thread()
+
+        await cache.get_or_analyze(thread, MODEL)
+        await cache.get_or_analyze(thread, MODEL)
+
+        assert len(calls) == 1
+
+    async def test_database_tier(self):
+        """A matching hash in the database should be served and promoted."""
+        thread = create_mock_email_thread()
+        intel = create_mock_thread_intel()
+        row = SimpleNamespace(
+            intel_hash=compute_thread_hash(thread, MODEL),
+            intel_json=intel.model_dump(mode="json"),
+        )
+        cache = IntelCache(session_factory=lambda: FakeSession(row))
+
+        cached = await cache.get(thread, MODEL)
+
+        assert cached is not None
+        assert cached.summary == intel.summary
+        assert cache.db_hits == 1
+        assert await cache.get(thread, MODEL) is cached
+        assert cache.memory_hits == 1
+
+    async def test_database_tier_stale_hash(self):
+        thread = create_mock_email_thread()
+        row = SimpleNamespace(
+            intel_hash="stale",
+            intel_json=create_mock_thread_intel().model_dump(mode="json"),
+        )
+        cache = IntelCache(session_factory=lambda: FakeSession(row))
+
+        assert await cache.get(thread, MODEL) is None
+        assert cache.misses == 1
+
+    async def test_put_refreshes_summary_projection(self):
+        """Re-analyzed intel must reach the inbox list, not just the thread row."""
+        thread = create_mock_email_thread()
+        intel = create_mock_thread_intel().model_copy(update={"summary": "Fresh summary"})
+        session = RecordingSession()
+        cache = IntelCache(session_factory=lambda: session)
+
+        await cache.put(thread, MODEL, intel)
+
+        [(update_sql, _), (summary_sql, params)] = session.statements
+        assert update_sql.startswith("UPDATE threads") and "RETURNING threads.user_id" in update_sql
+        assert "INSERT INTO thread_summaries" in summary_sql
+        assert "ON CONFLICT (thread_id) DO UPDATE" in summary_sql
+        assert params["summary"] == "Fresh summary"
+        assert params["user_id"] == "user-1"
+        assert session.commits == 1
+
+    async def test_database_outage_is_a_miss(self):
+        error = OperationalError("SELECT", {}, ConnectionRefusedError())
+        cache = IntelCache(session_factory=lambda: FailingSession(error))
+        thread = create_mock_email_thread()
+
+        assert await cache.get(thread, MODEL) is None
+        await cache.put(thread, MODEL, create_mock_thread_intel())
+        assert cache.db_errors == 2
+
+    async def test_schema_errors_are_raised(self):
+        """A missing intel_hash column (unapplied migration) must not pass as misses."""
+        error = ProgrammingError("SELECT", {}, Exception("column threads.intel_hash does not exist"))
+        cache = IntelCache(session_factory=lambda: FailingSession(error))
+        thread = create_mock_email_thread()
+
+        with pytest.raises(ProgrammingError):
+            await cache.get(thread, MODEL)
+        with pytest.raises(ProgrammingError):
+            await cache.put(thread, MODEL, create_mock_thread_intel())
+        assert cache.db_errors == 0
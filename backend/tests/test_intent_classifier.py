@@ -0,0 +1,125 @@
+"""
+Intent Classifier Tests
+-----------------------
+KeywordMatcher must reproduce the original per-list substring counting,
+and classify_intents must agree with classify_intent thread for thread.
+"""
+
+import random
+
+from contracts import IntentType
+from contracts.mocks import create_mock_email_thread
+from core.intelligence.intent_classifier import (
+    DEFAULT_KEYWORD_MATCHER,
+    FYI_KEYWORDS,
+    SCHEDULING_KEYWORDS,
+    URGENT_KEYWORDS,
+    _classify_by_keywords,
+    classify_intent,
+    classify_intents,
+)
+from tests.demo_data import ALL_TEST_SCENARIOS
+
+
+def legacy_classify(text):
+    """Original implementation: one substring scan per keyword per list."""
+    urgent_count = sum(1 for kw in URGENT_KEYWORDS if kw in text)
+    if urgent_count >= 2:
+        return IntentType.URGENT, 90
+    elif urgent_count >= 1:
+        return IntentType.ACTION_REQUIRED, 70
+    scheduling_count = sum(1 for kw in SCHEDULING_KEYWORDS if kw in text)
+    if scheduling_count >= 2:
+        return IntentType.SCHEDULING, 50
+    fyi_count = sum(1 for kw in FYI_KEYWORDS if kw in text)
+    if fyi_count >= 1:
+        return IntentType.FYI, 20
+    if "?" in text:
+        return IntentType.ACTION_REQUIRED, 50
+    return IntentType.FYI, 30
+
+
+def demo_texts():
+    for scenario in ALL_TEST_SCENARIOS.values():
+        email = scenario["raw_email"]
+        for msg in email["messages"]:
+            yield f"{email['subject'].lower()} {msg['body_text'].lower()}"
+
+
+class TestKeywordMatcher:
+    """Tests for KeywordMatcher / KeywordScan."""
+
+    def test_identical_on_demo_scenarios(self):
+        for text in demo_texts():
+            assert _classify_by_keywords(text) == legacy_classify(text)
+
+    def test_identical_on_random_text(self):
+        words = URGENT_KEYWORDS + SCHEDULING_KEYWORDS + FYI_KEYWORDS + [
+            "afternoon", "team", "hello", "?", "the", "slotoday", "noon",
+        ]
+        rng = random.Random(7)
+        for _ in range(2000):
+            text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 6)))
+            assert _classify_by_keywords(text) == legacy_classify(text), text
+
+    def test_counts_all_groups(self):
+        scan = DEFAULT_KEYWORD_MATCHER.scan("urgent: meeting this afternoon, fyi")
+        assert scan.counts() == {"urgent": 1, "scheduling": 3, "fyi": 1}
+
+    def test_contained_keyword_is_implied(self):
+        scan = DEFAULT_KEYWORD_MATCHER.scan("see you this afternoon")
+        assert scan.has("afternoon")
+        assert scan.count("scheduling") == 2  # afternoon + noon
+
+    def test_extended_keyword_sets(self):
+        matcher = DEFAULT_KEYWORD_MATCHER.extended({"urgent": ["board meeting"]})
+        text = "board meeting prep"
+
+        assert _classify_by_keywords(text) == (IntentType.FYI, 30)
+        assert _classify_by_keywords(text, matcher) == (IntentType.ACTION_REQUIRED, 70)
+        assert DEFAULT_KEYWORD_MATCHER.scan(text).count("urgent") == 0
+
+
+def random_threads(count, seed=11):
+    """Mock threads with random bodies, senders, participants and attachments."""
+    words = URGENT_KEYWORDS + SCHEDULING_KEYWORDS + FYI_KEYWORDS + [
+        "afternoon", "team", "hello", "?", "the", "slotoday", "noon",
+    ]
+    rng = random.Random(seed)
+    threads = []
+    for i in range(count):
+        thread = create_mock_email_thread()
+        thread.thread_id = f"thread-{i}"
+        thread.subject = " ".join(rng.choice(words) for _ in range(rng.randint(0, 3))).upper()
+        latest = thread.messages[-1]
+        latest.body_text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 6)))
+        latest.is_from_user = rng.random() < 0.1
+        if rng.random() < 0.5:
+            thread.attachments = []
+        thread.participants = thread.participants[: rng.randint(1, 5)] + [
+            f"p{n}@example.com" for n in range(rng.randint(0, 3))
+        ]
+        if rng.random() < 0.05:
+            thread.messages = []
+        threads.append(thread)
+    return threads
+
+
+class TestClassifyIntents:
+    """Tests for the vectorized batch classifier."""
+
+    async def test_matches_scalar_classifier(self):
+        threads = random_threads(1500)
+        expected = [await classify_intent(t) for t in threads]
+        assert await classify_intents(threads) == expected
+
+    async def test_matches_scalar_with_custom_keywords(self):
+        matcher = DEFAULT_KEYWORD_MATCHER.extended(
+            {"urgent": ["team"], "scheduling": ["hello", "noon"]}
+        )
+        threads = random_threads(500, seed=3)
+        expected = [await classify_intent(t, keywords=matcher) for t in threads]
+        assert await classify_intents(threads, keywords=matcher) == expected
+
+    async def test_empty_batch(self):
+        assert await classify_intents([]) == []
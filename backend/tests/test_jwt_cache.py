@@ -0,0 +1,204 @@
+"""
+JWT Cache Tests
+---------------
+Tests for the verified-token cache and logout revocation.
+"""
+
+import time
+
+from datetime import datetime
+
+import pytest
+
+from core.auth import jwt as jwt_module
+from core.auth.jwt import (
+    InMemoryRevocationStore,
+    TokenData,
+    TokenRevocations,
+    VerifiedTokenCache,
+    create_access_token,
+    revoke_token,
+    token_revocations,
+    verified_tokens,
+    verify_token,
+)
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+
+
+def _token_data(user_id="user-1"):
+    return TokenData(user_id=user_id, email="a@b.c", exp=datetime(2030, 1, 1))
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    verified_tokens.clear()
+    token_revocations.clear()
+    yield
+    verified_tokens.clear()
+    token_revocations.clear()
+
+
+class FailingBackend:
+    async def revoke(self, key, ttl):
+        raise ConnectionError("redis down")
+    
+    async def is_revoked(self, key):
+        raise ConnectionError("redis down")
+    
+    async def close(self):
+        pass
+
+
+class TestVerifiedTokenCache:
+    """Tests for VerifiedTokenCache."""
+    
+    def test_entries_expire_at_exp(self):
+        clock = FakeClock()
+        cache = VerifiedTokenCache(clock=clock)
+        cache.put("token", _token_data(), expires_at=1010.0)
+        
+        assert cache.get("token").user_id == "user-1"
+        clock.now = 1010.0
+        assert cache.get("token") is None
+        assert cache.stats()["entries"] == 0
+    
+    def test_bounded_lru(self):
+        cache = VerifiedTokenCache(max_entries=2, clock=FakeClock())
+        cache.put("a", _token_data("a"), 2000.0)
+        cache.put("b", _token_data("b"), 2000.0)
+        cache.get("a")
+        cache.put("c", _token_data("c"), 2000.0)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+    
+    def test_disabled_with_zero_entries(self):
+        cache = VerifiedTokenCache(max_entries=0)
+        cache.put("token", _token_data(), 2e9)
+        assert cache.get("token") is None
+
+
+class TestVerifyToken:
+    """Tests for cached verify_token."""
+    
+    async def test_second_verification_is_cached(self, monkeypatch):
+        token = create_access_token("user-1", "a@b.c")
+        decodes = []
+        decode = jwt_module._decode_token
+        monkeypatch.setattr(jwt_module, "_decode_token", lambda t: decodes.append(t) or decode(t))
+        
+        first = await verify_token(token)
+        second = await verify_token(token)
+        
+        assert first.user_id == second.user_id == "user-1"
+        assert len(decodes) == 1
+    
+    async def test_invalid_tokens_are_not_cached(self):
+        assert await verify_token("not.a.token") is None
+        assert verified_tokens.stats()["entries"] == 0
+    
+    async def test_logout_revokes_cached_token(self):
+        token = create_access_token("user-1", "a@b.c")
+        assert await verify_token(token) is not None
+        
+        assert await revoke_token(token) is True
+        
+        assert await verify_token(token) is None
+        assert await verify_token(create_access_token("user-2", "d@e.f")) is not None
+    
+    async def test_revocation_on_another_worker_rejects_cached_token(self):
+        token = create_access_token("user-1", "a@b.c")
+        assert await verify_token(token) is not None
+        token_data = verified_tokens.get(token)
+        
+        # Another process logged the token out through the shared store
+        await token_revocations.backend.revoke(token_data.jti, 60)
+        
+        assert await verify_token(token) is None
+        assert verified_tokens.get(token) is None
+    
+    async def test_tokens_carry_distinct_jti(self):
+        first = await verify_token(create_access_token("user-1", "a@b.c"))
+        second = await verify_token(create_access_token("user-1", "a@b.c"))
+        
+        assert first.jti and second.jti and first.jti != second.jti
+
+
+class TestTokenRevocations:
+    """Tests for TokenRevocations."""
+    
+    async def test_revoked_until_the_token_expires(self):
+        clock = FakeClock()
+        revocations = TokenRevocations(clock=clock)
+        
+        await revocations.revoke("jti-1", expires_at=1010.0)
+        
+        assert await revocations.is_revoked("jti-1")
+        assert not await revocations.is_revoked("jti-2")
+        clock.now = 1010.0
+        assert not await revocations.is_revoked("jti-1")
+    
+    async def test_expired_tokens_are_not_stored(self):
+        revocations = TokenRevocations(clock=FakeClock())
+        
+        await revocations.revoke("jti-1", expires_at=999.0)
+        
+        assert revocations.stats()["local_revoked"] == 0
+    
+    async def test_backend_ttl_is_the_remaining_life(self):
+        revoked = []
+        
+        class Backend(InMemoryRevocationStore):
+            async def revoke(self, key, ttl):
+                revoked.append((key, ttl))
+        
+        await TokenRevocations(Backend(), clock=FakeClock()).revoke("jti-1", expires_at=1600.0)
+        
+        assert revoked == [("jti-1", 600.0)]
+    
+    async def test_falls_back_to_local_revocations_when_backend_fails(self):
+        revocations = TokenRevocations(FailingBackend(), clock=time.time)
+        
+        await revocations.revoke("jti-1", expires_at=time.time() + 60)
+        
+        assert await revocations.is_revoked("jti-1")
+        assert not await revocations.is_revoked("jti-2")
+        assert revocations.stats()["backend_errors"] == 2
+    
+    async def test_not_revoked_answers_are_reused_for_check_seconds(self):
+        clock = FakeClock()
+        shared = InMemoryRevocationStore(clock)
+        checks = []
+        
+        class Backend(InMemoryRevocationStore):
+            async def is_revoked(self, key):
+                checks.append(key)
+                return await shared.is_revoked(key)
+        
+        revocations = TokenRevocations(Backend(), clock=clock, check_seconds=5)
+        for _ in range(10):
+            assert not await revocations.is_revoked("jti-1")
+        assert checks == ["jti-1"]
+        
+        # Logout on another worker: seen once the remembered answer lapses
+        await shared.revoke("jti-1", 60)
+        assert not await revocations.is_revoked("jti-1")
+        clock.now += 5
+        assert await revocations.is_revoked("jti-1")
+        assert revocations.stats()["local_hits"] == 10
+    
+    async def test_own_revocations_apply_at_once(self):
+        revocations = TokenRevocations(InMemoryRevocationStore(), check_seconds=60)
+        assert not await revocations.is_revoked("jti-1")
+        
+        await revocations.revoke("jti-1", expires_at=time.time() + 60)
+        
+        assert await revocations.is_revoked("jti-1")
@@ -0,0 +1,45 @@
+"""
+Metrics Endpoint Tests
+----------------------
+Tests that /metrics is served to operators only.
+"""
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.main import app
+
+
+@pytest.fixture
+async def client():
+    # ASGITransport does not run the lifespan: no workers or pools start
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics."""
+    
+    async def test_off_without_a_configured_token(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+        
+        response = await client.get("/metrics", headers={"Authorization": "Bearer anything"})
+        
+        assert response.status_code == 404
+    
+    async def test_rejects_missing_or_wrong_token(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "operator-secret")
+        
+        assert (await client.get("/metrics")).status_code == 401
+        response = await client.get("/metrics", headers={"Authorization": "Bearer wrong"})
+        assert response.status_code == 401
+    
+    async def test_served_with_the_operator_token(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "operator-secret")
+        
+        response = await client.get("/metrics", headers={"Authorization": "Bearer operator-secret"})
+        
+        assert response.status_code == 200
+        assert "sync" in response.json()
@@ -0,0 +1,114 @@
+"""
+Outlook Delta Sync Tests
+------------------------
+Tests for Graph delta-query sync against a local fake Graph service.
+"""
+
+from contextlib import aclosing
+
+import pytest
+
+from core.ingestion.incremental_sync import OutlookDeltaSync
+from core.ingestion.outlook_client import OutlookClient
+from tests.fake_graph import FakeGraph
+
+
+@pytest.fixture
+def graph():
+    fake = FakeGraph()
+    for i in range(30):
+        fake.add_message(f"conv-{i % 10}", f"Message {i}")
+    return fake
+
+
+async def _sync(graph, cursor, page_size=7):
+    async with graph.client() as http:
+        client = OutlookClient("token", http_client=http)
+        sync = OutlookDeltaSync(client, cursor, user_email="you@company.com", page_size=page_size)
+        threads = [t async for t in sync.changed_threads()]
+    return sync, threads
+
+
+def _by_conversation(threads):
+    conversations = {}
+    for thread in threads:
+        conversations.setdefault(thread.external_id, []).extend(thread.messages)
+    return conversations
+
+
+class TestOutlookDeltaSync:
+    """Tests for OutlookDeltaSync."""
+
+    async def test_initial_sync_groups_by_conversation(self, graph):
+        sync, threads = await _sync(graph, None)
+
+        assert sync.full_resync
+        assert sync.partial
+        conversations = _by_conversation(threads)
+        assert len(conversations) == 10
+        assert all(len(messages) == 3 for messages in conversations.values())
+        assert all(t.provider == "outlook" for t in threads)
+        # Messages are ordered oldest first within each delta
+        for thread in threads:
+            assert [m.sent_at for m in thread.messages] == sorted(m.sent_at for m in thread.messages)
+        assert sync.delta_pages == 5
+        assert sync.messages_changed == 30
+        assert sync.cursor.endswith(f"$deltatoken={graph.seq}")
+    
+    async def test_yields_each_page_before_fetching_the_next(self, graph):
+        async with graph.client() as http:
+            client = OutlookClient("token", http_client=http)
+            sync = OutlookDeltaSync(client, None, page_size=7)
+            async with aclosing(sync.changed_threads()) as threads:
+                first = await anext(threads)
+        
+        assert len(graph.requests) == 1
+        assert sync.cursor is None
+        assert first.external_id.startswith("conv-")
+
+    async def test_fetches_only_churn(self, graph):
+        first, _ = await _sync(graph, None)
+        graph.add_message("conv-2", "Following up", sender="you@company.com")
+        graph.add_message("conv-new", "Hi there")
+        graph.requests.clear()
+
+        sync, threads = await _sync(graph, first.cursor)
+
+        assert not sync.full_resync
+        assert len(graph.requests) == 1
+        deltas = {t.external_id: t for t in threads}
+        assert set(deltas) == {"conv-2", "conv-new"}
+        assert [m.body_text for m in deltas["conv-2"].messages] == ["Following up"]
+        assert deltas["conv-2"].messages[0].is_from_user
+
+    async def test_changed_message_appears_once(self, graph):
+        first, _ = await _sync(graph, None)
+        message_id = next(iter(graph.messages))
+        graph.update_message(message_id, subject="Edited")
+        graph.update_message(message_id, subject="Edited twice")
+
+        sync, threads = await _sync(graph, first.cursor)
+
+        assert len(threads) == 1
+        assert [m.subject for m in threads[0].messages] == ["Edited twice"]
+
+    async def test_reports_removed_messages(self, graph):
+        first, _ = await _sync(graph, None)
+        message_id = next(iter(graph.messages))
+        graph.delete_message(message_id)
+
+        sync, threads = await _sync(graph, first.cursor)
+
+        assert threads == []
+        assert sync.removed_message_ids == [message_id]
+
+    async def test_expired_delta_link_restarts(self, graph):
+        first, _ = await _sync(graph, None)
+        graph.add_message("conv-1", "Late reply")
+        graph.expire_delta_links()
+
+        sync, threads = await _sync(graph, first.cursor)
+
+        assert sync.full_resync
+        assert len(_by_conversation(threads)) == 10
+        assert sum(len(t.messages) for t in threads) == 31
@@ -0,0 +1,108 @@
+"""
+Pagination Tests
+----------------
+Tests for keyset cursors and the thread/task list queries.
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, set_next_cursor
+from api.routes.tasks import list_tasks_query
+from api.routes.threads import list_threads_query
+from contracts import TaskStatus
+from models.task import Task
+from models.thread import Thread, ThreadSummary
+
+
+def _sql(statement):
+    compiled = statement.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+class TestCursor:
+    """Tests for cursor encoding."""
+    
+    def test_round_trip(self):
+        key = [datetime(2026, 1, 15, 9, 30), "thread-1"]
+        assert decode_cursor(encode_cursor(key), [datetime, str]) == key
+    
+    def test_malformed_cursor_is_rejected(self):
+        for cursor in ["not-a-cursor", encode_cursor([1]), encode_cursor([{"dt": "x"}, "id"])]:
+            with pytest.raises(HTTPException) as error:
+                decode_cursor(cursor, [datetime, str])
+            assert error.value.status_code == 400
+    
+    def test_tampered_values_are_rejected(self):
+        tampered = [
+            ["75", "task-3"],  # string where the score goes
+            [True, "task-3"],
+            [2**40, "task-3"],  # outside INTEGER
+            [75, 3],
+            [75, "task\x00"],
+        ]
+        for values in tampered:
+            with pytest.raises(HTTPException) as error:
+                list_tasks_query("user-1", 50, encode_cursor(values))
+            assert error.value.status_code == 400
+        
+        # Timezone-aware where the column is naive
+        with pytest.raises(HTTPException):
+            list_threads_query("user-1", 20, encode_cursor([{"dt": "2026-01-15T09:30:00+02:00"}, "thread-9"]))
+    
+    def test_next_cursor_only_on_full_page(self):
+        rows = [(90, "task-1"), (80, "task-2")]
+        
+        response = Response()
+        set_next_cursor(response, rows, 3, lambda row: row)
+        assert NEXT_CURSOR_HEADER not in response.headers
+        
+        set_next_cursor(response, rows, 2, lambda row: row)
+        assert decode_cursor(response.headers[NEXT_CURSOR_HEADER], [int, str]) == [80, "task-2"]
+
+
+class TestListQueries:
+    """Tests for the keyset list queries."""
+    
+    def test_threads_first_page(self):
+        sql, params = _sql(list_threads_query("user-1", 20))
+        assert "FROM thread_summaries" in sql and "intel_json" not in sql
+        assert "ORDER BY thread_summaries.last_updated DESC, thread_summaries.thread_id DESC" in sql
+        assert "OFFSET" not in sql
+        assert "(thread_summaries.last_updated, thread_summaries.thread_id) <" not in sql
+        assert params["user_id_1"] == "user-1"
+    
+    def test_threads_next_page_seeks_past_cursor(self):
+        cursor = encode_cursor([datetime(2026, 1, 15, 9, 30), "thread-9"])
+        sql, params = _sql(list_threads_query("user-1", 20, cursor))
+        assert "(thread_summaries.last_updated, thread_summaries.thread_id) < (" in sql
+        assert datetime(2026, 1, 15, 9, 30) in params.values()
+        assert "thread-9" in params.values()
+    
+    def test_tasks_filtered_by_status(self):
+        cursor = encode_cursor([75, "task-3"])
+        sql, params = _sql(list_tasks_query("user-1", 50, cursor, status=TaskStatus.PENDING))
+        assert "tasks.user_id = " in sql and "tasks.status = " in sql
+        assert "(tasks.priority_score, tasks.id) < (" in sql
+        assert "ORDER BY tasks.priority_score DESC, tasks.id DESC" in sql
+        assert 75 in params.values()
+    
+    def test_indexes_match_sort_order(self):
+        indexes = {
+            index.name: str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+            for table in (Thread.__table__, ThreadSummary.__table__, Task.__table__)
+            for index in table.indexes
+        }
+        assert "(user_id, last_email_at DESC, id DESC)" in indexes["idx_threads_user_last_email"]
+        assert "(user_id, last_updated DESC, thread_id DESC)" in indexes["idx_thread_summaries_user_updated"]
+        assert "(user_id, status, priority_score DESC, id DESC)" in indexes["idx_tasks_user_status_priority"]
+        assert "(user_id, priority_score DESC, id DESC)" in indexes["idx_tasks_user_priority"]
+    
+    def test_sort_keys_are_not_nullable(self):
+        # A NULL key fails the row comparison of the cursor predicate: the row is never listed
+        assert not Task.__table__.c.priority_score.nullable
+        assert not ThreadSummary.__table__.c.last_updated.nullable
@@ -0,0 +1,351 @@
+"""
+Pipeline Tests
+--------------
+Tests for the bounded-queue stage pipeline and the sync job pipeline.
+"""
+
+import asyncio
+import importlib
+import time
+
+import pytest
+
+from contracts.mocks import create_mock_email_thread, create_mock_thread_intel
+from core.intelligence import IntelCache
+from core.sync.pipeline import Pipeline, Stage
+from core.storage.thread_reader import StoredThread
+from core.storage.thread_writer import scope_thread, scoped_message_id, scoped_thread_id
+from core.sync import runner as runner_module
+from core.sync.runner import AccountSyncRunner, SyncDeletions, SyncProgress, merge_delta
+
+# The package re-exports the `intel_cache` singleton under the module's name
+intel_cache_module = importlib.import_module("core.intelligence.intel_cache")
+
+
+async def _source(count, delay=0.0):
+    for i in range(count):
+        if delay:
+            await asyncio.sleep(delay)
+        yield i
+
+
+def _sleeper(delay, transform=lambda x: x):
+    async def handler(item):
+        await asyncio.sleep(delay)
+        return transform(item)
+    return handler
+
+
+class TestPipeline:
+    """Tests for Pipeline."""
+    
+    async def test_every_item_reaches_the_last_stage(self):
+        results = []
+        
+        async def collect(item):
+            results.append(item)
+        
+        pipeline = Pipeline(_source(50), [
+            Stage("double", _sleeper(0.001, lambda x: x * 2), concurrency=4, queue_size=4),
+            Stage("collect", collect, concurrency=2, queue_size=4),
+        ])
+        await pipeline.run()
+        
+        assert sorted(results) == [i * 2 for i in range(50)]
+        stats = pipeline.stats()
+        assert stats["source"]["produced"] == 50
+        assert stats["double"]["processed"] == 50
+        assert stats["collect"]["queue_depth"] == 0
+    
+    async def test_stages_overlap(self):
+        delay = 0.02
+        pipeline = Pipeline(_source(10), [
+            Stage(name, _sleeper(delay)) for name in ("a", "b", "c")
+        ])
+        
+        started = time.perf_counter()
+        await pipeline.run()
+        
+        # Pipelined: ~(items + stages - 1) * delay rather than items * stages * delay
+        assert time.perf_counter() - started < 10 * 3 * delay * 0.75
+    
+    async def test_slow_stage_applies_backpressure(self):
+        produced_ahead = []
+        pipeline = None
+        
+        async def slow(item):
+            stats = pipeline.stats()
+            produced_ahead.append(stats["source"]["produced"] - stats["slow"]["processed"])
+            await asyncio.sleep(0.002)
+        
+        pipeline = Pipeline(_source(200), [
+            Stage("fast", _sleeper(0), concurrency=2, queue_size=2),
+            Stage("slow", slow, concurrency=1, queue_size=2),
+        ])
+        await pipeline.run()
+        
+        # Items in flight are bounded by the queues and workers, not the source size
+        assert max(produced_ahead) <= 2 + 2 + 2 + 1 + 1
+        assert pipeline.stats()["fast"]["blocked_ms"] > 0
+    
+    async def test_none_drops_item(self):
+        seen = []
+        
+        async def evens_only(item):
+            return item if item % 2 == 0 else None
+        
+        async def collect(item):
+            seen.append(item)
+        
+        await Pipeline(_source(10), [Stage("filter", evens_only), Stage("collect", collect)]).run()
+        
+        assert sorted(seen) == [0, 2, 4, 6, 8]
+    
+    async def test_batching_stage_receives_waiting_items(self):
+        batches = []
+        
+        async def collect(batch):
+            batches.append(batch)
+            await asyncio.sleep(0.01)
+        
+        pipeline = Pipeline(_source(40), [
+            Stage("write", collect, queue_size=16, batch_size=10),
+        ])
+        await pipeline.run()
+        
+        assert sorted(i for batch in batches for i in batch) == list(range(40))
+        assert max(len(batch) for batch in batches) == 10
+        assert len(batches) < 40
+        assert pipeline.stats()["write"]["processed"] == 40
+    
+    async def test_failure_cancels_the_run(self):
+        cancelled = []
+        
+        async def explode(item):
+            if item == 3:
+                raise ValueError("bad item")
+            return item
+        
+        async def slow(item):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(item)
+                raise
+        
+        pipeline = Pipeline(_source(100), [Stage("explode", explode), Stage("slow", slow)])
+        with pytest.raises(ValueError):
+            await asyncio.wait_for(pipeline.run(), 1)
+        assert cancelled
+
+
+class TestSyncPipeline:
+    """Tests for the fetch → analyze → tasks → store pipeline of a sync job."""
+    
+    async def test_counts_progress_through_all_stages(self, monkeypatch):
+        async def analyze(thread, model):
+            await asyncio.sleep(0.005)
+            return create_mock_thread_intel().model_copy(update={"thread_id": thread.thread_id})
+        
+        monkeypatch.setattr(intel_cache_module, "analyze_thread", analyze)
+        stored = []
+        
+        class Runner(AccountSyncRunner):
+            async def store(self, user_id, results, *deletions):
+                stored.extend((thread.thread_id, len(tasks)) for thread, _, tasks in results)
+        
+        async def threads():
+            for i in range(12):
+                yield create_mock_email_thread().model_copy(update={"thread_id": f"thread-{i}"})
+        
+        progress = SyncProgress()
+        pipeline = Runner(cache=IntelCache()).pipeline("user-1", threads(), progress)
+        await pipeline.run()
+        
+        assert len(stored) == 12
+        assert progress.threads_fetched == progress.threads_analyzed == 12
+        assert progress.tasks_created == sum(n for _, n in stored) > 0
+        assert set(pipeline.stats()) == {"fetch", "analyze", "tasks", "store"}
+    
+    async def test_unchanged_threads_are_served_from_the_cache(self, monkeypatch):
+        calls = []
+        
+        async def analyze(thread, model):
+            calls.append(thread.thread_id)
+            return create_mock_thread_intel().model_copy(update={"thread_id": thread.thread_id})
+        
+        monkeypatch.setattr(intel_cache_module, "analyze_thread", analyze)
+        
+        class Runner(AccountSyncRunner):
+            async def store(self, user_id, results, *deletions):
+                pass
+        
+        mailbox = [create_mock_email_thread().model_copy(update={"external_id": f"ext-{i}"}) for i in range(3)]
+        
+        async def threads():
+            for thread in mailbox:
+                yield thread
+        
+        runner = Runner(cache=IntelCache())
+        for _ in range(2):
+            await runner.pipeline("user-1", threads(), SyncProgress()).run()
+        
+        assert len(calls) == 3
+
+
+class _Session:
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _OutlookSync:
+    partial = True
+    
+    def __init__(self, full_resync=False):
+        self.full_resync = full_resync
+        self.deleted_thread_ids = []
+        self.removed_message_ids = []
+
+
+def _delta(stored, messages):
+    return stored.model_copy(update={"messages": messages, "attachments": []})
+
+
+class TestOutlookDeltas:
+    """Tests for merging Outlook deltas into the stored conversation."""
+    
+    def test_merge_keeps_stored_messages_and_drops_removed_ones(self):
+        stored = create_mock_email_thread()
+        first, second = stored.messages[0], stored.messages[-1]
+        new = second.model_copy(update={"message_id": "msg-new", "sent_at": second.sent_at.replace(year=2030)})
+        
+        thread, new_messages = merge_delta(stored, _delta(stored, [new]), {first.message_id})
+        
+        ids = [message.message_id for message in thread.messages]
+        assert first.message_id not in ids
+        assert ids[-1] == "msg-new"
+        assert len(ids) == len(stored.messages)
+        assert new_messages == [new]
+    
+    async def test_delta_rolls_the_stored_intel_forward(self, monkeypatch):
+        stored = create_mock_email_thread()
+        stored_intel = create_mock_thread_intel().model_copy(update={"thread_id": stored.thread_id})
+        new = stored.messages[-1].model_copy(update={"message_id": "msg-new"})
+        updates = []
+        
+        async def load_threads(session, user_id, thread_ids):
+            return {stored.thread_id: StoredThread(stored, stored_intel)}
+        
+        async def update_thread_intel(thread, intel, new_messages, model):
+            updates.append((len(thread.messages), intel, new_messages))
+            return intel
+        
+        async def analyze(thread, model):
+            raise AssertionError("a delta must not be analyzed on its own")
+        
+        monkeypatch.setattr(runner_module, "load_threads", load_threads)
+        monkeypatch.setattr(runner_module, "update_thread_intel", update_thread_intel)
+        monkeypatch.setattr(intel_cache_module, "analyze_thread", analyze)
+        runner = AccountSyncRunner(session_factory=_Session, cache=IntelCache())
+        
+        thread, intel = await runner.analyze_delta("user-1", _delta(stored, [new]))
+        
+        assert updates == [(len(stored.messages) + 1, stored_intel, [new])]
+        assert len(thread.messages) == len(stored.messages) + 1
+        assert intel is stored_intel
+    
+    def test_deletions_are_handed_out_once(self):
+        sync = _OutlookSync()
+        deletions = SyncDeletions("user-1", sync)
+        sync.removed_message_ids.append("a")
+        sync.deleted_thread_ids.append("ext-1")
+        
+        msg_a, msg_b = (scoped_message_id("user-1", f"msg-{id}") for id in "ab")
+        assert deletions.take() == ([scoped_thread_id("user-1", "ext-1")], [msg_a])
+        sync.removed_message_ids.append("b")
+        assert deletions.take() == ([], [msg_b])
+        assert deletions.take() == ([], [])
+        assert deletions.removed_message_ids() == {msg_a, msg_b}
+    
+    async def test_store_batches_carry_pending_deletions(self, monkeypatch):
+        async def analyze(thread, model):
+            return create_mock_thread_intel().model_copy(update={"thread_id": thread.thread_id})
+        
+        monkeypatch.setattr(intel_cache_module, "analyze_thread", analyze)
+        sync = _OutlookSync()
+        sync.partial = False
+        sync.removed_message_ids.append("gone")
+        stored = []
+        
+        class Runner(AccountSyncRunner):
+            async def store(self, user_id, results, *deletions, prune=True):
+                stored.append(deletions)
+        
+        async def threads():
+            yield create_mock_email_thread()
+        
+        pipeline = Runner(cache=IntelCache()).pipeline("user-1", threads(), SyncProgress(), SyncDeletions("user-1", sync))
+        await pipeline.run()
+        
+        assert stored == [([], [scoped_message_id("user-1", "msg-gone")])]
+    
+    async def test_merged_deltas_are_not_pruned(self, monkeypatch):
+        async def analyze(thread, model):
+            return create_mock_thread_intel().model_copy(update={"thread_id": thread.thread_id})
+        
+        monkeypatch.setattr(intel_cache_module, "analyze_thread", analyze)
+        prunes = []
+        
+        class Runner(AccountSyncRunner):
+            async def analyze_delta(self, user_id, delta, removed_message_ids=frozenset()):
+                return delta, await analyze(delta, self.model)
+            
+            async def store(self, user_id, results, *deletions, prune=True):
+                prunes.append(prune)
+        
+        async def threads():
+            yield create_mock_email_thread()
+        
+        deletions = SyncDeletions("user-1", _OutlookSync())
+        await Runner(cache=IntelCache()).pipeline("user-1", threads(), SyncProgress(), deletions).run()
+        
+        assert prunes == [False]
+    
+    def test_partial_sync_reapplies_every_removal_last(self):
+        sync = _OutlookSync()
+        deletions = SyncDeletions("user-1", sync)
+        sync.removed_message_ids.append("a")
+        deletions.take()
+        sync.removed_message_ids.append("b")
+        
+        assert deletions.finish() == ([], sorted(scoped_message_id("user-1", f"msg-{id}") for id in "ab"))
+    
+    def test_full_resync_deletes_what_it_did_not_list(self):
+        sync = _OutlookSync(full_resync=True)
+        sync.partial = False
+        deletions = SyncDeletions("user-1", sync)
+        listed = scope_thread("user-1", create_mock_email_thread())
+        deletions.seen(listed)
+        
+        gone = scoped_thread_id("user-1", "ext-gone")
+        assert deletions.finish([listed.thread_id, gone]) == ([gone], [])
+    
+    def test_full_outlook_resync_also_deletes_unlisted_messages(self):
+        sync = _OutlookSync(full_resync=True)
+        deletions = SyncDeletions("user-1", sync)
+        listed = scope_thread("user-1", create_mock_email_thread())
+        deletions.seen(listed)
+        kept = [message.message_id for message in listed.messages]
+        gone = scoped_message_id("user-1", "msg-gone")
+        
+        assert deletions.finish([listed.thread_id], kept + [gone]) == ([], [gone])
+    
+    def test_incremental_sync_does_not_reconcile(self):
+        sync = _OutlookSync()
+        sync.partial = False
+        deletions = SyncDeletions("user-1", sync)
+        
+        assert deletions.finish([scoped_thread_id("user-1", "ext-1")]) == ([], [])
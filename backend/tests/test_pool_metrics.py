@@ -0,0 +1,80 @@
+"""
+Pool Metrics Tests
+------------------
+Tests for database pool settings and checkout instrumentation.
+"""
+
+import sqlite3
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+from app.config import settings
+from core.storage.database import engine_options
+from core.storage.pool_metrics import PoolMetrics, instrumented_pool
+
+
+def _pool(metrics, size=1, overflow=1, timeout=0.05):
+    pool_class = instrumented_pool(metrics, base=QueuePool)
+    return pool_class(
+        lambda: sqlite3.connect(":memory:"),
+        pool_size=size,
+        max_overflow=overflow,
+        timeout=timeout,
+    )
+
+
+class TestPoolMetrics:
+    """Tests for the instrumented pool."""
+    
+    def test_counts_checkouts_and_connects(self):
+        metrics = PoolMetrics()
+        pool = _pool(metrics)
+        
+        for _ in range(3):
+            pool.connect().close()
+        
+        assert metrics.checkouts == 3
+        # The idle connection is reused
+        assert metrics.connects == 1
+        assert metrics.overflow_connects == 0
+    
+    def test_overflow_and_timeout(self):
+        metrics = PoolMetrics()
+        pool = _pool(metrics, size=1, overflow=1)
+        
+        held = [pool.connect(), pool.connect()]
+        assert metrics.overflow_connects == 1
+        assert metrics.peak_checked_out == 2
+        
+        with pytest.raises(exc.TimeoutError):
+            pool.connect()
+        assert metrics.timeouts == 1
+        
+        for connection in held:
+            connection.close()
+    
+    def test_pool_class_survives_recreate(self):
+        metrics = PoolMetrics()
+        pool = _pool(metrics).recreate()
+        
+        pool.connect().close()
+        
+        assert metrics.checkouts == 1
+
+
+class TestEngineOptions:
+    """Tests for engine arguments built from settings."""
+    
+    def test_pool_settings(self):
+        options = engine_options(settings.model_copy(update={"DB_POOL_SIZE": 25, "DB_POOL_PRE_PING": False}))
+        assert options["pool_size"] == 25
+        assert options["pool_pre_ping"] is False
+        assert options["url"].drivername == "postgresql+asyncpg"
+        assert options["connect_args"] == {}
+    
+    def test_statement_cache_size(self):
+        options = engine_options(settings.model_copy(update={"DB_STATEMENT_CACHE_SIZE": 0}))
+        assert options["connect_args"] == {"statement_cache_size": 0}
+        assert options["url"].query["prepared_statement_cache_size"] == "0"
@@ -0,0 +1,137 @@
+"""
+Quota Scheduler Tests
+---------------------
+Tests for per-account pacing, 429 backoff and fair interleaving.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from core.ingestion.gmail_client import GmailClient
+from core.ingestion.quota import QuotaScheduler, _retry_after
+from tests.fake_gmail import FakeGmail
+
+
+def _throttled(retry_after=None):
+    headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    request = httpx.Request("GET", "https://example.test")
+    response = httpx.Response(429, headers=headers, request=request)
+    return httpx.HTTPStatusError("429", request=request, response=response)
+
+
+async def _ok():
+    return "ok"
+
+
+class TestQuotaScheduler:
+    """Tests for QuotaScheduler."""
+    
+    async def test_paces_to_quota_rate(self):
+        # 1000 units/s at 10 units per call: ~100 calls/s after a one-call burst
+        scheduler = QuotaScheduler(rate=1000, burst=10)
+        
+        started = time.monotonic()
+        await asyncio.gather(*(scheduler.run("acct-1", _ok, cost=10) for _ in range(21)))
+        elapsed = time.monotonic() - started
+        
+        stats = scheduler.stats()["acct-1"]
+        assert elapsed >= 0.18
+        assert stats["requests"] == 21
+        assert stats["quota_units"] == 210
+        assert 60 <= stats["requests_per_second"] <= 130
+    
+    async def test_accounts_have_independent_buckets(self):
+        scheduler = QuotaScheduler(rate=1000, burst=100)
+        
+        started = time.monotonic()
+        await asyncio.gather(*(
+            scheduler.run(f"acct-{i}", _ok, cost=10) for i in range(5) for _ in range(10)
+        ))
+        
+        # Every account fits its own burst: nothing waits
+        assert time.monotonic() - started < 0.05
+    
+    async def test_round_robin_across_accounts(self):
+        scheduler = QuotaScheduler(rate=1e6, max_concurrency=1)
+        order = []
+        
+        def call(account_id):
+            async def send():
+                order.append(account_id)
+                await asyncio.sleep(0)
+            return send
+        
+        big = [scheduler.run("big", call("big")) for _ in range(50)]
+        small = [scheduler.run("small", call("small")) for _ in range(5)]
+        await asyncio.gather(*big, *small)
+        
+        # The small mailbox is not queued behind all 50 calls of the big one
+        assert max(i for i, a in enumerate(order) if a == "small") < 12
+    
+    async def test_429_honours_retry_after_and_slows_down(self):
+        scheduler = QuotaScheduler(rate=1000, burst=100)
+        attempts = []
+        
+        async def flaky():
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                raise _throttled("0.1")
+            return "ok"
+        
+        assert await scheduler.run("acct-1", flaky, cost=10) == "ok"
+        
+        stats = scheduler.stats()["acct-1"]
+        assert attempts[1] - attempts[0] >= 0.09
+        assert stats["throttled"] == 1
+        assert stats["current_rate"] < 1000
+    
+    async def test_gives_up_after_max_retries(self):
+        scheduler = QuotaScheduler(rate=1000, max_retries=2, base_backoff=0.01)
+        attempts = []
+        
+        async def always_throttled():
+            attempts.append(1)
+            raise _throttled()
+        
+        with pytest.raises(httpx.HTTPStatusError):
+            await scheduler.run("acct-1", always_throttled)
+        assert len(attempts) == 3
+    
+    async def test_other_errors_are_not_retried(self):
+        scheduler = QuotaScheduler(rate=1000)
+        request = httpx.Request("GET", "https://example.test")
+        
+        async def missing():
+            raise httpx.HTTPStatusError("404", request=request, response=httpx.Response(404, request=request))
+        
+        with pytest.raises(httpx.HTTPStatusError):
+            await scheduler.run("acct-1", missing)
+        assert scheduler.stats()["acct-1"]["throttled"] == 0
+    
+    def test_retry_after_formats(self):
+        assert _retry_after(_throttled("7").response) == 7.0
+        assert _retry_after(_throttled("Wed, 21 Oct 2015 07:28:00 GMT").response) == 0.0
+        assert _retry_after(_throttled().response) is None
+
+
+class TestGmailClientPacing:
+    """Tests for quota accounting in GmailClient."""
+    
+    async def test_charges_operation_costs(self):
+        gmail = FakeGmail()
+        for i in range(3):
+            gmail.add_thread(f"t{i}")
+        scheduler = QuotaScheduler(rate=1e6)
+        
+        async with gmail.client() as http:
+            client = GmailClient("token", http_client=http, account_id="acct-1", scheduler=scheduler)
+            await client.list_threads()
+            await client.get_thread("t0")
+            await client.get_threads(["t1", "t2"])
+        
+        stats = scheduler.stats()["acct-1"]
+        assert stats["requests"] == 3
+        assert stats["quota_units"] == 10 + 10 + 2 * 10
@@ -0,0 +1,106 @@
+"""
+Rate Limit Tests
+----------------
+Tests for the in-memory sliding-window limiter and per-IP/per-user limits.
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from api.middleware.rate_limit import InMemoryRateLimiter, RateLimiter
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+
+
+class FailingBackend:
+    async def hit(self, key, limit, window):
+        raise ConnectionError("redis down")
+    
+    async def close(self):
+        pass
+
+
+class TestInMemoryRateLimiter:
+    """Tests for InMemoryRateLimiter."""
+    
+    async def test_limit_within_window(self):
+        clock = FakeClock()
+        limiter = InMemoryRateLimiter(clock)
+        
+        results = [await limiter.hit("ip:1", 3, 60) for _ in range(4)]
+        
+        assert [allowed for allowed, _ in results] == [True, True, True, False]
+        assert 0 < results[-1][1] <= 60
+    
+    async def test_previous_window_slides_out(self):
+        clock = FakeClock(1019.0)  # end of window [960, 1020)
+        limiter = InMemoryRateLimiter(clock)
+        for _ in range(10):
+            await limiter.hit("ip:1", 10, 60)
+        
+        # Start of the next window: the previous one still fully counts
+        clock.now = 1020.0
+        assert (await limiter.hit("ip:1", 10, 60))[0] is False
+        # Halfway through, half of it has slid out
+        clock.now = 1050.0
+        allowed = [(await limiter.hit("ip:1", 10, 60))[0] for _ in range(6)]
+        assert allowed == [True] * 5 + [False]
+    
+    async def test_keys_are_separate(self):
+        limiter = InMemoryRateLimiter(FakeClock())
+        
+        assert (await limiter.hit("ip:1", 1, 60))[0]
+        assert (await limiter.hit("ip:2", 1, 60))[0]
+        assert not (await limiter.hit("ip:1", 1, 60))[0]
+    
+    async def test_idle_keys_expire(self):
+        clock = FakeClock()
+        limiter = InMemoryRateLimiter(clock)
+        for n in range(100):
+            await limiter.hit(f"ip:{n}", 5, 60)
+        assert len(limiter) == 100
+        
+        clock.now += 125
+        await limiter.hit("ip:new", 5, 60)
+        
+        assert len(limiter) == 1
+
+
+class TestRateLimiter:
+    """Tests for per-IP and per-user limits."""
+    
+    async def test_ip_limit_raises_429_with_retry_after(self):
+        limiter = RateLimiter(ip_limit=2, user_limit=10)
+        await limiter.check("10.0.0.1")
+        await limiter.check("10.0.0.1")
+        
+        with pytest.raises(HTTPException) as error:
+            await limiter.check("10.0.0.1")
+        
+        assert error.value.status_code == 429
+        assert int(error.value.headers["Retry-After"]) >= 1
+        assert limiter.stats()["limited"] == 1
+    
+    async def test_user_limit_applies_across_ips(self):
+        limiter = RateLimiter(ip_limit=10, user_limit=2)
+        await limiter.check("10.0.0.1", "user-1")
+        await limiter.check("10.0.0.2", "user-1")
+        
+        with pytest.raises(HTTPException):
+            await limiter.check("10.0.0.3", "user-1")
+        await limiter.check("10.0.0.3", "user-2")
+    
+    async def test_backend_failure_falls_back_to_memory(self):
+        limiter = RateLimiter(FailingBackend(), ip_limit=1)
+        
+        await limiter.check("10.0.0.1")
+        with pytest.raises(HTTPException):
+            await limiter.check("10.0.0.1")
+        
+        assert limiter.stats()["backend_errors"] == 2
@@ -0,0 +1,185 @@
+"""
+Sync Worker Tests
+-----------------
+Tests for job leasing, heartbeats and the sync worker pool.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy.dialects import postgresql
+
+from core.sync import InMemoryJobQueue, SyncJobQueue, SyncWorkerPool
+from models.sync_job import SyncJobStatus
+
+
+NOW = datetime(2026, 1, 18, 12, 0)
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+
+
+def _pool(queue, run_job, **kwargs):
+    kwargs.setdefault("size", 2)
+    return SyncWorkerPool(queue, run_job, heartbeat_seconds=0.01, poll_seconds=0.01, node_id="test", **kwargs)
+
+
+async def _wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.005)
+
+
+class TestJobQueue:
+    """Tests for leasing in InMemoryJobQueue and the Postgres claim query."""
+    
+    async def test_one_active_job_per_account(self):
+        queue = InMemoryJobQueue()
+        
+        first = await queue.enqueue("user-1", "acct-1")
+        again = await queue.enqueue("user-1", "acct-1")
+        other = await queue.enqueue("user-1", "acct-2")
+        
+        assert again.id == first.id
+        assert other.id != first.id
+    
+    async def test_expired_lease_is_reclaimed(self):
+        clock = Clock(NOW)
+        queue = InMemoryJobQueue(lease_seconds=60, clock=clock)
+        job = await queue.enqueue("user-1", "acct-1")
+        
+        assert (await queue.claim("crashed")).id == job.id
+        assert await queue.claim("worker-2") is None
+        
+        clock.now = NOW + timedelta(seconds=61)
+        reclaimed = await queue.claim("worker-2")
+        
+        assert reclaimed.id == job.id
+        assert reclaimed.attempts == 2
+        # The crashed worker's late heartbeat is refused
+        assert not await queue.heartbeat(job.id, "crashed", {})
+        assert await queue.heartbeat(job.id, "worker-2", {"threads_fetched": 3})
+        assert job.threads_fetched == 3
+    
+    async def test_gives_up_after_max_attempts(self):
+        clock = Clock(NOW)
+        queue = InMemoryJobQueue(lease_seconds=60, max_attempts=2, retry_backoff_seconds=10, clock=clock)
+        job = await queue.enqueue("user-1", "acct-1")
+        
+        await queue.claim("w")
+        await queue.fail(job.id, "w", "boom", {})
+        assert job.status == SyncJobStatus.QUEUED
+        assert await queue.claim("w") is None  # backing off
+        
+        clock.now = NOW + timedelta(seconds=11)
+        await queue.claim("w")
+        await queue.fail(job.id, "w", "boom", {})
+        assert job.status == SyncJobStatus.FAILED
+    
+    def test_postgres_claim_skips_locked_rows(self):
+        statement = SyncJobQueue().claim_statement("worker-1", NOW)
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "RETURNING" in sql
+
+
+class TestSyncWorkerPool:
+    """Tests for SyncWorkerPool."""
+    
+    async def test_runs_jobs_and_records_progress(self):
+        queue = InMemoryJobQueue()
+        
+        async def run_job(job, progress):
+            for _ in range(5):
+                progress.threads_fetched += 1
+                progress.threads_analyzed += 1
+                await asyncio.sleep(0.005)
+            progress.tasks_created = 2
+        
+        jobs = [await queue.enqueue("user-1", f"acct-{i}") for i in range(3)]
+        pool = _pool(queue, run_job)
+        pool.start()
+        await _wait_for(lambda: pool.jobs_succeeded == 3)
+        await pool.stop()
+        
+        for job in jobs:
+            assert job.status == SyncJobStatus.SUCCEEDED
+            assert (job.threads_fetched, job.threads_analyzed, job.tasks_created) == (5, 5, 2)
+    
+    async def test_heartbeat_flushes_live_counters(self):
+        queue = InMemoryJobQueue()
+        release = asyncio.Event()
+        
+        async def run_job(job, progress):
+            progress.threads_fetched = 7
+            await release.wait()
+        
+        job = await queue.enqueue("user-1", "acct-1")
+        pool = _pool(queue, run_job, size=1)
+        pool.start()
+        await _wait_for(lambda: job.threads_fetched == 7)
+        
+        assert job.status == SyncJobStatus.RUNNING
+        assert pool.progress(job.id).threads_fetched == 7
+        release.set()
+        await _wait_for(lambda: job.status == SyncJobStatus.SUCCEEDED)
+        await pool.stop()
+    
+    async def test_failed_job_is_requeued(self):
+        queue = InMemoryJobQueue(retry_backoff_seconds=0)
+        
+        async def run_job(job, progress):
+            raise RuntimeError("provider down")
+        
+        job = await queue.enqueue("user-1", "acct-1")
+        pool = _pool(queue, run_job, size=1)
+        pool.start()
+        await _wait_for(lambda: job.status == SyncJobStatus.FAILED)
+        await pool.stop()
+        
+        assert job.attempts == 3
+        assert pool.jobs_failed == 3
+        assert "provider down" in job.error
+    
+    async def test_lost_lease_stops_the_job(self):
+        queue = InMemoryJobQueue()
+        cancelled = asyncio.Event()
+        
+        async def run_job(job, progress):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        
+        job = await queue.enqueue("user-1", "acct-1")
+        pool = _pool(queue, run_job, size=1)
+        pool.start()
+        await _wait_for(lambda: job.status == SyncJobStatus.RUNNING)
+        job.leased_by = "other-node/0"  # re-claimed elsewhere after a stall
+        
+        await asyncio.wait_for(cancelled.wait(), 1)
+        await pool.stop()
+        assert pool.leases_lost == 1
+    
+    async def test_stop_returns_running_jobs_to_queue(self):
+        queue = InMemoryJobQueue(retry_backoff_seconds=0)
+        
+        async def run_job(job, progress):
+            await asyncio.sleep(10)
+        
+        job = await queue.enqueue("user-1", "acct-1")
+        pool = _pool(queue, run_job, size=1)
+        pool.start()
+        await _wait_for(lambda: job.status == SyncJobStatus.RUNNING)
+        await pool.stop()
+        
+        assert job.status == SyncJobStatus.QUEUED
+        assert job.leased_by is None
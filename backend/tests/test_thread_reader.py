@@ -0,0 +1,88 @@
+"""
+Thread Reader Tests
+-------------------
+Tests for loading stored threads back into EmailThreadV1.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from contracts.mocks import create_mock_thread_intel
+from core.storage.thread_reader import load_threads
+from models.attachment import Attachment
+from models.thread import Message, Thread
+
+
+SENT = datetime(2026, 1, 15, 9, 30)
+
+
+class CannedSession:
+    """Session stand-in answering each execute() with the next canned result."""
+    
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+    
+    async def execute(self, statement):
+        self.statements.append(statement)
+        rows = self.results.pop(0)
+        return SimpleNamespace(
+            scalars=lambda: SimpleNamespace(all=lambda: rows),
+            all=lambda: rows,
+        )
+
+
+def _thread_row(intel_json=None):
+    return Thread(
+        id="thread-1",
+        user_id="user-1",
+        external_id="ext-1",
+        subject="Contract",
+        participants=["a@example.com"],
+        provider="outlook",
+        intel_json=intel_json,
+        last_email_at=SENT,
+    )
+
+
+class TestLoadThreads:
+    """Tests for load_threads."""
+    
+    async def test_rebuilds_thread_with_messages_and_attachments(self):
+        intel = create_mock_thread_intel()
+        message = Message(
+            id="msg-1", thread_id="thread-1", from_address="a@example.com",
+            subject="Contract", body_text="Please review", is_from_user=False, sent_at=SENT,
+        )
+        attachment = Attachment(
+            id="att-1", message_id="msg-1", user_id="user-1", filename="c.pdf",
+            mime_type="application/pdf", size_bytes=10, storage_path="/blobs/ab/abc",
+        )
+        session = CannedSession(
+            [_thread_row(intel.model_dump(mode="json"))],
+            [message],
+            [(attachment, "thread-1")],
+        )
+        
+        stored = (await load_threads(session, "user-1", ["thread-1"]))["thread-1"]
+        
+        assert stored.thread.external_id == "ext-1"
+        assert [m.message_id for m in stored.thread.messages] == ["msg-1"]
+        assert stored.thread.attachments[0].message_id == "msg-1"
+        assert stored.thread.last_updated == SENT
+        assert stored.intel.summary == intel.summary
+    
+    async def test_only_the_users_threads(self):
+        session = CannedSession([])
+        
+        assert await load_threads(session, "user-2", ["thread-1"]) == {}
+        [statement] = session.statements
+        assert "threads.user_id = " in str(statement)
+    
+    async def test_unanalyzed_thread_has_no_intel(self):
+        session = CannedSession([_thread_row()], [], [])
+        
+        stored = (await load_threads(session, "user-1", ["thread-1"]))["thread-1"]
+        
+        assert stored.intel is None
+        assert stored.thread.messages == []
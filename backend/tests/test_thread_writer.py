@@ -0,0 +1,315 @@
+"""
+Thread Writer Tests
+-------------------
+Tests for bulk upsert statements built by ThreadWriter.
+"""
+
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from core.storage.file_storage import FileStorage
+
+from contracts import AttachmentRef
+from contracts.mocks import create_mock_email_thread, create_mock_thread_intel
+from core.storage.thread_writer import ThreadWriter, scoped_attachment_id, scoped_message_id, scoped_thread_id
+from core.workflow import generate_tasks
+from models.task import TaskStatus
+
+
+class RecordingSession:
+    """Session factory that compiles and records executed statements."""
+    
+    def __init__(self, rows=None):
+        self.statements = []
+        self.commits = 0
+        # Canned result rows by statement prefix (e.g. "DELETE FROM messages")
+        self.rows = rows or {}
+    
+    def __call__(self):
+        return self
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    async def execute(self, statement):
+        compiled = statement.compile(dialect=postgresql.dialect())
+        self.statements.append((str(compiled), compiled.params))
+        rows = next((rows for prefix, rows in self.rows.items() if str(compiled).startswith(prefix)), [])
+        return SimpleNamespace(all=lambda: rows, scalars=lambda: iter([row[0] for row in rows]))
+    
+    async def commit(self):
+        self.commits += 1
+    
+    def sql(self, table):
+        return [sql for sql, _ in self.statements if f"INSERT INTO {table} " in sql]
+
+
+async def _results(count):
+    results = []
+    for i in range(count):
+        thread = create_mock_email_thread().model_copy(update={
+            "thread_id": f"thread-{i}",
+            "external_id": f"ext-{i}",
+        })
+        intel = create_mock_thread_intel().model_copy(update={"thread_id": thread.thread_id})
+        results.append((thread, intel, await generate_tasks(intel, "user-1")))
+    return results
+
+
+class TestThreadWriter:
+    """Tests for ThreadWriter."""
+    
+    async def test_one_statement_per_table_per_batch(self):
+        session = RecordingSession()
+        writer = ThreadWriter(session_factory=session)
+        
+        await writer.write("user-1", await _results(25))
+        
+        # threads, summaries, messages, stale attachments and messages,
+        # attachments, pending-task delete, tasks
+        assert len(session.statements) == 8
+        assert session.commits == 1
+        assert writer.stats()["threads_written"] == 25
+    
+    async def test_threads_upsert_on_user_and_external_id(self):
+        session = RecordingSession()
+        
+        await ThreadWriter(session_factory=session).write("user-1", await _results(3))
+        
+        [sql] = session.sql("threads")
+        assert "ON CONFLICT (user_id, external_id) DO UPDATE" in sql
+        assert "intel_json = excluded.intel_json" in sql
+        assert "created_at = excluded.created_at" not in sql
+        [params] = [p for s, p in session.statements if "INSERT INTO threads " in s]
+        assert params["external_id_m2"] == "ext-2"
+    
+    async def test_thread_ids_are_scoped_to_the_user(self):
+        session = RecordingSession()
+        results = await _results(1)
+        
+        await ThreadWriter(session_factory=session).write("user-1", results)
+        await ThreadWriter(session_factory=session).write("user-2", results)
+        
+        ids = [p["id_m0"] for s, p in session.statements if "INSERT INTO threads " in s]
+        assert ids == [scoped_thread_id("user-1", "ext-0"), scoped_thread_id("user-2", "ext-0")]
+        assert ids[0] != ids[1]
+        # Rows referencing the thread follow its row id
+        [_, task_params] = [p for s, p in session.statements if "INSERT INTO tasks " in s]
+        assert task_params["thread_id_m0"] == ids[1]
+        [_, summary_params] = [p for s, p in session.statements if "INSERT INTO thread_summaries " in s]
+        assert summary_params["thread_id_m0"] == ids[1]
+    
+    async def test_summary_projection_written_with_thread(self):
+        session = RecordingSession()
+        results = await _results(2)
+        thread, intel, _ = results[1]
+        
+        await ThreadWriter(session_factory=session).write("user-1", results)
+        
+        [sql] = session.sql("thread_summaries")
+        assert "ON CONFLICT (thread_id) DO UPDATE" in sql
+        assert "has_attachments = excluded.has_attachments" in sql
+        [params] = [p for s, p in session.statements if "INSERT INTO thread_summaries " in s]
+        assert params["summary_m1"] == intel.summary
+        assert params["last_updated_m1"] == thread.last_updated
+        assert params["has_attachments_m1"] == bool(thread.attachments)
+        assert "intel_json_m1" not in params
+    
+    async def test_attachments_keep_their_analysis(self):
+        session = RecordingSession()
+        results = await _results(1)
+        thread = results[0][0]
+        thread.attachments.append(AttachmentRef(
+            attachment_id="att-x",
+            filename="a.pdf",
+            original_filename="a.pdf",
+            mime_type="application/pdf",
+            storage_path="",
+            size_bytes=1,
+            message_id=thread.messages[0].message_id,
+        ))
+        
+        await ThreadWriter(session_factory=session).write("user-1", results)
+        
+        [sql] = session.sql("attachments")
+        assert "ON CONFLICT (id) DO UPDATE" in sql
+        assert "summary = excluded" not in sql
+        [params] = [p for s, p in session.statements if "INSERT INTO attachments " in s]
+        assert scoped_message_id("user-1", thread.messages[0].message_id) in params.values()
+    
+    async def test_replaces_only_pending_tasks(self):
+        session = RecordingSession()
+        
+        await ThreadWriter(session_factory=session).write("user-1", await _results(2))
+        
+        [delete] = [s for s, _ in session.statements if s.startswith("DELETE FROM tasks")]
+        assert "tasks.status = " in delete
+        # Never another user's tasks
+        assert "tasks.user_id = " in delete
+        # Tasks the new analysis yields again are upserted, not deleted
+        assert "tasks.id NOT IN" in delete
+    
+    async def test_task_upsert_leaves_acted_on_and_foreign_tasks_alone(self):
+        session = RecordingSession()
+        
+        await ThreadWriter(session_factory=session).write("user-1", await _results(1))
+        
+        [(sql, params)] = [(s, p) for s, p in session.statements if s.startswith("INSERT INTO tasks ")]
+        where = sql.split("DO UPDATE SET", 1)[1].split(" WHERE ", 1)[1]
+        assert "tasks.status = " in where and "tasks.user_id = " in where
+        assert TaskStatus.PENDING in params.values() and "user-1" in params.values()
+    
+    async def test_task_ids_are_stable_across_syncs(self):
+        first, second = RecordingSession(), RecordingSession()
+        
+        await ThreadWriter(session_factory=first).write("user-1", await _results(2))
+        await ThreadWriter(session_factory=second).write("user-1", await _results(2))
+        
+        ids = [
+            sorted(v for k, v in p.items() if k.startswith("id_m"))
+            for session in (first, second)
+            for s, p in session.statements if s.startswith("INSERT INTO tasks ")
+        ]
+        assert ids[0] == ids[1] and ids[0]
+    
+    async def test_message_and_attachment_ids_are_scoped_to_the_user(self):
+        session = RecordingSession()
+        results = await _results(1)
+        thread = results[0][0]
+        thread.attachments.append(AttachmentRef(
+            attachment_id="att-x",
+            filename="a.pdf",
+            original_filename="a.pdf",
+            mime_type="application/pdf",
+            storage_path="",
+            size_bytes=1,
+            message_id=thread.messages[0].message_id,
+        ))
+        
+        for user_id in ("user-1", "user-2"):
+            await ThreadWriter(session_factory=session).write(user_id, results)
+        
+        messages = [p["id_m0"] for s, p in session.statements if "INSERT INTO messages " in s]
+        assert messages == [scoped_message_id(u, thread.messages[0].message_id) for u in ("user-1", "user-2")]
+        attachments = [p for s, p in session.statements if "INSERT INTO attachments " in s]
+        for user_id, params in zip(("user-1", "user-2"), attachments):
+            assert scoped_attachment_id(user_id, "att-x") in params.values()
+            assert "att-x" not in params.values()
+        assert messages[1] in attachments[1].values()
+    
+    async def test_large_batches_are_chunked_under_bind_limit(self, monkeypatch):
+        from core.storage import thread_writer
+        monkeypatch.setattr(thread_writer, "MAX_BIND_PARAMS", 100)
+        session = RecordingSession()
+        
+        await ThreadWriter(session_factory=session).write("user-1", await _results(20))
+        
+        # 15 columns per thread row: 6 rows per statement
+        assert len(session.sql("threads")) == 4
+    
+    async def test_empty_batch_is_a_no_op(self):
+        session = RecordingSession()
+        
+        await ThreadWriter(session_factory=session).write("user-1", [])
+        
+        assert session.statements == []
+    
+    async def test_removed_messages_are_deleted_for_the_user_only(self):
+        session = RecordingSession({"DELETE FROM messages": [("thread-1",)]})
+        writer = ThreadWriter(session_factory=session)
+        
+        await writer.write("user-1", [], removed_message_ids=["msg-1"])
+        
+        [delete] = [s for s, _ in session.statements if s.startswith("DELETE FROM messages")]
+        assert "threads.user_id = " in delete
+        # The thread's cached intel covered the removed message
+        [update] = [(s, p) for s, p in session.statements if s.startswith("UPDATE threads")]
+        assert None in update[1].values()
+        assert session.commits == 1
+        assert writer.stats()["messages_deleted"] == 1
+        assert writer.stats()["threads_deleted"] == 0
+    
+    async def test_threads_left_without_messages_are_deleted(self):
+        session = RecordingSession({
+            "DELETE FROM messages": [("thread-1",)],
+            "SELECT threads.id": [("thread-1",)],
+            "DELETE FROM threads": [("thread-1",)],
+        })
+        writer = ThreadWriter(session_factory=session)
+        
+        await writer.write("user-1", [], removed_message_ids=["msg-1"])
+        
+        deleted = [s.split()[2] for s, _ in session.statements if s.startswith("DELETE FROM")]
+        assert deleted == ["attachments", "messages", "attachments", "tasks", "drafts", "emails", "messages", "threads"]
+        [delete] = [s for s, _ in session.statements if s.startswith("DELETE FROM threads")]
+        assert "threads.user_id = " in delete
+        assert writer.stats()["threads_deleted"] == 1
+    
+    async def test_deletions_share_the_batch_transaction(self):
+        session = RecordingSession()
+        
+        await ThreadWriter(session_factory=session).write(
+            "user-1", await _results(1), deleted_thread_ids=[scoped_thread_id("user-1", "gone")],
+        )
+        
+        statements = [s for s, _ in session.statements]
+        assert statements[-1].startswith("DELETE FROM threads")
+        assert any(s.startswith("INSERT INTO threads ") for s in statements)
+        assert session.commits == 1
+    
+    async def test_deleted_attachments_release_their_blob_after_commit(self):
+        session = RecordingSession({"DELETE FROM attachments": [("att-1", "/blobs/ab/abc"), ("att-2", None)]})
+        released = []
+        
+        class Storage:
+            async def release(self, path, ref_id):
+                released.append((path, ref_id, session.commits))
+        
+        writer = ThreadWriter(session_factory=session, storage=Storage())
+        await writer.write("user-1", [], deleted_thread_ids=["thread-1"])
+        
+        assert released == [("/blobs/ab/abc", "att-1", 1)]
+        assert writer.stats()["attachments_deleted"] == 2
+        [delete] = [s for s, _ in session.statements if s.startswith("DELETE FROM attachments")]
+        assert "RETURNING attachments.id, attachments.storage_path" in delete
+    
+    async def test_messages_gone_from_a_rewritten_thread_are_deleted(self, tmp_path):
+        results = await _results(1)
+        thread = results[0][0]
+        # A stored attachment of a message deleted in the mailbox since the last sync
+        storage = FileStorage(str(tmp_path))
+        gone_attachment = scoped_attachment_id("user-1", "att-gone")
+        blob = await storage.save_stream(gone_attachment, [b"%PDF-1.4 deleted"])
+        session = RecordingSession({"DELETE FROM attachments": [(gone_attachment, blob.path)]})
+        writer = ThreadWriter(session_factory=session, storage=storage)
+        
+        await writer.write("user-1", results)
+        
+        [(delete, params)] = [(s, p) for s, p in session.statements if s.startswith("DELETE FROM messages")]
+        assert "messages.thread_id = " in delete and "NOT IN" in delete
+        kept = {scoped_message_id("user-1", message.message_id) for message in thread.messages}
+        assert kept <= set(_flatten(params.values()))
+        # The deleted message's blob reference is released
+        assert await storage.ref_count(blob.path) == 0
+        assert await storage.get(blob.path) is None
+    
+    async def test_merged_deltas_only_delete_reported_removals(self):
+        session = RecordingSession()
+        writer = ThreadWriter(session_factory=session)
+        
+        await writer.write("user-1", await _results(1), prune=False)
+        
+        assert not any(s.startswith("DELETE FROM messages") for s, _ in session.statements)
+        assert not any(s.startswith("DELETE FROM attachments") for s, _ in session.statements)
+
+
+def _flatten(values):
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            yield from value
+        else:
+            yield value
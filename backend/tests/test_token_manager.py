@@ -0,0 +1,154 @@
+"""
+Token Manager Tests
+-------------------
+Tests for token caching, single-flight refresh and proactive renewal.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from core.auth.oauth_google import GoogleTokens
+from core.auth.token_manager import TokenManager
+
+
+NOW = datetime(2026, 1, 18, 12, 0)
+
+
+class FakeAccounts:
+    """Session factory over one in-memory connected account row."""
+
+    def __init__(self, expires_at):
+        self.row = SimpleNamespace(
+            provider="gmail",
+            access_token="old-token",
+            refresh_token="refresh-1",
+            token_expires_at=expires_at,
+        )
+        self.saved = []
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        if statement.is_select:
+            return SimpleNamespace(first=lambda: self.row)
+        self.saved.append(statement.compile().params)
+        return None
+
+    async def commit(self):
+        pass
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def refresher():
+    """Slow fake provider refresh that counts calls."""
+    calls = []
+
+    async def refresh(refresh_token):
+        calls.append(refresh_token)
+        await asyncio.sleep(0.02)
+        return GoogleTokens(access_token=f"new-token-{len(calls)}", expires_in=3600)
+
+    refresh.calls = calls
+    return refresh
+
+
+def _manager(accounts, refresher, clock=None):
+    return TokenManager(
+        session_factory=accounts,
+        refresh_margin_seconds=300,
+        refreshers={"gmail": refresher},
+        clock=clock or Clock(NOW),
+    )
+
+
+class TestTokenManager:
+    """Tests for TokenManager."""
+
+    async def test_valid_token_served_from_cache(self, refresher):
+        manager = _manager(FakeAccounts(NOW + timedelta(hours=1)), refresher)
+
+        tokens = [await manager.get_access_token("acct-1") for _ in range(5)]
+
+        assert tokens == ["old-token"] * 5
+        assert manager.loads == 1
+        assert refresher.calls == []
+
+    async def test_expired_token_single_flight(self, refresher):
+        accounts = FakeAccounts(NOW - timedelta(minutes=1))
+        manager = _manager(accounts, refresher)
+
+        tokens = await asyncio.gather(*(manager.get_access_token("acct-1") for _ in range(20)))
+
+        assert set(tokens) == {"new-token-1"}
+        assert len(refresher.calls) == 1
+        assert manager.coalesced == 19
+        saved = accounts.saved[0]
+        assert saved["access_token"] == "new-token-1"
+        assert saved["token_expires_at"] == NOW + timedelta(hours=1)
+
+    async def test_near_expiry_renews_in_background(self, refresher):
+        manager = _manager(FakeAccounts(NOW + timedelta(minutes=2)), refresher)
+
+        # Answered immediately with the still-valid token
+        assert await manager.get_access_token("acct-1") == "old-token"
+        assert manager.stats()["refreshes_in_flight"] == 1
+
+        await asyncio.sleep(0.05)
+        assert await manager.get_access_token("acct-1") == "new-token-1"
+        assert len(refresher.calls) == 1
+
+    async def test_renew_expiring_sweep(self, refresher):
+        clock = Clock(NOW)
+        manager = _manager(FakeAccounts(NOW + timedelta(hours=1)), refresher, clock)
+        await manager.get_access_token("acct-1")
+
+        assert await manager.renew_expiring() == 0
+        clock.now = NOW + timedelta(minutes=56)
+        assert await manager.renew_expiring() == 1
+        assert await manager.renew_expiring() == 0  # already in flight
+
+        await asyncio.sleep(0.05)
+        assert await manager.get_access_token("acct-1") == "new-token-1"
+
+    async def test_failed_refresh_propagates_and_clears(self):
+        attempts = []
+
+        async def broken(refresh_token):
+            attempts.append(refresh_token)
+            raise RuntimeError("invalid_grant")
+
+        manager = _manager(FakeAccounts(NOW - timedelta(minutes=1)), broken)
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await manager.get_access_token("acct-1")
+
+        assert len(attempts) == 2
+        assert manager.refresh_errors == 2
+        assert manager.stats()["refreshes_in_flight"] == 0
+
+    async def test_unknown_account(self, refresher):
+        accounts = FakeAccounts(None)
+        accounts.row = None
+        manager = _manager(accounts, refresher)
+
+        with pytest.raises(LookupError):
+            await manager.get_access_token("missing")